@@ -1,21 +1,213 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
 
+import numpy as np
+
+from .anomaly import AnomalyAnalyzer, MetricWindow, load_metric_windows
+from .changes import ChangeIndex
+from .connectors import ConnectorError, ConnectorRuntime
+from .executors import AgentExecutor, ExecutionMode
+from .features import IncidentFeatures, extract_features
+from .informer import KubernetesInformer
+from .logmining import TemplateMiner, read_lines
 from .models import AgentDomain, IncidentRequest, Signal
+from .signatures import SignatureScanner, read_chunks
+from .spend import SpendMonitor
+from .store import EvidenceStore
+from .traces import SpanTable
+
+DEFAULT_WINDOW_MINUTES = 20
+LATENCY_SLO_SECONDS = 0.5
+SPEND_SPIKE_RATIO = 1.5
+SPEND_BASELINE_HOURS = 7 * 24
+
+# Lowest and highest confidence each domain's analysis can report, whatever evidence it finds.
+CONFIDENCE_RANGES: dict[AgentDomain, tuple[float, float]] = {
+    AgentDomain.metrics: (0.5, 0.95),
+    AgentDomain.deployments: (0.5, 0.86),
+    AgentDomain.kubernetes: (0.5, 0.88),
+    AgentDomain.cost: (0.44, 0.78),
+    AgentDomain.security: (0.58, 0.93),
+    AgentDomain.logs: (0.4, 0.87),
+    AgentDomain.traces: (0.4, 0.9),
+}
+
+
+def p95_latency_query(service: str, window_minutes: int) -> str:
+    return (
+        "histogram_quantile(0.95, sum by (le) "
+        f'(rate(http_request_duration_seconds_bucket{{service="{service}"}}[{window_minutes}m])))'
+    )
+
+
+def error_ratio_query(service: str, window_minutes: int) -> str:
+    return (
+        f'sum(rate(http_requests_total{{service="{service}",code=~"5.."}}[{window_minutes}m])) / '
+        f'sum(rate(http_requests_total{{service="{service}"}}[{window_minutes}m]))'
+    )
+
+
+def latency_series_query(service: str) -> str:
+    return (
+        "histogram_quantile(0.95, sum by (le, instance) "
+        f'(rate(http_request_duration_seconds_bucket{{service="{service}"}}[1m])))'
+    )
+
+
+def error_series_query(service: str) -> str:
+    return (
+        f'sum by (instance) (rate(http_requests_total{{service="{service}",code=~"5.."}}[1m])) / '
+        f'sum by (instance) (rate(http_requests_total{{service="{service}"}}[1m]))'
+    )
+
+
+_ANALYZER = AnomalyAnalyzer()
+_SCANNER = SignatureScanner()
+
+
+@dataclass(slots=True)
+class EvidenceSources:
+    """Backends agents gather evidence from; agents fall back to symptom analysis without them.
+
+    ``metric_windows`` is a directory of ``<service>.json`` fixture files holding
+    Prometheus matrix results keyed ``latency`` / ``errors``, used when no
+    Prometheus connector supplies range data. ``store`` keeps range data that was
+    already fetched so repeat investigations read it locally, and holds the hourly
+    ``spend`` series the cost agent compares against when no ``spend`` monitor is
+    streaming per-SKU billing records. Once ``informer`` has synced,
+    the kubernetes agent reads its cached state instead of listing pods, and the
+    deployments agent answers from ``changes`` for services it indexes.
+    ``security_logs`` is a directory of WAF and Falco log files (optionally in a
+    ``<service>/`` subdirectory) that the security agent scans for signatures;
+    ``app_logs`` is laid out the same way and mined into templates by the logs agent,
+    and ``traces`` holds OTLP-JSON span exports for the traces agent.
+    """
+
+    connectors: ConnectorRuntime | None = None
+    metric_windows: Path | None = None
+    store: EvidenceStore | None = None
+    informer: KubernetesInformer | None = None
+    changes: ChangeIndex | None = None
+    security_logs: Path | None = None
+    app_logs: Path | None = None
+    traces: Path | None = None
+    spend: SpendMonitor | None = None
+
+
+@dataclass(slots=True)
+class Evidence:
+    """What an agent fetched for one incident, handed (picklable) to :meth:`MicroAgent.analyze`."""
+
+    references: list[str] = field(default_factory=list)
+    data: dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
 class MicroAgent:
-    """Small single-purpose agent that emits one signal based on incident context."""
+    """Small single-purpose agent that emits one signal based on incident context.
+
+    ``execution`` tells the orchestrator where :meth:`analyze` should run: on the event
+    loop, or in the swarm's shared thread or process pool for CPU-heavy domains.
+    Evidence gathering is always async I/O on the event loop. ``related`` names
+    neighbouring services the orchestrator wants covered as possible root causes,
+    and ``features`` is the symptom scan the orchestrator runs once per incident;
+    without it the agent extracts its own.
+    """
 
     domain: AgentDomain
+    execution: ExecutionMode = ExecutionMode.inline
+
+    async def investigate(
+        self,
+        incident: IncidentRequest,
+        window_minutes: int = DEFAULT_WINDOW_MINUTES,
+        sources: EvidenceSources | None = None,
+        executor: AgentExecutor | None = None,
+        related: tuple[str, ...] = (),
+        features: IncidentFeatures | None = None,
+    ) -> Signal:
+        evidence = await self.gather(incident, window_minutes, sources, related)
+        if executor is None or self.execution is ExecutionMode.inline:
+            return self.analyze(incident, window_minutes, evidence, features)
+        return await executor.run(self.execution, self.analyze, incident, window_minutes, evidence, features)
 
-    async def investigate(self, incident: IncidentRequest) -> Signal:
-        symptom = incident.symptom.lower()
+    async def gather(
+        self,
+        incident: IncidentRequest,
+        window_minutes: int = DEFAULT_WINDOW_MINUTES,
+        sources: EvidenceSources | None = None,
+        related: tuple[str, ...] = (),
+    ) -> Evidence:
+        evidence = Evidence()
+        if sources is None:
+            return evidence
+        if self.domain == AgentDomain.kubernetes and sources.informer is not None and sources.informer.synced:
+            _gather_kubernetes_cached(sources.informer, incident, evidence, related)
+            return evidence
+        changes = sources.changes
+        if self.domain == AgentDomain.deployments and changes is not None and incident.service in changes:
+            _gather_changes(changes, incident, window_minutes, evidence, related)
+            return evidence
+
+        connectors = sources.connectors
+        if connectors is not None:
+            try:
+                if self.domain == AgentDomain.metrics and connectors.prometheus is not None:
+                    await _gather_metrics(connectors, incident, window_minutes, evidence, sources.store)
+                elif self.domain == AgentDomain.deployments and connectors.github is not None:
+                    await _gather_deployments(connectors, incident, window_minutes, evidence)
+                elif self.domain == AgentDomain.kubernetes and connectors.kubernetes is not None:
+                    await _gather_kubernetes(connectors, incident, evidence)
+            except ConnectorError as exc:
+                evidence.references.append(f"connector-error:{exc}")
+
+        if self.domain == AgentDomain.metrics and "latency_series" not in evidence.data:
+            if sources.store is not None:
+                _gather_metric_store(sources.store, incident, *_minute_window(incident, window_minutes), evidence)
+            if sources.metric_windows is not None and "latency_series" not in evidence.data:
+                await _gather_metric_fixtures(sources.metric_windows, incident, evidence)
+        elif self.domain == AgentDomain.cost:
+            if sources.spend is not None:
+                _gather_spend_sketches(sources.spend, incident, window_minutes, evidence, related)
+            if sources.store is not None and "spend_spikes" not in evidence.data:
+                _gather_spend(sources.store, incident, evidence)
+        elif self.domain == AgentDomain.security and sources.security_logs is not None:
+            await _gather_signatures(sources.security_logs, incident, window_minutes, evidence)
+        elif self.domain == AgentDomain.logs and sources.app_logs is not None:
+            await _gather_log_templates(sources.app_logs, incident, window_minutes, evidence)
+        elif self.domain == AgentDomain.traces and sources.traces is not None:
+            await _gather_traces(sources.traces, incident, window_minutes, evidence)
+        return evidence
+
+    def analyze(
+        self,
+        incident: IncidentRequest,
+        window_minutes: int = DEFAULT_WINDOW_MINUTES,
+        evidence: Evidence | None = None,
+        features: IncidentFeatures | None = None,
+    ) -> Signal:
+        return self._analyze(incident, evidence or Evidence(), features or extract_features(incident))
+
+    def _analyze(self, incident: IncidentRequest, evidence: Evidence, features: IncidentFeatures) -> Signal:
+        data = evidence.data
+
+        if self.domain == AgentDomain.metrics and (
+            "latency_series" in data or "error_series" in data
+        ):
+            return _metric_window_signal(incident, evidence)
 
         if self.domain == AgentDomain.metrics:
-            latency_related = any(token in symptom for token in ("latency", "timeout", "slow"))
+            latency_related = features.has("latency")
+            p95 = data.get("p95_latency_seconds")
+            if p95 is not None and p95 > LATENCY_SLO_SECONDS:
+                latency_related = True
             confidence = 0.9 if latency_related else 0.62
             return Signal(
                 domain=self.domain,
@@ -24,46 +216,100 @@ class MicroAgent:
                     else f"Error/traffic anomalies detected for {incident.service}"
                 ),
                 confidence=confidence,
-                evidence=[
+                evidence=evidence.references or [
                     "prometheus:histogram_quantile(0.95, request_duration_seconds)",
                     "alertmanager:firing=SLOLatencyBurnRate",
                 ],
             )
 
         if self.domain == AgentDomain.deployments:
-            rollout_related = any(token in symptom for token in ("deploy", "release", "rollback"))
-            confidence = 0.86 if rollout_related else 0.68
+            rollout_related = features.has("rollout")
+            recent_commits = data.get("recent_changes", data.get("recent_commits"))
+            if recent_commits == 0 and not rollout_related:
+                return Signal(
+                    domain=self.domain,
+                    finding=f"No change activity for {incident.service} inside the incident window",
+                    confidence=0.5,
+                    evidence=evidence.references,
+                )
+            confidence = 0.86 if rollout_related or recent_commits else 0.68
             return Signal(
                 domain=self.domain,
                 finding="Recent rollout/change-window overlap with incident start",
                 confidence=confidence,
-                evidence=[
+                evidence=evidence.references or [
                     "github:main@last_commit_within_20m",
                     "argo-rollouts:replicaset_transition",
                 ],
             )
 
         if self.domain == AgentDomain.kubernetes:
+            restarting = data.get("restarts") or data.get("unhealthy_pods") or data.get("oom_kills")
+            throttled = data.get("throttling_events")
+            if data.get("pods") and not restarting and not throttled:
+                return Signal(
+                    domain=self.domain,
+                    finding=f"All {data['pods']} pods for {incident.service} running without restarts",
+                    confidence=0.5,
+                    evidence=evidence.references,
+                )
             confidence = 0.88 if incident.environment == "prod" else 0.63
+            finding = "Pod restart spikes and CPU throttling on serving tier"
+            if "throttling_events" in data and not (restarting and throttled):
+                finding = "Pod restart spikes on serving tier" if restarting else "CPU throttling on serving tier"
             return Signal(
                 domain=self.domain,
-                finding="Pod restart spikes and CPU throttling on serving tier",
+                finding=finding,
                 confidence=confidence,
-                evidence=[
+                evidence=evidence.references or [
                     "kubectl:get pods --field-selector=status.phase!=Running",
                     "kube-state-metrics:container_cpu_cfs_throttled_seconds_total",
                 ],
             )
 
+        if self.domain == AgentDomain.cost and "spend_spikes" in data:
+            return _spend_spike_signal(incident, data["spend_spikes"], data["tracked_skus"], evidence)
+
         if self.domain == AgentDomain.cost:
+            ratio = data.get("spend_ratio")
+            if ratio is not None and ratio >= SPEND_SPIKE_RATIO:
+                return Signal(
+                    domain=self.domain,
+                    finding=f"Hourly spend for {incident.service} running at {ratio:.1f}x its weekly median",
+                    confidence=0.74,
+                    evidence=evidence.references,
+                )
             return Signal(
                 domain=self.domain,
                 finding="No immediate FinOps anomaly linked to incident blast radius",
                 confidence=0.44,
-                evidence=["billing:hourly_spend_within_expected_band"],
+                evidence=evidence.references or ["billing:hourly_spend_within_expected_band"],
             )
 
-        exploit_related = any(token in symptom for token in ("attack", "breach", "exploit", "waf"))
+        if self.domain == AgentDomain.logs:
+            if "novel_templates" in data:
+                return _log_template_signal(incident, data["novel_templates"], data["spiking_templates"], evidence)
+            return Signal(
+                domain=self.domain,
+                finding=f"No application logs sampled for {incident.service}",
+                confidence=0.4,
+                evidence=["logs:no_source_configured"],
+            )
+
+        if self.domain == AgentDomain.traces:
+            if "slow_hop" in data:
+                return _trace_signal(data["slow_hop"], evidence)
+            return Signal(
+                domain=self.domain,
+                finding=f"No traces sampled for {incident.service} inside the incident window",
+                confidence=0.4,
+                evidence=evidence.references or ["traces:no_source_configured"],
+            )
+
+        exploit_related = features.has("exploit")
+        hits = data.get("signature_hits")
+        if hits is not None:
+            return _signature_signal(hits, data.get("runtime_hits", 0), exploit_related, evidence)
         confidence = 0.91 if exploit_related else 0.58
         return Signal(
             domain=self.domain,
@@ -80,6 +326,389 @@ class MicroAgent:
         )
 
 
+def _incident_window(incident: IncidentRequest, window_minutes: int) -> tuple[datetime, datetime]:
+    end = incident.observed_at or datetime.now(timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    return end - timedelta(minutes=window_minutes), end
+
+
+def _minute_window(incident: IncidentRequest, window_minutes: int) -> tuple[datetime, datetime]:
+    """The incident window snapped to whole minutes, so it lines up with stored 1m buckets."""
+    _, end = _incident_window(incident, window_minutes)
+    end = end.replace(second=0, microsecond=0)
+    return end - timedelta(minutes=window_minutes), end
+
+
+async def _gather_metrics(
+    connectors: ConnectorRuntime,
+    incident: IncidentRequest,
+    window_minutes: int,
+    evidence: Evidence,
+    store: EvidenceStore | None = None,
+) -> None:
+    queries = {
+        "p95_latency_seconds": p95_latency_query(incident.service, window_minutes),
+        "error_ratio": error_ratio_query(incident.service, window_minutes),
+    }
+    results = await connectors.prometheus.query_many(list(queries.values()), at=incident.observed_at)
+    for (key, promql), result in zip(queries.items(), results):
+        value = float(result[0]["value"][1]) if result else None
+        evidence.data[key] = value
+        evidence.references.append(f"prometheus:{promql} = {'no data' if value is None else f'{value:.4g}'}")
+    await _gather_metric_series(connectors, incident, window_minutes, evidence, store)
+
+
+async def _gather_metric_series(
+    connectors: ConnectorRuntime,
+    incident: IncidentRequest,
+    window_minutes: int,
+    evidence: Evidence,
+    store: EvidenceStore | None = None,
+) -> None:
+    start, end = _minute_window(incident, window_minutes)
+    if store is not None and store.covers(
+        "latency", start.timestamp(), end.timestamp(), service=incident.service
+    ):
+        _gather_metric_store(store, incident, start, end, evidence)
+        return
+
+    latency, errors = await asyncio.gather(
+        connectors.prometheus.query_range(latency_series_query(incident.service), start, end),
+        connectors.prometheus.query_range(error_series_query(incident.service), start, end),
+    )
+    if store is not None:
+        for name, result in (("latency", latency), ("errors", errors)):
+            for series in result:
+                samples = np.asarray(series["values"], dtype=float).reshape(-1, 2)
+                labels = {**series.get("metric", {}), "service": incident.service}
+                store.append(name, labels, samples[:, 0], samples[:, 1])
+    _add_metric_windows(
+        evidence,
+        {"latency": MetricWindow.from_matrix(latency), "errors": MetricWindow.from_matrix(errors)},
+        source=f"prometheus:query_range[{window_minutes}m]",
+    )
+
+
+async def _gather_metric_fixtures(directory: Path, incident: IncidentRequest, evidence: Evidence) -> None:
+    path = directory / f"{incident.service}.json"
+    if path.is_file():
+        windows = await asyncio.to_thread(load_metric_windows, path)
+        _add_metric_windows(evidence, windows, source=f"fixture:{path.name}")
+
+
+def _gather_metric_store(
+    store: EvidenceStore, incident: IncidentRequest, start: datetime, end: datetime, evidence: Evidence
+) -> None:
+    windows = {
+        name: store.window(name, start.timestamp(), end.timestamp(), service=incident.service)
+        for name in ("latency", "errors")
+    }
+    minutes = int((end - start).total_seconds() // 60)
+    _add_metric_windows(evidence, windows, source=f"store:1m[{minutes}m]")
+
+
+def _gather_spend(store: EvidenceStore, incident: IncidentRequest, evidence: Evidence) -> None:
+    now = time.time()
+    spend = store.window("spend", now - SPEND_BASELINE_HOURS * 3600, now, "1h", service=incident.service)
+    if not spend.series:
+        return
+    hourly = np.nansum(spend.values, axis=0)
+    observed = ~np.isnan(spend.values).all(axis=0)
+    baseline = hourly[:-1][observed[:-1]]
+    if not observed[-1] or len(baseline) < 6:
+        return
+    median = float(np.median(baseline))
+    ratio = float(hourly[-1] / median) if median > 0 else 0.0
+    evidence.data.update(hourly_spend=float(hourly[-1]), spend_ratio=round(ratio, 2))
+    evidence.references.append(
+        f"store:spend{{service={incident.service}}} 1h latest={hourly[-1]:.2f} "
+        f"median_{len(baseline)}h={median:.2f}"
+    )
+
+
+def _gather_spend_sketches(
+    spend: SpendMonitor,
+    incident: IncidentRequest,
+    window_minutes: int,
+    evidence: Evidence,
+    related: tuple[str, ...] = (),
+) -> None:
+    services = [incident.service, *related]
+    tracked = spend.tracked(services)
+    if not tracked:
+        return
+    lookback_hours = max(1, math.ceil(window_minutes / 60))
+    spikes = spend.spikes(services, at=incident.observed_at, ratio=SPEND_SPIKE_RATIO, lookback_hours=lookback_hours)
+    evidence.data.update(
+        spend_spikes=[(spike.service, spike.sku, spike.amount, spike.baseline) for spike in spikes],
+        tracked_skus=tracked,
+    )
+    evidence.references.append(
+        f"spend:{len(services)}_services skus={tracked} spikes={len(spikes)} within {lookback_hours}h"
+    )
+    evidence.references.extend(
+        f"spend:{_scope(spike.service, incident)}{spike.sku} hour={spike.hour:%Y-%m-%dT%H}Z "
+        f"amount={spike.amount:.2f} ewma={spike.baseline:.2f} p99={spike.p99:.2f}"
+        for spike in spikes[:3]
+    )
+
+
+def _spend_spike_signal(
+    incident: IncidentRequest, spikes: list[tuple[str, str, float, float]], tracked: int, evidence: Evidence
+) -> Signal:
+    if not spikes:
+        return Signal(
+            domain=AgentDomain.cost,
+            finding=f"No spend anomaly across {tracked} tracked SKUs in the incident blast radius",
+            confidence=0.5,
+            evidence=evidence.references,
+        )
+    service, sku, amount, baseline = spikes[0]
+    ratio = amount / baseline if baseline > 0 else float("inf")
+    return Signal(
+        domain=AgentDomain.cost,
+        finding=f"Spend spike on {service} {sku}: {amount:.2f}/h at {ratio:.1f}x its EWMA baseline",
+        confidence=0.78 if service == incident.service else 0.7,
+        evidence=evidence.references,
+    )
+
+
+def _add_metric_windows(evidence: Evidence, windows: dict[str, MetricWindow], source: str) -> None:
+    for name, key in (("latency", "latency_series"), ("errors", "error_series")):
+        window = windows.get(name)
+        if window is not None and window.series:
+            evidence.data[key] = window.values
+            evidence.references.append(f"{source} {name} series={window.series} samples={window.values.shape[1]}")
+
+
+def _metric_window_signal(incident: IncidentRequest, evidence: Evidence) -> Signal:
+    report = _ANALYZER.analyze(
+        latency=evidence.data.get("latency_series"), errors=evidence.data.get("error_series")
+    )
+    if report.score < 0.3:
+        finding = f"No metric anomaly across {report.series} series for {incident.service}"
+    elif report.dominant == "errors":
+        finding = f"Error budget burning at {report.max_burn_rate:.1f}x for {incident.service}"
+    else:
+        flagged = max(report.anomalous_series, report.change_point_series)
+        finding = f"P95 latency regression detected for {incident.service} on {flagged} series"
+    return Signal(
+        domain=AgentDomain.metrics,
+        finding=finding,
+        confidence=round(0.5 + 0.45 * report.score, 2),
+        evidence=[
+            *evidence.references,
+            (
+                f"anomaly:max_z={report.max_zscore} change_points={report.change_point_series} "
+                f"max_shift={report.max_shift} burn_rate={report.max_burn_rate}"
+            ),
+        ],
+    )
+
+
+async def _gather_deployments(
+    connectors: ConnectorRuntime, incident: IncidentRequest, window_minutes: int, evidence: Evidence
+) -> None:
+    # Minute resolution keeps concurrent incidents' queries identical so they coalesce.
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    since = now - timedelta(minutes=window_minutes)
+    commits = await connectors.github.list_commits(incident.service, since=since)
+    evidence.data["recent_commits"] = len(commits)
+    evidence.references.append(
+        f"github:{connectors.github.owner}/{incident.service}@{len(commits)}_commits_within_{window_minutes}m"
+    )
+    evidence.references.extend(f"github:commit {commit['sha'][:12]}" for commit in commits[:3])
+
+
+def _gather_changes(
+    changes: ChangeIndex,
+    incident: IncidentRequest,
+    window_minutes: int,
+    evidence: Evidence,
+    related: tuple[str, ...] = (),
+) -> None:
+    start, end = _incident_window(incident, window_minutes)
+    overlapping = changes.overlapping([incident.service, *related], start, end)
+    evidence.data.update(
+        recent_commits=sum(1 for change in overlapping if change.kind == "commit"),
+        recent_changes=len(overlapping),
+    )
+    evidence.references.append(
+        f"changes:{incident.service}@{len(overlapping)}_changes_within_{window_minutes}m"
+    )
+    evidence.references.extend(
+        f"changes:{_scope(change.service, incident)}{change.kind} {change.ref[:12]} {change.summary}".rstrip()
+        for change in reversed(overlapping[-3:])
+    )
+
+
+async def _gather_signatures(
+    directory: Path, incident: IncidentRequest, window_minutes: int, evidence: Evidence
+) -> None:
+    scoped = directory / incident.service
+    paths = sorted(path for path in (scoped if scoped.is_dir() else directory).iterdir() if path.is_file())
+    start, end = _incident_window(incident, window_minutes)
+    report = await asyncio.to_thread(_SCANNER.scan, read_chunks(paths), start, end)
+    evidence.data.update(signature_hits=report.counts, runtime_hits=report.sources.get("runtime", 0))
+    evidence.references.append(
+        f"signatures:{len(paths)}_files {report.bytes_scanned}_bytes hits={report.total} within {window_minutes}m"
+    )
+    evidence.references.extend(
+        f"signature:{name} hits={count} sample={report.samples[name][:120]}" for name, count in report.top()
+    )
+
+
+async def _gather_log_templates(
+    directory: Path, incident: IncidentRequest, window_minutes: int, evidence: Evidence
+) -> None:
+    scoped = directory / incident.service
+    paths = sorted(path for path in (scoped if scoped.is_dir() else directory).iterdir() if path.is_file())
+    start, end = _incident_window(incident, window_minutes)
+    report = await asyncio.to_thread(TemplateMiner().mine, read_lines(paths), start, end)
+    evidence.data.update(
+        novel_templates=[(stat.template, stat.window_count, stat.is_error) for stat in report.novel],
+        spiking_templates=[(stat.template, stat.window_count, stat.is_error) for stat in report.spiking],
+    )
+    evidence.references.append(
+        f"logs:{len(paths)}_files lines={report.lines} window_lines={report.window_lines} "
+        f"templates={report.clusters} within {window_minutes}m"
+    )
+    evidence.references.extend(
+        f"logs:{kind} count={stat.window_count} baseline={stat.baseline_count} template={stat.template[:120]}"
+        for kind, stats in (("new", report.novel), ("spiking", report.spiking))
+        for stat in stats[:3]
+    )
+
+
+def _log_template_signal(
+    incident: IncidentRequest,
+    novel: list[tuple[str, int, bool]],
+    spiking: list[tuple[str, int, bool]],
+    evidence: Evidence,
+) -> Signal:
+    errors = [template for template, _, is_error in novel + spiking if is_error]
+    if errors:
+        finding = f"New or spiking error log pattern for {incident.service}: {errors[0][:120]}"
+        confidence = 0.87
+    elif novel or spiking:
+        finding = f"{len(novel)} new and {len(spiking)} spiking log templates for {incident.service}"
+        confidence = 0.66
+    else:
+        finding = f"No new or spiking log templates for {incident.service} inside the incident window"
+        confidence = 0.5
+    return Signal(domain=AgentDomain.logs, finding=finding, confidence=confidence, evidence=evidence.references)
+
+
+async def _gather_traces(
+    directory: Path, incident: IncidentRequest, window_minutes: int, evidence: Evidence
+) -> None:
+    scoped = directory / incident.service
+    paths = sorted(path for path in (scoped if scoped.is_dir() else directory).iterdir() if path.is_file())
+    start, end = _incident_window(incident, window_minutes)
+    table = await asyncio.to_thread(SpanTable.from_files, paths)
+    report = await asyncio.to_thread(table.analyze, start, end)
+    evidence.references.append(
+        f"traces:{len(paths)}_files spans={report.spans} traces={report.window_traces} "
+        f"p95={report.p95_ms}ms within {window_minutes}m"
+    )
+    hop = report.slow_hop
+    if hop is None:
+        return
+    evidence.data.update(
+        trace_p95_ms=report.p95_ms,
+        slow_hop=(hop.service, hop.operation, hop.critical_share, hop.critical_ms, hop.baseline_critical_ms),
+    )
+    evidence.references.extend(
+        f"traces:critical_path {stat.service} {stat.operation} share={stat.critical_share} "
+        f"per_trace={stat.critical_ms}ms self={stat.self_ms}ms"
+        + ("" if stat.baseline_critical_ms is None else f" baseline={stat.baseline_critical_ms}ms")
+        for stat in report.hops[:3]
+    )
+
+
+def _trace_signal(slow_hop: tuple[str, str, float, float, float | None], evidence: Evidence) -> Signal:
+    service, operation, share, critical_ms, baseline_ms = slow_hop
+    finding = f"Critical path dominated by {service} {operation} at {critical_ms:.0f}ms per trace ({share:.0%})"
+    confidence = 0.82 if share >= 0.5 else 0.64
+    if baseline_ms is not None:
+        finding = (
+            f"Slow hop {service} {operation} on the critical path: "
+            f"{critical_ms:.0f}ms per trace, up from {baseline_ms:.0f}ms"
+        )
+        confidence = 0.9 if critical_ms >= 2 * max(baseline_ms, 1.0) else 0.6
+    return Signal(domain=AgentDomain.traces, finding=finding, confidence=confidence, evidence=evidence.references)
+
+
+def _signature_signal(
+    hits: dict[str, int], runtime_hits: int, exploit_related: bool, evidence: Evidence
+) -> Signal:
+    total = sum(hits.values())
+    if not total:
+        return Signal(
+            domain=AgentDomain.security,
+            finding="No active exploit signature in runtime telemetry",
+            confidence=0.62 if exploit_related else 0.7,
+            evidence=evidence.references,
+        )
+    if runtime_hits and total > runtime_hits:
+        finding, confidence = "Runtime rule violations alongside suspicious request signatures", 0.93
+    elif runtime_hits:
+        finding, confidence = "Runtime rule violations in workload telemetry", 0.88
+    else:
+        finding = "Suspicious request signatures aligned with OWASP patterns"
+        confidence = 0.9 if total >= 10 or exploit_related else 0.76
+    return Signal(domain=AgentDomain.security, finding=finding, confidence=confidence, evidence=evidence.references)
+
+
+async def _gather_kubernetes(connectors: ConnectorRuntime, incident: IncidentRequest, evidence: Evidence) -> None:
+    selector = f"app={incident.service}"
+    pods = await connectors.kubernetes.list_pods(label_selector=selector)
+    restarts = sum(
+        status.get("restartCount", 0)
+        for pod in pods
+        for status in pod.get("status", {}).get("containerStatuses", [])
+    )
+    unhealthy = sum(1 for pod in pods if pod.get("status", {}).get("phase") != "Running")
+    evidence.data.update(pods=len(pods), restarts=restarts, unhealthy_pods=unhealthy)
+    evidence.references.append(
+        f"kubernetes:pods{{{selector}}} total={len(pods)} not_running={unhealthy} restarts={restarts}"
+    )
+
+
+def _gather_kubernetes_cached(
+    informer: KubernetesInformer, incident: IncidentRequest, evidence: Evidence, related: tuple[str, ...] = ()
+) -> None:
+    state = informer.service(incident.service)
+    evidence.data.update(
+        pods=state.pods,
+        restarts=state.restarts,
+        unhealthy_pods=state.unhealthy_pods,
+        oom_kills=state.oom_kills,
+        throttling_events=state.throttling_events,
+        active_replicasets=state.active_replicasets,
+    )
+    evidence.references.append(
+        f"informer:pods{{service={incident.service}}} total={state.pods} not_running={state.unhealthy_pods} "
+        f"restarts={state.restarts} oom_kills={state.oom_kills}"
+    )
+    evidence.references.append(
+        f"informer:events backoff={state.backoff_events} throttling={state.throttling_events} "
+        f"active_replicasets={state.active_replicasets}"
+    )
+    for service in related:
+        neighbour = informer.service(service)
+        if neighbour.restarts or neighbour.unhealthy_pods or neighbour.throttling_events:
+            evidence.references.append(
+                f"informer:neighbour {service} not_running={neighbour.unhealthy_pods} "
+                f"restarts={neighbour.restarts} throttling={neighbour.throttling_events}"
+            )
+
+
+def _scope(service: str, incident: IncidentRequest) -> str:
+    return "" if service == incident.service else f"{service}:"
+
+
 DEFAULT_SWARM: tuple[MicroAgent, ...] = (
     MicroAgent(AgentDomain.metrics),
     MicroAgent(AgentDomain.deployments),
@@ -87,3 +716,31 @@ DEFAULT_SWARM: tuple[MicroAgent, ...] = (
     MicroAgent(AgentDomain.cost),
     MicroAgent(AgentDomain.security),
 )
+
+# Opt-in: only worth running when ``EvidenceSources.app_logs`` points at log files.
+LOGS_AGENT = MicroAgent(AgentDomain.logs, execution=ExecutionMode.thread)
+# Opt-in likewise: needs ``EvidenceSources.traces``.
+TRACES_AGENT = MicroAgent(AgentDomain.traces)
+# Stands in for the inline metrics agent once range data is attached.
+_THREADED_METRICS_AGENT = MicroAgent(AgentDomain.metrics, execution=ExecutionMode.thread)
+
+
+def swarm_for(sources: EvidenceSources) -> tuple[MicroAgent, ...]:
+    """``DEFAULT_SWARM`` adjusted to what ``sources`` can feed.
+
+    Without range data the metrics agent only matches symptoms, which is cheaper than
+    the thread hop; with a Prometheus connector, ``store`` or ``metric_windows`` it
+    scores whole windows and moves to the thread pool. The logs and traces agents
+    join when their directories are configured.
+    """
+    ranges = (
+        (sources.connectors is not None and sources.connectors.prometheus is not None)
+        or sources.store is not None
+        or sources.metric_windows is not None
+    )
+    agents = tuple(
+        _THREADED_METRICS_AGENT if ranges and agent.domain is AgentDomain.metrics else agent for agent in DEFAULT_SWARM
+    )
+    return agents + ((LOGS_AGENT,) if sources.app_logs is not None else ()) + (
+        (TRACES_AGENT,) if sources.traces is not None else ()
+    )
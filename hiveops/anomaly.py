@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class MetricWindow:
+    """Samples of many series of one metric aligned on a shared time axis.
+
+    ``values`` has shape ``(series, time)``; samples missing from a series are NaN.
+    """
+
+    labels: list[dict[str, str]]
+    timestamps: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_matrix(cls, result: Sequence[Mapping[str, Any]]) -> MetricWindow:
+        """Align a Prometheus ``matrix`` result (``[{"metric": ..., "values": [[ts, "v"], ...]}]``)."""
+        samples = [np.asarray(series["values"], dtype=float).reshape(-1, 2) for series in result]
+        if not samples:
+            return cls(labels=[], timestamps=np.empty(0), values=np.empty((0, 0)))
+
+        timestamps = np.unique(np.concatenate([sample[:, 0] for sample in samples]))
+        values = np.full((len(samples), len(timestamps)), np.nan)
+        for row, sample in enumerate(samples):
+            values[row, np.searchsorted(timestamps, sample[:, 0])] = sample[:, 1]
+        return cls(labels=[dict(series.get("metric", {})) for series in result], timestamps=timestamps, values=values)
+
+    @property
+    def series(self) -> int:
+        return self.values.shape[0]
+
+
+@dataclass(slots=True)
+class AnomalyReport:
+    series: int
+    anomalous_series: int
+    max_zscore: float
+    change_point_series: int
+    max_shift: float
+    max_burn_rate: float
+    worst_series: int | None
+    latency_score: float
+    burn_score: float
+
+    @property
+    def score(self) -> float:
+        """Overall anomaly strength in ``[0, 1]``."""
+        return max(self.latency_score, self.burn_score)
+
+    @property
+    def dominant(self) -> str:
+        """Which detector drove the score: ``latency``, ``errors`` or ``none``."""
+        if self.score == 0.0:
+            return "none"
+        return "errors" if self.burn_score >= self.latency_score else "latency"
+
+
+class AnomalyAnalyzer:
+    """Vectorized EWMA, rolling z-score, change-point and burn-rate detection.
+
+    Every detector operates on a ``(series, time)`` matrix at once, so analysing
+    thousands of series costs a handful of NumPy passes rather than a Python loop
+    per series. Only EWMA smoothing iterates, over time steps, not series.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        window: int = 10,
+        recent: int = 3,
+        z_threshold: float = 3.0,
+        shift_threshold: float = 6.0,
+        min_segment: int = 3,
+        slo_target: float = 0.999,
+        fast_burn: float = 14.4,
+    ):
+        self.alpha = alpha
+        self.window = window
+        self.recent = recent
+        self.z_threshold = z_threshold
+        self.shift_threshold = shift_threshold
+        self.min_segment = min_segment
+        self.slo_target = slo_target
+        self.fast_burn = fast_burn
+
+    def analyze(self, latency: np.ndarray | None = None, errors: np.ndarray | None = None) -> AnomalyReport:
+        """Score latency-like series for level shifts and error-ratio series for SLO burn."""
+        latency = _fill_gaps(latency) if latency is not None else np.empty((0, 0))
+        errors = _fill_gaps(errors) if errors is not None else np.empty((0, 0))
+
+        max_z = 0.0
+        anomalous = 0
+        worst: int | None = None
+        if latency.shape[0] and latency.shape[1] > self.window:
+            recent_z = np.abs(self.rolling_zscore(latency)[:, -self.recent:]).max(axis=1)
+            anomalous = int((recent_z >= self.z_threshold).sum())
+            worst = int(recent_z.argmax())
+            max_z = float(recent_z[worst])
+
+        max_shift = 0.0
+        shifted = 0
+        if latency.shape[0] and latency.shape[1] >= 2 * self.min_segment:
+            _, statistic = self.change_points(latency)
+            shifted = int((statistic >= self.shift_threshold).sum())
+            max_shift = float(statistic.max())
+
+        max_burn = float(self.burn_rates(errors).max()) if errors.size else 0.0
+
+        latency_score = max(_ramp(max_z, self.z_threshold), _ramp(max_shift, self.shift_threshold))
+        return AnomalyReport(
+            series=latency.shape[0] + errors.shape[0],
+            anomalous_series=anomalous,
+            max_zscore=round(max_z, 3),
+            change_point_series=shifted,
+            max_shift=round(max_shift, 3),
+            max_burn_rate=round(max_burn, 3),
+            worst_series=worst,
+            latency_score=round(latency_score, 3),
+            burn_score=round(min(max_burn / self.fast_burn, 1.0), 3),
+        )
+
+    def ewma(self, values: np.ndarray) -> np.ndarray:
+        smoothed = np.empty_like(values, dtype=float)
+        smoothed[:, 0] = values[:, 0]
+        for step in range(1, values.shape[1]):
+            smoothed[:, step] = self.alpha * values[:, step] + (1 - self.alpha) * smoothed[:, step - 1]
+        return smoothed
+
+    def rolling_zscore(self, values: np.ndarray) -> np.ndarray:
+        """Z-score of each EWMA-smoothed point against the trailing raw window before it.
+
+        Returns shape ``(series, time - window)``, aligned to ``values[:, window:]``.
+        """
+        w = self.window
+        zeros = np.zeros((values.shape[0], 1))
+        sums = np.concatenate([zeros, np.cumsum(values, axis=1)], axis=1)
+        squares = np.concatenate([zeros, np.cumsum(values**2, axis=1)], axis=1)
+        window_sum = sums[:, w:-1] - sums[:, : -w - 1]
+        window_sq = squares[:, w:-1] - squares[:, : -w - 1]
+        mean = window_sum / w
+        std = np.sqrt(np.maximum(window_sq / w - mean**2, 0.0))
+        std = np.maximum(std, np.maximum(0.01 * np.abs(mean), 1e-9))
+        return (self.ewma(values)[:, w:] - mean) / std
+
+    def change_points(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Best single mean-shift split per series and its standardized statistic.
+
+        Noise is estimated from the median absolute first difference so the shift
+        itself does not inflate it.
+        """
+        n = values.shape[1]
+        splits = np.arange(self.min_segment, n - self.min_segment + 1)
+        sums = np.cumsum(values, axis=1)
+        total = sums[:, -1:]
+        left = sums[:, splits - 1] / splits
+        right = (total - sums[:, splits - 1]) / (n - splits)
+        noise = np.median(np.abs(np.diff(values, axis=1)), axis=1, keepdims=True) / (0.6745 * np.sqrt(2))
+        noise = np.maximum(noise, np.maximum(0.01 * np.abs(values.mean(axis=1, keepdims=True)), 1e-9))
+        statistic = np.abs(left - right) * np.sqrt(splits * (n - splits) / n) / noise
+        best = statistic.argmax(axis=1)
+        return splits[best], statistic[np.arange(values.shape[0]), best]
+
+    def burn_rates(self, error_ratios: np.ndarray) -> np.ndarray:
+        """Multi-window burn rate per series: the lesser of the recent and whole-window rates."""
+        budget = 1.0 - self.slo_target
+        short = error_ratios[:, -max(self.recent, 1):].mean(axis=1) / budget
+        long = error_ratios.mean(axis=1) / budget
+        return np.minimum(short, long)
+
+
+def load_metric_windows(path: Path) -> dict[str, MetricWindow]:
+    """Read a fixture file of named Prometheus matrix results, e.g. ``{"latency": [...]}``."""
+    return {name: MetricWindow.from_matrix(result) for name, result in json.loads(path.read_text()).items()}
+
+
+def _ramp(statistic: float, threshold: float) -> float:
+    # 0 up to half the threshold, 1/3 at the threshold, saturating at twice the threshold.
+    return min(max((statistic - threshold / 2) / (1.5 * threshold), 0.0), 1.0)
+
+
+def _fill_gaps(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    if not missing.any():
+        return values
+    counts = np.maximum((~missing).sum(axis=1, keepdims=True), 1)
+    means = np.where(missing, 0.0, values).sum(axis=1, keepdims=True) / counts
+    return np.where(missing, means, values)
@@ -1,31 +1,169 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import tempfile
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import ExitStack, asynccontextmanager
 from dataclasses import asdict
+from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse, Response
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 
+from .agents import EvidenceSources, swarm_for
+from .broker import SqliteBroker, distributed_swarm
+from .cache import TriageCache
+from .changes import ChangeIndex
+from .connectors import ConnectorRuntime
+from .correlation import IncidentCorrelator
 from .evolution import EvolutionaryOptimizer
+from .executors import AgentExecutor
+from .informer import KubernetesInformer
 from .macog import MacogGenerator
 from .models import (
+    CorrelatedTriageResponse,
     EvolutionRequest,
     EvolutionResponse,
     HealthResponse,
+    IncidentClusterSummary,
     IacRequest,
     IacResponse,
     IncidentRequest,
     InvestigationResult,
     PlatformRoadmapResponse,
+    RunbookRequest,
+    SchedulerStatus,
+    ServiceTopologyResponse,
+    SimilarIncident,
+    SpendIngestResponse,
+    SpendRecord,
+    TenantOperation,
+    TenantUsage,
+    TopologyRequest,
+    TriageBatchError,
 )
 from .orchestrator import SwarmOrchestrator
 from .plans import StartupAlignmentPlan, build_alignment_plan
+from .retrieval import HistoryDocument, IncidentHistory
 from .roadmap import build_platform_roadmap
+from .scheduler import SchedulerSaturated, TriageScheduler
+from .spend import SpendMonitor
+from .store import EvidenceStore
+from .tenancy import DEFAULT_TENANT, QuotaExceeded, TenantGovernor
+from .topology import ServiceGraph
 
-app = FastAPI(title="HiveOps Platform", version="0.3.0")
-orchestrator = SwarmOrchestrator()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Agents keep listing pods through the connector until the informer's first sync completes.
+    syncing = asyncio.create_task(informer.start()) if informer is not None else None
+    yield
+    if syncing is not None:
+        syncing.cancel()
+        await informer.stop()
+    await connectors.aclose()
+    if evidence_store is not None:
+        evidence_store.flush()
+    if spend_state is not None:
+        spend_state.write_text(json.dumps(spend_monitor.to_dict()))
+    if broker is not None:
+        broker.close()
+    orchestrator.executor.shutdown(wait=False)
+
+
+app = FastAPI(title="HiveOps Platform", version="0.3.0", lifespan=lifespan)
+connectors = ConnectorRuntime.from_env()
+evidence_store = (
+    EvidenceStore(Path(os.environ["HIVEOPS_EVIDENCE_STORE"])) if os.environ.get("HIVEOPS_EVIDENCE_STORE") else None
+)
+change_index = (
+    ChangeIndex.from_database(Path(os.environ["HIVEOPS_CHANGES_DB"])) if os.environ.get("HIVEOPS_CHANGES_DB") else None
+)
+informer = KubernetesInformer(connectors.kubernetes) if connectors.kubernetes is not None else None
+topology = (
+    ServiceGraph.from_file(Path(os.environ["HIVEOPS_TOPOLOGY"])) if os.environ.get("HIVEOPS_TOPOLOGY") else None
+)
+spend_state = Path(os.environ["HIVEOPS_SPEND_STATE"]) if os.environ.get("HIVEOPS_SPEND_STATE") else None
+spend_monitor = (
+    SpendMonitor.from_dict(json.loads(spend_state.read_text()))
+    if spend_state is not None and spend_state.is_file()
+    else SpendMonitor()
+)
+app_logs = Path(os.environ["HIVEOPS_APP_LOGS"]) if os.environ.get("HIVEOPS_APP_LOGS") else None
+traces = Path(os.environ["HIVEOPS_TRACES"]) if os.environ.get("HIVEOPS_TRACES") else None
+broker = SqliteBroker(Path(os.environ["HIVEOPS_BROKER_DB"])) if os.environ.get("HIVEOPS_BROKER_DB") else None
+sources = EvidenceSources(
+    connectors=connectors,
+    store=evidence_store,
+    informer=informer,
+    changes=change_index,
+    security_logs=Path(os.environ["HIVEOPS_SECURITY_LOGS"]) if os.environ.get("HIVEOPS_SECURITY_LOGS") else None,
+    app_logs=app_logs,
+    traces=traces,
+    spend=spend_monitor,
+)
+agents = swarm_for(sources)
+orchestrator = SwarmOrchestrator(
+    agents=distributed_swarm(broker, agents) if broker is not None else agents,
+    cache=TriageCache(),
+    topology=topology,
+    history=IncidentHistory(Path(os.environ["HIVEOPS_HISTORY_DB"])) if os.environ.get("HIVEOPS_HISTORY_DB") else None,
+    executor=AgentExecutor.from_env(),
+    sources=sources,
+)
+tenant_quotas = Path(os.environ["HIVEOPS_TENANTS"]) if os.environ.get("HIVEOPS_TENANTS") else None
+tenants = TenantGovernor.from_file(tenant_quotas) if tenant_quotas is not None else TenantGovernor()
+scheduler = TriageScheduler(
+    orchestrator, concurrency=int(os.environ.get("HIVEOPS_TRIAGE_CONCURRENCY", "32")), tenants=tenants
+)
+telemetry = orchestrator.metrics.registry
+telemetry.gauge(
+    "hiveops_triage_queue_depth",
+    "Incidents waiting in the triage scheduler.",
+    ("severity",),
+    lambda: (((severity.value,), count) for severity, count in scheduler.status().queued.items()),
+)
+telemetry.gauge("hiveops_triage_running", "Investigations running now.", (), lambda: [((), scheduler.running)])
+telemetry.counter_callback(
+    "hiveops_triage_cache_lookups_total",
+    "Triage cache lookups by outcome; expired entries also count as misses.",
+    ("outcome",),
+    lambda: (
+        [(("hit",), stats.hits), (("miss",), stats.misses), (("expired",), stats.expirations)]
+        if (stats := orchestrator.cache and orchestrator.cache.stats) is not None
+        else []
+    ),
+)
+if broker is not None:
+    telemetry.gauge(
+        "hiveops_broker_tasks",
+        "Brokered agent tasks by status.",
+        ("status",),
+        lambda: (((status,), count) for status, count in broker.depth().items()),
+    )
 macog = MacogGenerator()
 evolution = EvolutionaryOptimizer()
 
+BATCH_SPOOL_BYTES = 1 << 20
+TENANT_HEADER = Header(default=DEFAULT_TENANT, alias="X-Tenant-ID")
+
+
+async def _tenant_triage(incident: IncidentRequest, tenant: str) -> InvestigationResult:
+    """Admit one incident under ``tenant``'s triage quota and the shared scheduler."""
+    with tenants.track(tenant, TenantOperation.triage):
+        return await scheduler.triage(incident, tenant)
+
+
+correlator = IncidentCorrelator(orchestrator, triage=_tenant_triage)
+
+
+def _quota_exceeded(exc: QuotaExceeded) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": str(max(1, round(exc.retry_after)))})
+
 
 @app.get("/", response_class=HTMLResponse)
 async def dashboard() -> str:
@@ -61,12 +199,24 @@ async def dashboard() -> str:
           <h3>Endpoints</h3>
           <ul>
             <li><code>GET /health</code></li>
+            <li><code>GET /metrics</code></li>
             <li><code>GET /platform/roadmap</code></li>
             <li><code>GET /platform/plan/alignment</code></li>
             <li><code>GET /platform/screenshot</code></li>
             <li><code>POST /incidents/triage</code></li>
+            <li><code>GET /incidents/scheduler</code></li>
+            <li><code>POST /incidents/triage/stream</code></li>
+            <li><code>POST /incidents/triage/batch</code></li>
+            <li><code>POST /incidents/correlate</code></li>
+            <li><code>GET /incidents/clusters</code></li>
+            <li><code>GET /incidents/similar</code></li>
+            <li><code>POST /runbooks</code></li>
+            <li><code>PUT /topology</code></li>
+            <li><code>GET /topology/{service}</code></li>
+            <li><code>POST /spend/records</code></li>
             <li><code>POST /iac/generate</code></li>
             <li><code>POST /pipelines/evolve</code></li>
+            <li><code>GET /tenants/usage</code></li>
             <li><code>GET /docs</code></li>
           </ul>
         </div>
@@ -75,6 +225,11 @@ async def dashboard() -> str:
     """
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    return Response(telemetry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     return HealthResponse(status="ok", version=app.version, agents=len(orchestrator.agents))
@@ -115,17 +270,205 @@ async def platform_alignment_plan() -> StartupAlignmentPlan:
 
 
 @app.post("/incidents/triage", response_model=InvestigationResult)
-async def triage_incident(incident: IncidentRequest) -> InvestigationResult:
-    return await orchestrator.triage(incident)
+async def triage_incident(incident: IncidentRequest, tenant: str = TENANT_HEADER) -> InvestigationResult:
+    try:
+        return await _tenant_triage(incident, tenant)
+    except QuotaExceeded as exc:
+        raise _quota_exceeded(exc) from exc
+    except SchedulerSaturated as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+
+
+@app.get("/incidents/scheduler", response_model=SchedulerStatus)
+async def scheduler_status() -> SchedulerStatus:
+    return scheduler.status()
+
+
+@app.get("/tenants/usage", response_model=list[TenantUsage])
+async def tenant_usage() -> list[TenantUsage]:
+    return tenants.usage()
+
+
+@app.post("/incidents/triage/stream")
+async def triage_incident_stream(incident: IncidentRequest, tenant: str = TENANT_HEADER) -> StreamingResponse:
+    usage = ExitStack()
+    try:
+        usage.enter_context(tenants.track(tenant, TenantOperation.triage))
+    except QuotaExceeded as exc:
+        raise _quota_exceeded(exc) from exc
+    try:
+        release = await scheduler.reserve(incident, tenant)
+    except BaseException as exc:
+        usage.__exit__(type(exc), exc, exc.__traceback__)
+        if isinstance(exc, SchedulerSaturated):
+            raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+        raise
+
+    def finish() -> None:
+        release()
+        usage.close()
+
+    async def ndjson():
+        try:
+            async for event in orchestrator.triage_stream(incident):
+                yield event.model_dump_json() + "\n"
+        except BaseException as exc:
+            release()
+            usage.__exit__(type(exc), exc, exc.__traceback__)
+            raise
+        finally:
+            finish()
+
+    # The background task frees the slot if the client leaves before the body is iterated.
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", background=BackgroundTask(finish))
+
+
+@app.post("/incidents/triage/batch")
+async def triage_incident_batch(
+    request: Request,
+    concurrency: int = Query(default=16, ge=1, le=256),
+    tenant: str = TENANT_HEADER,
+) -> StreamingResponse:
+    """Triage an NDJSON stream of incidents, streaming results back as they complete.
+
+    The upload is spooled (spilling to disk past ``BATCH_SPOOL_BYTES``) before the
+    response starts, because a streaming response competes with the request body
+    for ASGI receive messages. Lines that fail validation are reported inline as
+    ``{"line": n, "error": ...}``. Every incident is admitted through the triage
+    scheduler under the caller's tenant quota, so ``concurrency`` only bounds how
+    many this batch has queued or running; an incident throttled by the quota or
+    shed by the scheduler is reported inline the same way.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=BATCH_SPOOL_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    errors: deque[TriageBatchError] = deque()
+    lines: dict[int, int] = {}
+
+    async def incidents() -> AsyncIterator[IncidentRequest]:
+        for number, line in enumerate(spool, start=1):
+            if not line.strip():
+                continue
+            try:
+                incident = IncidentRequest.model_validate_json(line)
+            except ValueError as exc:
+                errors.append(TriageBatchError(line=number, error=str(exc)))
+                continue
+            lines[id(incident)] = number
+            yield incident
+
+    async def triage(incident: IncidentRequest) -> InvestigationResult:
+        line = lines.pop(id(incident))
+        try:
+            return await _tenant_triage(incident, tenant)
+        except (QuotaExceeded, SchedulerSaturated) as exc:
+            errors.append(TriageBatchError(line=line, error=str(exc)))
+            raise
+
+    def skip_shed(_: IncidentRequest, exc: Exception) -> None:
+        if not isinstance(exc, (QuotaExceeded, SchedulerSaturated)):
+            raise exc
+
+    async def ndjson():
+        try:
+            results = orchestrator.triage_many(incidents(), concurrency, triage=triage, on_error=skip_shed)
+            async for result in results:
+                while errors:
+                    yield errors.popleft().model_dump_json() + "\n"
+                yield result.model_dump_json() + "\n"
+            while errors:
+                yield errors.popleft().model_dump_json() + "\n"
+        finally:
+            spool.close()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.post("/incidents/correlate", response_model=CorrelatedTriageResponse)
+async def correlate_incidents(
+    incidents: list[IncidentRequest], tenant: str = TENANT_HEADER
+) -> CorrelatedTriageResponse:
+    try:
+        return await correlator.triage_batch(incidents, tenant)
+    except QuotaExceeded as exc:
+        raise _quota_exceeded(exc) from exc
+    except SchedulerSaturated as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+
+
+@app.get("/incidents/clusters", response_model=list[IncidentClusterSummary])
+async def incident_clusters(tenant: str = TENANT_HEADER) -> list[IncidentClusterSummary]:
+    return [cluster.summary() for cluster in correlator.clusters(tenant)]
+
+
+@app.get("/incidents/similar", response_model=list[SimilarIncident])
+async def similar_incidents(
+    symptom: str = Query(min_length=3), service: str | None = None, k: int = Query(default=3, ge=1, le=50)
+) -> list[SimilarIncident]:
+    if orchestrator.history is None:
+        raise HTTPException(status_code=404, detail="No incident history configured")
+    return await asyncio.to_thread(orchestrator.history.similar, symptom, service=service, k=k)
+
+
+@app.post("/runbooks", response_model=RunbookRequest)
+async def index_runbook(req: RunbookRequest) -> RunbookRequest:
+    if orchestrator.history is None:
+        raise HTTPException(status_code=404, detail="No incident history configured")
+    await asyncio.to_thread(
+        orchestrator.history.add,
+        HistoryDocument(
+            ref=req.ref,
+            text=f"{req.title} {req.text}",
+            kind="runbook",
+            service=req.service,
+            title=req.title,
+            action=req.action,
+        ),
+    )
+    return req
+
+
+@app.put("/topology", response_model=TopologyRequest)
+async def load_topology(req: TopologyRequest) -> TopologyRequest:
+    orchestrator.topology = ServiceGraph.from_document(req.model_dump())
+    return req
+
+
+@app.get("/topology/{service}", response_model=ServiceTopologyResponse)
+async def service_topology(service: str) -> ServiceTopologyResponse:
+    graph = orchestrator.topology
+    if graph is None:
+        raise HTTPException(status_code=404, detail="No service topology loaded")
+    return ServiceTopologyResponse(
+        service=service,
+        direct_dependencies=graph.direct_dependencies(service),
+        dependencies=graph.dependencies(service),
+        blast_radius=graph.blast_radius(service),
+    )
+
+
+@app.post("/spend/records", response_model=SpendIngestResponse)
+async def ingest_spend(records: list[SpendRecord]) -> SpendIngestResponse:
+    accepted = spend_monitor.observe_many(record.model_dump() for record in records)
+    return SpendIngestResponse(accepted=accepted, tracked_keys=len(spend_monitor))
 
 
 @app.post("/iac/generate", response_model=IacResponse)
-async def generate_iac(req: IacRequest) -> IacResponse:
-    plan = macog.generate(intent=req.intent, provider=req.provider)
+async def generate_iac(req: IacRequest, tenant: str = TENANT_HEADER) -> IacResponse:
+    try:
+        with tenants.track(tenant, TenantOperation.iac):
+            plan = macog.generate(intent=req.intent, provider=req.provider)
+    except QuotaExceeded as exc:
+        raise _quota_exceeded(exc) from exc
     return IacResponse(**asdict(plan))
 
 
 @app.post("/pipelines/evolve", response_model=EvolutionResponse)
-async def evolve_pipeline(req: EvolutionRequest) -> EvolutionResponse:
-    result = evolution.evolve(generation=req.generation)
+async def evolve_pipeline(req: EvolutionRequest, tenant: str = TENANT_HEADER) -> EvolutionResponse:
+    try:
+        with tenants.track(tenant, TenantOperation.evolve):
+            result = evolution.evolve(generation=req.generation)
+    except QuotaExceeded as exc:
+        raise _quota_exceeded(exc) from exc
     return EvolutionResponse(**asdict(result))
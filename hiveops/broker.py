@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .agents import DEFAULT_SWARM, DEFAULT_WINDOW_MINUTES, EvidenceSources, MicroAgent, swarm_for
+from .executors import AgentExecutor, ExecutionMode
+from .features import IncidentFeatures
+from .models import AgentDomain, IncidentRequest, Severity, Signal
+
+LEASE_SECONDS = 30.0
+MAX_ATTEMPTS = 3
+
+_PRIORITY = {severity: rank for rank, severity in enumerate(Severity)}
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    domain TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, domain, priority DESC, id);
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    domains TEXT NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+
+class BrokerError(RuntimeError):
+    """A work unit was given up on after ``max_attempts`` failed or expired leases."""
+
+
+@dataclass(slots=True)
+class WorkUnit:
+    task_id: int
+    domain: AgentDomain
+    incident: IncidentRequest
+    window_minutes: int
+    related: tuple[str, ...]
+    attempts: int
+
+
+class SqliteBroker:
+    """Durable queue of agent investigations shared through one SQLite file.
+
+    The orchestrator publishes one task per agent and polls for its signal; workers
+    lease tasks for their domains, most severe incident first. A lease lasts
+    ``lease_seconds`` and is renewed by the holder's heartbeat, so a task held by a
+    crashed worker becomes leasable again. After ``max_attempts`` failures or expired
+    leases it is marked dead and :meth:`result` raises :class:`BrokerError`.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def publish(
+        self,
+        domain: AgentDomain,
+        incident: IncidentRequest,
+        window_minutes: int = DEFAULT_WINDOW_MINUTES,
+        related: Iterable[str] = (),
+    ) -> int:
+        payload = json.dumps(
+            {"incident": incident.model_dump(mode="json"), "window_minutes": window_minutes, "related": list(related)}
+        )
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO tasks (domain, priority, payload) VALUES (?, ?, ?)",
+                (domain.value, _PRIORITY[incident.severity], payload),
+            )
+        return cursor.lastrowid
+
+    def lease(self, worker: str, domains: Iterable[AgentDomain], limit: int = 1) -> list[WorkUnit]:
+        """Claim up to ``limit`` queued or lease-expired tasks for ``domains``."""
+        names = [domain.value for domain in domains]
+        marks = ",".join("?" * len(names))
+        now = self._clock()
+        units = []
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire(now)
+                rows = self._db.execute(
+                    f"SELECT id, domain, payload, attempts FROM tasks WHERE domain IN ({marks}) "
+                    "AND (status = 'queued' OR (status = 'leased' AND lease_expires < ?)) "
+                    "ORDER BY priority DESC, id LIMIT ?",
+                    (*names, now, limit),
+                ).fetchall()
+                for task_id, domain, payload, attempts in rows:
+                    self._db.execute(
+                        "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                        "WHERE id = ?",
+                        (worker, now + self.lease_seconds, task_id),
+                    )
+                    document = json.loads(payload)
+                    units.append(
+                        WorkUnit(
+                            task_id=task_id,
+                            domain=AgentDomain(domain),
+                            incident=IncidentRequest.model_validate(document["incident"]),
+                            window_minutes=document["window_minutes"],
+                            related=tuple(document["related"]),
+                            attempts=attempts + 1,
+                        )
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return units
+
+    def complete(self, task_id: int, worker: str, signal: Signal) -> bool:
+        """Store a leased task's signal; False if the lease was lost to another worker."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE tasks SET status = 'done', result = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                (signal.model_dump_json(), task_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: int, worker: str, error: str) -> None:
+        """Give a leased task back for retry, or mark it dead once its attempts are spent."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'queued' END, "
+                "worker = NULL, lease_expires = NULL, error = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, error, task_id, worker),
+            )
+
+    def heartbeat(self, worker: str, domains: Iterable[AgentDomain]) -> None:
+        """Record ``worker`` as alive and renew the leases it holds."""
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO workers (worker, domains, heartbeat_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (worker) DO UPDATE SET domains = excluded.domains, heartbeat_at = excluded.heartbeat_at",
+                (worker, ",".join(domain.value for domain in domains), now),
+            )
+            self._db.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE worker = ? AND status = 'leased'",
+                (now + self.lease_seconds, worker),
+            )
+
+    def retire(self, worker: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM workers WHERE worker = ?", (worker,))
+
+    def live_workers(self, domain: AgentDomain | None = None) -> list[str]:
+        """Workers that heartbeat within one lease period, optionally serving ``domain``."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT worker, domains FROM workers WHERE heartbeat_at >= ?", (self._clock() - self.lease_seconds,)
+            ).fetchall()
+        return [worker for worker, domains in rows if domain is None or domain.value in domains.split(",")]
+
+    def result(self, task_id: int) -> Signal | None:
+        with self._lock:
+            row = self._db.execute("SELECT status, result, error FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise BrokerError(f"task {task_id} is unknown")
+        status, result, error = row
+        if status == "dead":
+            raise BrokerError(f"task {task_id} failed: {error}")
+        return Signal.model_validate_json(result) if status == "done" else None
+
+    def acknowledge(self, task_id: int) -> None:
+        """Drop a task whose outcome the publisher has consumed or no longer wants."""
+        with self._lock:
+            self._db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def depth(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._db.execute("SELECT status, count(*) FROM tasks GROUP BY status").fetchall())
+
+    def _expire(self, now: float) -> None:
+        self._db.execute(
+            "UPDATE tasks SET status = 'dead', error = 'lease expired', worker = NULL "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, self.max_attempts),
+        )
+
+
+@dataclass(slots=True)
+class BrokeredAgent(MicroAgent):
+    """A :class:`MicroAgent` whose investigation runs on a remote worker via ``broker``.
+
+    With no live worker serving the domain, whether at publish time or while waiting
+    for the result, or once the broker gives up on the task, the agent investigates
+    in-process instead, so a distributed swarm degrades to the local one rather than
+    failing the incident.
+    """
+
+    broker: SqliteBroker | None = None
+    poll_seconds: float = 0.01
+
+    async def investigate(
+        self,
+        incident: IncidentRequest,
+        window_minutes: int = DEFAULT_WINDOW_MINUTES,
+        sources: EvidenceSources | None = None,
+        executor: AgentExecutor | None = None,
+        related: tuple[str, ...] = (),
+        features: IncidentFeatures | None = None,
+    ) -> Signal:
+        local = MicroAgent(self.domain, self.execution)
+        broker = self.broker
+        if broker is None or not await asyncio.to_thread(broker.live_workers, self.domain):
+            return await local.investigate(incident, window_minutes, sources, executor, related, features)
+
+        task_id = await asyncio.to_thread(broker.publish, self.domain, incident, window_minutes, related)
+        delay = self.poll_seconds
+        try:
+            while True:
+                try:
+                    signal = await asyncio.to_thread(broker.result, task_id)
+                except BrokerError:
+                    return await local.investigate(incident, window_minutes, sources, executor, related, features)
+                if signal is not None:
+                    return signal
+                if not await asyncio.to_thread(broker.live_workers, self.domain):
+                    # Every worker for the domain is gone; nobody will lease the task before it expires.
+                    return await local.investigate(incident, window_minutes, sources, executor, related, features)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.25)
+        finally:
+            # Acknowledge on every exit, including cancellation, so no worker picks up stale work.
+            await asyncio.shield(asyncio.to_thread(broker.acknowledge, task_id))
+
+
+def distributed_swarm(broker: SqliteBroker, agents: Iterable[MicroAgent] = DEFAULT_SWARM) -> tuple[MicroAgent, ...]:
+    return tuple(BrokeredAgent(agent.domain, agent.execution, broker=broker) for agent in agents)
+
+
+class AgentWorker:
+    """Leases work units for ``domains`` from ``broker`` and runs them with local evidence sources."""
+
+    def __init__(
+        self,
+        broker: SqliteBroker,
+        domains: Iterable[AgentDomain] = tuple(AgentDomain),
+        sources: EvidenceSources | None = None,
+        executor: AgentExecutor | None = None,
+        worker_id: str | None = None,
+        concurrency: int = 8,
+        poll_seconds: float = 0.05,
+    ):
+        self.broker = broker
+        self.domains = tuple(domains)
+        self.sources = sources
+        self.executor = executor or AgentExecutor()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self._execution = {agent.domain: agent.execution for agent in swarm_for(sources or EvidenceSources())}
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        stop = stop or asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(stop))
+        try:
+            while not stop.is_set():
+                if not await self.run_once():
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            heartbeat.cancel()
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight, return_exceptions=True)
+            await asyncio.to_thread(self.broker.retire, self.worker_id)
+
+    async def run_once(self) -> int:
+        """Lease as many units as there are free slots and start them; returns how many."""
+        free = self.concurrency - len(self._in_flight)
+        if free <= 0:
+            await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+            return 0
+        units = await asyncio.to_thread(self.broker.lease, self.worker_id, self.domains, free)
+        for unit in units:
+            task = asyncio.create_task(self._process(unit))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        return len(units)
+
+    async def _process(self, unit: WorkUnit) -> None:
+        agent = MicroAgent(unit.domain, self._execution.get(unit.domain, ExecutionMode.inline))
+        try:
+            signal = await agent.investigate(
+                unit.incident, unit.window_minutes, self.sources, self.executor, unit.related
+            )
+        except Exception as exc:
+            await asyncio.to_thread(self.broker.fail, unit.task_id, self.worker_id, f"{type(exc).__name__}: {exc}")
+            return
+        await asyncio.to_thread(self.broker.complete, unit.task_id, self.worker_id, signal)
+
+    async def _heartbeat(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await asyncio.to_thread(self.broker.heartbeat, self.worker_id, self.domains)
+            await asyncio.sleep(self.broker.lease_seconds / 3)
+
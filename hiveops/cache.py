@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from .models import IncidentRequest, InvestigationResult
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_NON_WORD = re.compile(r"[^\w#]+")
+
+Fingerprint = tuple[str, str, str, str]
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+def normalize_symptom(symptom: str) -> str:
+    """Lower-case, strip punctuation and mask numbers in an alert symptom.
+
+    Masking numbers lets re-fired alerts that only differ in the reported value
+    (``p95 1200ms`` vs ``p95 1350ms``) normalize to the same text.
+    """
+    symptom = _NUMBER.sub("#", symptom.lower())
+    return " ".join(_NON_WORD.sub(" ", symptom).split())
+
+
+def fingerprint(incident: IncidentRequest) -> Fingerprint:
+    """Normalize the fields that decide a triage outcome, ignoring ``incident_id``."""
+    return (
+        incident.service.strip().lower(),
+        normalize_symptom(incident.symptom),
+        incident.severity.value,
+        incident.environment,
+    )
+
+
+class TriageCache:
+    """LRU cache of investigation results with per-entry TTL, keyed by incident fingerprint."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Fingerprint, tuple[float, InvestigationResult]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, incident: IncidentRequest) -> InvestigationResult | None:
+        """Return the cached result re-stamped for ``incident``, or ``None`` on a miss."""
+        key = fingerprint(incident)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, result = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return result.model_copy(
+            update={
+                "incident_id": incident.incident_id,
+                "generated_at": datetime.now(timezone.utc),
+            }
+        )
+
+    def put(self, incident: IncidentRequest, result: InvestigationResult) -> None:
+        key = fingerprint(incident)
+        self._entries[key] = (self._clock() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import heapq
+import sqlite3
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    """A commit, pipeline run or deployment that touched ``service`` during ``[started_at, ended_at]``."""
+
+    service: str
+    kind: str
+    ref: str
+    started_at: datetime
+    ended_at: datetime
+    summary: str = ""
+    environment: str | None = None
+
+    @property
+    def sort_key(self) -> tuple[float, float]:
+        return self.started_at.timestamp(), self.ended_at.timestamp()
+
+
+class _Block:
+    """Immutable interval tree laid out over an array sorted by start time.
+
+    The node for index range ``[lo, hi)`` is its midpoint, and ``max_end[mid]`` is
+    the latest end time anywhere in that range, so a search can skip whole
+    subtrees that finish before the query window opens.
+    """
+
+    def __init__(self, events: list[ChangeEvent]):
+        self.events = events
+        self.starts = [event.started_at.timestamp() for event in events]
+        self.ends = [event.ended_at.timestamp() for event in events]
+        self.max_end = [0.0] * len(events)
+        self._augment(0, len(events))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def overlapping(self, start: float, end: float, out: list[ChangeEvent]) -> None:
+        self._search(0, len(self.events), start, end, out)
+
+    def _augment(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return float("-inf")
+        mid = (lo + hi) // 2
+        self.max_end[mid] = max(self.ends[mid], self._augment(lo, mid), self._augment(mid + 1, hi))
+        return self.max_end[mid]
+
+    def _search(self, lo: int, hi: int, start: float, end: float, out: list[ChangeEvent]) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self.max_end[mid] < start:
+            return
+        self._search(lo, mid, start, end, out)
+        if self.starts[mid] > end:
+            return
+        if self.ends[mid] >= start:
+            out.append(self.events[mid])
+        self._search(mid + 1, hi, start, end, out)
+
+
+class _IntervalIndex:
+    """Dynamic interval index built from static blocks whose sizes form a binary counter.
+
+    Inserting merges equal-sized blocks (amortized ``O(log n)`` per event); a query
+    searches each of the ``O(log n)`` blocks in ``O(log n + k)``.
+    """
+
+    def __init__(self) -> None:
+        self._blocks: list[_Block] = []
+
+    def __len__(self) -> int:
+        return sum(len(block) for block in self._blocks)
+
+    def add(self, events: list[ChangeEvent]) -> None:
+        carry = sorted(events, key=lambda event: event.sort_key)
+        while self._blocks and len(self._blocks[-1]) <= len(carry):
+            carry = list(heapq.merge(self._blocks.pop().events, carry, key=lambda event: event.sort_key))
+        self._blocks.append(_Block(carry))
+
+    def overlapping(self, start: float, end: float) -> list[ChangeEvent]:
+        found: list[ChangeEvent] = []
+        for block in self._blocks:
+            block.overlapping(start, end, found)
+        return found
+
+
+class ChangeIndex:
+    """Per-service interval index of change events for correlating incidents with change windows."""
+
+    def __init__(self, events: Iterable[ChangeEvent] = ()):
+        self._services: defaultdict[str, _IntervalIndex] = defaultdict(_IntervalIndex)
+        self.extend(events)
+
+    def __contains__(self, service: object) -> bool:
+        return service in self._services
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self._services.values())
+
+    def add(self, event: ChangeEvent) -> None:
+        self._services[event.service].add([event])
+
+    def extend(self, events: Iterable[ChangeEvent]) -> None:
+        grouped: defaultdict[str, list[ChangeEvent]] = defaultdict(list)
+        for event in events:
+            grouped[event.service].append(event)
+        for service, batch in grouped.items():
+            self._services[service].add(batch)
+
+    def overlapping(self, services: str | Iterable[str], start: datetime, end: datetime) -> list[ChangeEvent]:
+        """Changes to any of ``services`` whose interval intersects ``[start, end]``, oldest first."""
+        names = [services] if isinstance(services, str) else list(services)
+        found = [
+            event
+            for name in names
+            if name in self._services
+            for event in self._services[name].overlapping(start.timestamp(), end.timestamp())
+        ]
+        return sorted(found, key=lambda event: event.sort_key)
+
+    @classmethod
+    def from_database(cls, path: Path) -> ChangeIndex:
+        """Load commits, pipeline runs and environment deployments from the backend's SQLite schema.
+
+        Each project is treated as the service of the same name; rows without a project
+        (``project_id`` is nullable) have no service to attach to and are skipped.
+        """
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            projects = dict(connection.execute("SELECT id, name FROM projects"))
+            events: list[ChangeEvent] = []
+            for project_id, sha, message, created_at in connection.execute(
+                "SELECT project_id, sha, message, created_at FROM commits"
+            ):
+                if project_id not in projects:
+                    continue
+                at = _parse_timestamp(created_at)
+                summary = (message.splitlines() or [""])[0]
+                events.append(ChangeEvent(projects[project_id], "commit", sha, at, at, summary))
+            for project_id, ref, sha, status, duration, created_at in connection.execute(
+                "SELECT project_id, ref, sha, status, duration_seconds, created_at FROM pipelines"
+            ):
+                if project_id not in projects:
+                    continue
+                at = _parse_timestamp(created_at)
+                events.append(
+                    ChangeEvent(
+                        projects[project_id],
+                        "pipeline",
+                        sha or ref,
+                        at,
+                        at + timedelta(seconds=duration or 0),
+                        f"pipeline on {ref} {status}",
+                    )
+                )
+            for project_id, name, deployed_at in connection.execute(
+                "SELECT project_id, name, last_deployment_at FROM environments WHERE last_deployment_at != ''"
+            ):
+                if project_id not in projects:
+                    continue
+                at = _parse_timestamp(deployed_at)
+                events.append(
+                    ChangeEvent(projects[project_id], "deployment", name, at, at, f"deployed to {name}", name)
+                )
+        finally:
+            connection.close()
+        return cls(events)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
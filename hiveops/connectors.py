@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import httpx
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+class ConnectorError(RuntimeError):
+    """A backend query failed; agents fall back to symptom-only analysis."""
+
+
+@dataclass(slots=True)
+class ConnectorStats:
+    requests: int = 0
+    coalesced: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+
+class LatencyTracker:
+    """Rolling window of recent request latencies with a cached p95."""
+
+    def __init__(self, size: int = 256, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=size)
+        self._p95: float | None = None
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._p95 = None
+
+    def p95(self) -> float | None:
+        if len(self._samples) < self.min_samples:
+            return None
+        if self._p95 is None:
+            ordered = sorted(self._samples)
+            self._p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return self._p95
+
+
+class Connector:
+    """Persistent keep-alive HTTP client for one evidence backend.
+
+    Every connector owns a single pooled ``httpx.AsyncClient`` for its lifetime, so
+    each triage reuses warm connections instead of opening new ones per query.
+    Identical in-flight queries are coalesced onto one request (singleflight), and
+    with ``hedge`` enabled a duplicate request is sent once the first has run past
+    the connector's observed p95; whichever answers first wins.
+    """
+
+    name = "backend"
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        token: str | None = None,
+        timeout: float = 5.0,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_concurrent_queries: int = 16,
+        hedge: bool = False,
+    ):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=limits,
+            transport=transport,
+        )
+        self._bulk_slots = asyncio.Semaphore(max_concurrent_queries)
+        self.hedge = hedge
+        self.latency = LatencyTracker()
+        self.stats = ConnectorStats()
+        self._in_flight: dict[tuple[str, tuple[tuple[str, str], ...]], asyncio.Task[Any]] = {}
+
+    async def get_json(self, path: str, params: Mapping[str, Any] | None = None) -> Any:
+        """Fetch ``path``, sharing the response with identical queries already in flight.
+
+        Callers must treat the returned JSON as read-only since it may be shared.
+        """
+        key = (path, tuple(sorted((name, str(value)) for name, value in (params or {}).items())))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_hedged(path, params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats.coalesced += 1
+        # Shielded so one caller timing out does not cancel the request for the others.
+        return await asyncio.shield(task)
+
+    async def _fetch_hedged(self, path: str, params: Mapping[str, Any] | None) -> Any:
+        p95 = self.latency.p95() if self.hedge else None
+        if p95 is None:
+            return await self._fetch(path, params)
+
+        # Latency is recorded here, from the original start: a backup's own duration would
+        # understate what the caller waited, and a cancelled primary took at least as long.
+        started = time.perf_counter()
+        primary = asyncio.create_task(self._fetch(path, params, record=False))
+        done, _ = await asyncio.wait({primary}, timeout=p95)
+        if done:
+            payload = primary.result()
+            self.latency.record(time.perf_counter() - started)
+            return payload
+
+        self.stats.hedged += 1
+        backup = asyncio.create_task(self._fetch(path, params, record=False))
+        racing = {primary, backup}
+        try:
+            while racing:
+                done, racing = await asyncio.wait(racing, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.stats.hedge_wins += 1
+                        # Past the hedge delay either way, so a backup win leaves the primary
+                        # censored at this elapsed time rather than missing from the window.
+                        self.latency.record(time.perf_counter() - started)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in racing:
+                task.cancel()
+
+    async def _fetch(self, path: str, params: Mapping[str, Any] | None, record: bool = True) -> Any:
+        self.stats.requests += 1
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(path, params=params)
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            raise ConnectorError(f"{self.name} {path} failed: {exc}") from exc
+        if record:
+            self.latency.record(time.perf_counter() - started)
+        return payload
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class PrometheusConnector(Connector):
+    name = "prometheus"
+
+    async def query(self, promql: str, at: datetime | None = None) -> list[dict[str, Any]]:
+        params: dict[str, Any] = {"query": promql}
+        if at is not None:
+            params["time"] = at.timestamp()
+        payload = await self.get_json("/api/v1/query", params)
+        return payload["data"]["result"]
+
+    async def query_range(
+        self, promql: str, start: datetime, end: datetime, step_seconds: int = 60
+    ) -> list[dict[str, Any]]:
+        payload = await self.get_json(
+            "/api/v1/query_range",
+            {"query": promql, "start": start.timestamp(), "end": end.timestamp(), "step": step_seconds},
+        )
+        return payload["data"]["result"]
+
+    async def query_many(self, queries: Sequence[str], at: datetime | None = None) -> list[list[dict[str, Any]]]:
+        """Run several instant queries concurrently over the shared connection pool."""
+
+        async def bounded(promql: str) -> list[dict[str, Any]]:
+            async with self._bulk_slots:
+                return await self.query(promql, at)
+
+        return list(await asyncio.gather(*(bounded(promql) for promql in queries)))
+
+
+class KubernetesConnector(Connector):
+    name = "kubernetes"
+
+    async def list_pods(
+        self, namespace: str | None = None, label_selector: str | None = None
+    ) -> list[dict[str, Any]]:
+        path = f"/api/v1/namespaces/{namespace}/pods" if namespace else "/api/v1/pods"
+        params = {"labelSelector": label_selector} if label_selector else None
+        return (await self.get_json(path, params))["items"]
+
+    async def list_events(
+        self, namespace: str | None = None, field_selector: str | None = None
+    ) -> list[dict[str, Any]]:
+        path = f"/api/v1/namespaces/{namespace}/events" if namespace else "/api/v1/events"
+        params = {"fieldSelector": field_selector} if field_selector else None
+        return (await self.get_json(path, params))["items"]
+
+    async def list_resource(self, path: str) -> dict[str, Any]:
+        """Full list response for ``path``, including ``metadata.resourceVersion`` to watch from."""
+        return await self.get_json(path)
+
+    async def watch(
+        self, path: str, resource_version: str, timeout_seconds: float = 300.0
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield watch events (``{"type": ..., "object": ...}``) until the server ends the stream."""
+        params = {
+            "watch": "true",
+            "resourceVersion": resource_version,
+            "timeoutSeconds": timeout_seconds,
+            "allowWatchBookmarks": "true",
+        }
+        self.stats.requests += 1
+        try:
+            async with self.client.stream(
+                "GET", path, params=params, timeout=httpx.Timeout(self.client.timeout.connect, read=timeout_seconds + 10)
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line:
+                        yield json.loads(line)
+        except (httpx.HTTPError, ValueError) as exc:
+            raise ConnectorError(f"{self.name} watch {path} failed: {exc}") from exc
+
+
+class GitHubConnector(Connector):
+    name = "github"
+
+    def __init__(self, base_url: str, *, owner: str = "hiveops", **kwargs: Any):
+        super().__init__(base_url, **kwargs)
+        self.owner = owner
+
+    async def list_commits(self, repo: str, since: datetime) -> list[dict[str, Any]]:
+        return await self.get_json(f"/repos/{self.owner}/{repo}/commits", {"since": since.isoformat()})
+
+    async def list_deployments(self, repo: str) -> list[dict[str, Any]]:
+        return await self.get_json(f"/repos/{self.owner}/{repo}/deployments")
+
+
+@dataclass(slots=True)
+class ConnectorRuntime:
+    """The set of connectors agents may query; any backend left unset is skipped."""
+
+    prometheus: PrometheusConnector | None = None
+    kubernetes: KubernetesConnector | None = None
+    github: GitHubConnector | None = None
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> ConnectorRuntime:
+        """Build connectors from ``HIVEOPS_*_URL`` variables, optional tokens and ``HIVEOPS_HEDGE_QUERIES``."""
+        prometheus_url = environ.get("HIVEOPS_PROMETHEUS_URL")
+        kubernetes_url = environ.get("HIVEOPS_KUBERNETES_URL")
+        github_url = environ.get("HIVEOPS_GITHUB_URL")
+        hedge = environ.get("HIVEOPS_HEDGE_QUERIES", "").lower() in {"1", "true", "yes"}
+        return cls(
+            prometheus=PrometheusConnector(prometheus_url, hedge=hedge) if prometheus_url else None,
+            kubernetes=(
+                KubernetesConnector(
+                    kubernetes_url, token=environ.get("HIVEOPS_KUBERNETES_TOKEN"), hedge=hedge
+                )
+                if kubernetes_url
+                else None
+            ),
+            github=(
+                GitHubConnector(
+                    github_url,
+                    owner=environ.get("HIVEOPS_GITHUB_OWNER", "hiveops"),
+                    token=environ.get("HIVEOPS_GITHUB_TOKEN"),
+                    hedge=hedge,
+                )
+                if github_url
+                else None
+            ),
+        )
+
+    @classmethod
+    def standin(cls, fixtures: Mapping[str, Any] | None = None) -> ConnectorRuntime:
+        """Connectors wired in-process to the fixture-replaying stand-in backends."""
+        from .standins import create_standin_app
+
+        transport = httpx.ASGITransport(app=create_standin_app(fixtures))
+        base_url = "http://standin"
+        return cls(
+            prometheus=PrometheusConnector(base_url, transport=transport),
+            kubernetes=KubernetesConnector(base_url, transport=transport),
+            github=GitHubConnector(base_url, transport=transport),
+        )
+
+    def stats(self) -> dict[str, ConnectorStats]:
+        return {
+            connector.name: connector.stats
+            for connector in (self.prometheus, self.kubernetes, self.github)
+            if connector is not None
+        }
+
+    async def aclose(self) -> None:
+        for connector in (self.prometheus, self.kubernetes, self.github):
+            if connector is not None:
+                await connector.aclose()
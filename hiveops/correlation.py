@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from .cache import normalize_symptom
+from .models import (
+    CorrelatedTriageResponse,
+    IncidentClusterSummary,
+    IncidentRequest,
+    InvestigationResult,
+    Severity,
+)
+from .orchestrator import SwarmOrchestrator
+from .tenancy import DEFAULT_TENANT
+
+_SEVERITY_RANK = {severity: rank for rank, severity in enumerate(Severity)}
+
+
+@dataclass(slots=True)
+class IncidentCluster:
+    """Incidents believed to share one root cause; the swarm runs once for the leader."""
+
+    cluster_id: str
+    leader: IncidentRequest
+    tokens: frozenset[str]
+    opened_at: datetime
+    last_seen_at: datetime
+    members: list[IncidentRequest] = field(default_factory=list)
+    services: set[str] = field(default_factory=set)
+    run: asyncio.Task[InvestigationResult] | None = None
+    tenant: str = DEFAULT_TENANT
+
+    def summary(self) -> IncidentClusterSummary:
+        return IncidentClusterSummary(
+            cluster_id=self.cluster_id,
+            leader_incident_id=self.leader.incident_id,
+            environment=self.leader.environment,
+            services=sorted(self.services),
+            member_incident_ids=[member.incident_id for member in self.members],
+            opened_at=self.opened_at,
+            last_seen_at=self.last_seen_at,
+        )
+
+
+class IncidentCorrelator:
+    """Alert-storm stage in front of the swarm that groups related incidents.
+
+    An incident joins an open cluster in the same environment when it was observed
+    within ``window_seconds`` of the cluster's last member and its symptom tokens
+    overlap the cluster's (Jaccard) by at least ``similarity`` for the same service,
+    or ``cross_service_similarity`` for a different one. The most severe member
+    leads the cluster and is the one the swarm investigates, through ``triage`` when
+    given (e.g. a scheduler's, called with the cluster's tenant) and
+    :meth:`SwarmOrchestrator.triage` otherwise. Clusters never span tenants.
+    """
+
+    def __init__(
+        self,
+        orchestrator: SwarmOrchestrator,
+        window_seconds: float = 120.0,
+        similarity: float = 0.3,
+        cross_service_similarity: float = 0.6,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        triage: Callable[[IncidentRequest, str], Awaitable[InvestigationResult]] | None = None,
+    ):
+        self.orchestrator = orchestrator
+        self._triage = triage or (lambda incident, _: orchestrator.triage(incident))
+        self.window = timedelta(seconds=window_seconds)
+        self.similarity = similarity
+        self.cross_service_similarity = cross_service_similarity
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._open: list[IncidentCluster] = []
+
+    def clusters(self, tenant: str | None = None) -> list[IncidentCluster]:
+        return [cluster for cluster in self._open if tenant is None or cluster.tenant == tenant]
+
+    def assign(self, incident: IncidentRequest, tenant: str = DEFAULT_TENANT) -> IncidentCluster:
+        observed_at = incident.observed_at or self._clock()
+        if observed_at.tzinfo is None:
+            observed_at = observed_at.replace(tzinfo=timezone.utc)
+        self._open = [
+            cluster for cluster in self._open if observed_at - cluster.last_seen_at <= self.window
+        ]
+        tokens = frozenset(normalize_symptom(incident.symptom).split())
+
+        cluster = self._best_match(incident, tokens, tenant)
+        if cluster is None:
+            cluster = IncidentCluster(
+                cluster_id=f"CL-{next(self._ids):06d}",
+                leader=incident,
+                tokens=tokens,
+                opened_at=observed_at,
+                last_seen_at=observed_at,
+                tenant=tenant,
+            )
+            self._open.append(cluster)
+        elif _SEVERITY_RANK[incident.severity] > _SEVERITY_RANK[cluster.leader.severity]:
+            # A more severe member gets its own swarm run rather than a diluted verdict.
+            cluster.leader = incident
+            cluster.run = None
+
+        cluster.members.append(incident)
+        cluster.services.add(incident.service)
+        cluster.last_seen_at = max(cluster.last_seen_at, observed_at)
+        return cluster
+
+    async def triage(self, incident: IncidentRequest, tenant: str = DEFAULT_TENANT) -> InvestigationResult:
+        cluster = self.assign(incident, tenant)
+        return await self._result_for(cluster, incident)
+
+    async def triage_batch(
+        self, incidents: Iterable[IncidentRequest], tenant: str = DEFAULT_TENANT
+    ) -> CorrelatedTriageResponse:
+        """Cluster the whole batch first so each cluster runs once, led by its most severe member."""
+        assigned = [(self.assign(incident, tenant), incident) for incident in incidents]
+        results = await asyncio.gather(
+            *(self._result_for(cluster, incident) for cluster, incident in assigned)
+        )
+        clusters = {id(cluster): cluster for cluster, _ in assigned}
+        return CorrelatedTriageResponse(
+            clusters=[cluster.summary() for cluster in clusters.values()],
+            results=list(results),
+        )
+
+    async def _result_for(self, cluster: IncidentCluster, incident: IncidentRequest) -> InvestigationResult:
+        if cluster.run is None or (cluster.run.done() and (cluster.run.cancelled() or cluster.run.exception())):
+            # A run that was throttled, shed or failed is retried by the next member.
+            cluster.run = asyncio.create_task(self._triage(cluster.leader, cluster.tenant))
+        shared = await asyncio.shield(cluster.run)
+        return shared.model_copy(
+            update={
+                "incident_id": incident.incident_id,
+                "service": incident.service,
+                "cluster_id": cluster.cluster_id,
+                "generated_at": datetime.now(timezone.utc),
+            }
+        )
+
+    def _best_match(self, incident: IncidentRequest, tokens: frozenset[str], tenant: str) -> IncidentCluster | None:
+        best: IncidentCluster | None = None
+        best_score = 0.0
+        for cluster in self._open:
+            if cluster.tenant != tenant or cluster.leader.environment != incident.environment:
+                continue
+            if incident.service in cluster.services:
+                threshold = self.similarity
+            else:
+                threshold = self.cross_service_similarity
+            score = _jaccard(tokens, cluster.tokens)
+            if score >= threshold and score > best_score:
+                best, best_score = cluster, score
+        return best
+
+
+def _jaccard(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from collections.abc import Callable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import TypeVar
+
+T = TypeVar("T")
+
+WARM_UP_TIMEOUT = 10.0
+
+
+class ExecutionMode(str, Enum):
+    inline = "inline"
+    thread = "thread"
+    process = "process"
+
+
+class AgentExecutor:
+    """Runs CPU-bound agent analysis inline, in a shared thread pool or in a process pool.
+
+    Pools are created on first use unless ``warm_up`` is set, in which case every
+    worker is started up front so the first incident does not pay the spawn cost.
+    Work handed to the process pool must be picklable.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int | None = None,
+        process_workers: int | None = None,
+        warm_up: bool = False,
+    ):
+        self.thread_workers = thread_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        if warm_up:
+            self.warm_up()
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> AgentExecutor:
+        """Size pools from ``HIVEOPS_THREAD_WORKERS`` / ``HIVEOPS_PROCESS_WORKERS``; ``HIVEOPS_WARM_UP`` starts them."""
+        threads = environ.get("HIVEOPS_THREAD_WORKERS")
+        processes = environ.get("HIVEOPS_PROCESS_WORKERS")
+        return cls(
+            thread_workers=int(threads) if threads else None,
+            process_workers=int(processes) if processes else None,
+            warm_up=environ.get("HIVEOPS_WARM_UP", "").lower() in {"1", "true", "yes"},
+        )
+
+    async def run(self, mode: ExecutionMode, fn: Callable[..., T], *args: object) -> T:
+        if mode is ExecutionMode.inline:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(mode), fn, *args)
+
+    def warm_up(self, *modes: ExecutionMode) -> None:
+        """Start every worker of the given pools now instead of on first use.
+
+        A thread pool reuses an idle thread rather than starting a new one, so each
+        thread's task waits on a barrier until all of them are running. Under the
+        ``fork`` start method a process pool launches all its workers on the first
+        submit; other start methods may still launch some of them on demand.
+        """
+        for mode in modes or (ExecutionMode.thread, ExecutionMode.process):
+            pool = self._pool(mode)
+            if mode is ExecutionMode.thread:
+                barrier = threading.Barrier(self.thread_workers)
+                futures = [pool.submit(_rendezvous, barrier) for _ in range(self.thread_workers)]
+            else:
+                futures = [pool.submit(_noop) for _ in range(self.process_workers)]
+            for future in futures:
+                future.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        self._threads = None
+        self._processes = None
+
+    def _pool(self, mode: ExecutionMode) -> Executor:
+        if mode is ExecutionMode.thread:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.thread_workers, thread_name_prefix="hiveops-agent"
+                )
+            return self._threads
+        if mode is ExecutionMode.process:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+            return self._processes
+        raise ValueError(f"{mode.value} execution does not use a pool")
+
+
+def _noop() -> None:
+    return None
+
+
+def _rendezvous(barrier: threading.Barrier) -> None:
+    # Threads still busy with earlier work may never arrive; warming up is best effort.
+    try:
+        barrier.wait(timeout=WARM_UP_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass
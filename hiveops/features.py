@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+from .cache import normalize_symptom
+from .models import IncidentRequest
+
+# Symptom cues agents read, each matched as a substring of the lower-cased symptom.
+SYMPTOM_CUES: dict[str, tuple[str, ...]] = {
+    "latency": ("latency", "timeout", "slow"),
+    "rollout": ("deploy", "release", "rollback"),
+    "exploit": ("attack", "breach", "exploit", "waf"),
+}
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which cues' keywords occur anywhere in a text.
+
+    All keywords of all cues are compiled into one trie with failure links, so a scan
+    is a single pass over the text whose cost does not depend on how many cues or
+    keywords there are. Transitions are resolved into a full ``goto`` table at build
+    time, so scanning never follows failure links.
+    """
+
+    __slots__ = ("_goto", "_output")
+
+    def __init__(self, cues: Mapping[str, Iterable[str]]):
+        goto: list[dict[str, int]] = [{}]
+        output: list[set[tuple[str, str]]] = [set()]
+        for cue, keywords in cues.items():
+            for keyword in keywords:
+                state = 0
+                for char in keyword.lower():
+                    following = goto[state].get(char)
+                    if following is None:
+                        following = goto[state][char] = len(goto)
+                        goto.append({})
+                        output.append(set())
+                    state = following
+                output[state].add((cue, keyword.lower()))
+
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for char, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[following] = goto[fallback].get(char, 0)
+                output[following] |= output[fail[following]]
+        # A failure target is shallower, so in breadth-first order its row is complete before it is merged.
+        for state in order:
+            goto[state] = {**goto[fail[state]], **goto[state]}
+
+        self._goto = goto
+        self._output = [frozenset(matches) for matches in output]
+
+    def scan(self, text: str) -> frozenset[tuple[str, str]]:
+        """``(cue, keyword)`` pairs whose keyword occurs in ``text``."""
+        goto, output = self._goto, self._output
+        found: set[tuple[str, str]] = set()
+        state = 0
+        for char in text:
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return frozenset(found)
+
+
+@dataclass(frozen=True, slots=True)
+class IncidentFeatures:
+    """Symptom features shared by every agent investigating one incident."""
+
+    normalized: str
+    tokens: tuple[str, ...]
+    cues: frozenset[str]
+    keywords: frozenset[str]
+
+    def has(self, cue: str) -> bool:
+        return cue in self.cues
+
+
+DEFAULT_AUTOMATON = KeywordAutomaton(SYMPTOM_CUES)
+
+
+def extract_features(incident: IncidentRequest, automaton: KeywordAutomaton = DEFAULT_AUTOMATON) -> IncidentFeatures:
+    normalized = normalize_symptom(incident.symptom)
+    matches = automaton.scan(incident.symptom.lower())
+    return IncidentFeatures(
+        normalized=normalized,
+        tokens=tuple(normalized.split()),
+        cues=frozenset(cue for cue, _ in matches),
+        keywords=frozenset(keyword for _, keyword in matches),
+    )
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, fields, replace
+from typing import Any
+
+from .connectors import ConnectorError, KubernetesConnector
+
+RESOURCE_PATHS: dict[str, str] = {
+    "pods": "/api/v1/pods",
+    "replicasets": "/apis/apps/v1/replicasets",
+    "events": "/api/v1/events",
+}
+SERVICE_LABELS = ("app.kubernetes.io/name", "app")
+THROTTLING_REASONS = frozenset({"CPUThrottlingHigh", "CPUThrottling"})
+BACKOFF_REASONS = frozenset({"BackOff", "CrashLoopBackOff"})
+
+Key = tuple[str, str]
+Indexer = Callable[[Mapping[str, Any]], Iterable[str]]
+
+
+def service_of(item: Mapping[str, Any]) -> str | None:
+    labels = item.get("metadata", {}).get("labels") or {}
+    return next((labels[name] for name in SERVICE_LABELS if name in labels), None)
+
+
+def object_key(item: Mapping[str, Any]) -> Key:
+    metadata = item.get("metadata", {})
+    return metadata.get("namespace", "default"), metadata["name"]
+
+
+@dataclass(slots=True)
+class ServiceState:
+    """Running totals for one service, adjusted on every watch event rather than recomputed."""
+
+    pods: int = 0
+    unhealthy_pods: int = 0
+    restarts: int = 0
+    oom_kills: int = 0
+    replicasets: int = 0
+    active_replicasets: int = 0
+    warning_events: int = 0
+    backoff_events: int = 0
+    throttling_events: int = 0
+
+    def add(self, other: ServiceState, sign: int = 1) -> None:
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + sign * getattr(other, field.name))
+
+
+class IndexedStore:
+    """Objects of one resource keyed by ``(namespace, name)`` with secondary indexes."""
+
+    def __init__(self, indexers: Mapping[str, Indexer]):
+        self.indexers = dict(indexers)
+        self._objects: dict[Key, Mapping[str, Any]] = {}
+        self._indexes: dict[str, defaultdict[str, set[Key]]] = {name: defaultdict(set) for name in indexers}
+        self._entries: dict[Key, list[tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def get(self, namespace: str, name: str) -> Mapping[str, Any] | None:
+        return self._objects.get((namespace, name))
+
+    def values(self) -> list[Mapping[str, Any]]:
+        return list(self._objects.values())
+
+    def keys(self, index: str, value: str) -> set[Key]:
+        return self._indexes[index].get(value, set())
+
+    def by_index(self, index: str, value: str) -> list[Mapping[str, Any]]:
+        return [self._objects[key] for key in self.keys(index, value)]
+
+    def upsert(self, item: Mapping[str, Any]) -> Mapping[str, Any] | None:
+        key = object_key(item)
+        previous = self._objects.get(key)
+        self._unindex(key)
+        self._objects[key] = item
+        entries = [(index, value) for index, indexer in self.indexers.items() for value in indexer(item)]
+        for index, value in entries:
+            self._indexes[index][value].add(key)
+        self._entries[key] = entries
+        return previous
+
+    def delete(self, item: Mapping[str, Any]) -> Mapping[str, Any] | None:
+        key = object_key(item)
+        self._unindex(key)
+        return self._objects.pop(key, None)
+
+    def clear(self) -> list[Mapping[str, Any]]:
+        removed = list(self._objects.values())
+        self._objects.clear()
+        self._entries.clear()
+        for index in self._indexes.values():
+            index.clear()
+        return removed
+
+    def _unindex(self, key: Key) -> None:
+        # Index values are remembered per key, since recomputing them could differ from insert time.
+        for index, value in self._entries.pop(key, ()):
+            keys = self._indexes[index][value]
+            keys.discard(key)
+            if not keys:
+                del self._indexes[index][value]
+
+
+class KubernetesInformer:
+    """Watch-driven cache of pods, replicasets and events, indexed by namespace, label and service.
+
+    Each resource is listed once, then kept current from a watch stream resumed at
+    the last seen resource version; an expired version triggers a fresh list.
+    Per-service totals are maintained incrementally, so :meth:`service` is a dict
+    lookup no matter how many pods the cluster runs.
+    """
+
+    def __init__(
+        self,
+        connector: KubernetesConnector,
+        resources: Iterable[str] = ("pods", "replicasets", "events"),
+        watch_timeout: float = 300.0,
+        retry_seconds: float = 1.0,
+    ):
+        self.connector = connector
+        self.resources = tuple(resources)
+        self.watch_timeout = watch_timeout
+        self.retry_seconds = retry_seconds
+        self.stores = {resource: IndexedStore(self._indexers(resource)) for resource in self.resources}
+        self.resource_versions: dict[str, str] = {}
+        self.relists = 0
+        self._services: dict[str, ServiceState] = defaultdict(ServiceState)
+        self._attributed: dict[tuple[str, Key], str] = {}
+        self._synced = {resource: asyncio.Event() for resource in self.resources}
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def synced(self) -> bool:
+        return all(event.is_set() for event in self._synced.values())
+
+    async def start(self) -> None:
+        # Pods are listed before events so events can be attributed to their pod's service.
+        for resource in self.resources:
+            self._tasks.append(asyncio.create_task(self._run(resource)))
+            await self._synced[resource].wait()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def service(self, name: str) -> ServiceState:
+        state = self._services.get(name)
+        return ServiceState() if state is None else replace(state)
+
+    def pods(
+        self, service: str | None = None, namespace: str | None = None, label: str | None = None
+    ) -> list[Mapping[str, Any]]:
+        """Cached pods matching every given index value (``label`` is ``key=value``)."""
+        store = self.stores["pods"]
+        lookups = [("service", service), ("namespace", namespace), ("label", label)]
+        key_sets = [store.keys(index, value) for index, value in lookups if value is not None]
+        if not key_sets:
+            return store.values()
+        return [store.get(*key) for key in set.intersection(*key_sets)]
+
+    def apply(self, resource: str, event_type: str, item: Mapping[str, Any]) -> None:
+        store = self.stores[resource]
+        if event_type == "DELETED":
+            self._account(resource, store.delete(item), -1)
+        else:
+            self._account(resource, store.upsert(item), -1)
+            self._account(resource, item, 1)
+        version = item.get("metadata", {}).get("resourceVersion")
+        if version is not None:
+            self.resource_versions[resource] = version
+
+    async def _run(self, resource: str) -> None:
+        path = RESOURCE_PATHS[resource]
+        while True:
+            try:
+                if resource not in self.resource_versions:
+                    await self._relist(resource, path)
+                async for event in self.connector.watch(
+                    path, self.resource_versions[resource], self.watch_timeout
+                ):
+                    if event["type"] == "ERROR":
+                        if event["object"].get("code") == 410:
+                            self.resource_versions.pop(resource, None)
+                            break
+                        raise ConnectorError(f"kubernetes watch {path} failed: {event['object']}")
+                    if event["type"] != "BOOKMARK":
+                        self.apply(resource, event["type"], event["object"])
+                    else:
+                        self.resource_versions[resource] = event["object"]["metadata"]["resourceVersion"]
+            except ConnectorError:
+                await asyncio.sleep(self.retry_seconds)
+
+    async def _relist(self, resource: str, path: str) -> None:
+        listed = await self.connector.list_resource(path)
+        store = self.stores[resource]
+        for item in store.clear():
+            self._account(resource, item, -1)
+        for item in listed["items"]:
+            store.upsert(item)
+            self._account(resource, item, 1)
+        self.resource_versions[resource] = listed["metadata"]["resourceVersion"]
+        self.relists += 1
+        self._synced[resource].set()
+
+    def _account(self, resource: str, item: Mapping[str, Any] | None, sign: int) -> None:
+        if item is None:
+            return
+        key = (resource, object_key(item))
+        if sign > 0:
+            service = self._service_for(resource, item)
+            if service is not None:
+                self._attributed[key] = service
+        else:
+            service = self._attributed.pop(key, None)
+        if service is not None:
+            self._services[service].add(_contribution(resource, item), sign)
+
+    def _service_for(self, resource: str, item: Mapping[str, Any]) -> str | None:
+        if resource != "events":
+            return service_of(item)
+        involved = item.get("involvedObject", {})
+        owner_resource = {"Pod": "pods", "ReplicaSet": "replicasets"}.get(involved.get("kind", ""))
+        if owner_resource not in self.stores:
+            return None
+        namespace = involved.get("namespace") or item.get("metadata", {}).get("namespace", "default")
+        owner = self.stores[owner_resource].get(namespace, involved.get("name", ""))
+        return service_of(owner) if owner is not None else None
+
+    def _indexers(self, resource: str) -> dict[str, Indexer]:
+        return {
+            "namespace": lambda item: [object_key(item)[0]],
+            "label": lambda item: [
+                f"{name}={value}" for name, value in (item.get("metadata", {}).get("labels") or {}).items()
+            ],
+            "service": lambda item: [service] if (service := self._service_for(resource, item)) else [],
+        }
+
+
+def _contribution(resource: str, item: Mapping[str, Any]) -> ServiceState:
+    status = item.get("status", {})
+    if resource == "pods":
+        containers = status.get("containerStatuses", [])
+        return ServiceState(
+            pods=1,
+            unhealthy_pods=int(status.get("phase") != "Running"),
+            restarts=sum(container.get("restartCount", 0) for container in containers),
+            oom_kills=sum(
+                1
+                for container in containers
+                if container.get("lastState", {}).get("terminated", {}).get("reason") == "OOMKilled"
+            ),
+        )
+    if resource == "replicasets":
+        return ServiceState(replicasets=1, active_replicasets=int(status.get("replicas", 0) > 0))
+    reason = item.get("reason", "")
+    count = item.get("count", 1)
+    return ServiceState(
+        warning_events=count if item.get("type") == "Warning" else 0,
+        backoff_events=count if reason in BACKOFF_REASONS else 0,
+        throttling_events=count if reason in THROTTLING_REASONS else 0,
+    )
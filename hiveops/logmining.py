@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import gzip
+import re
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .signatures import line_time
+
+WILDCARD = "<*>"
+SAMPLE_CHARS = 200
+ERROR_TOKENS = ("error", "exception", "fatal", "panic", "failed", "refused", "timeout", "killed")
+
+_VARIABLES = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"
+    r"|\b0x[0-9a-f]+\b"
+    r"|\b[0-9a-f]{12,}\b"
+    r"|\b\d+(?:[.:]\d+)*(?:ms|s|kb|mb|gb|%)?\b",
+    re.IGNORECASE,
+)
+_LEAF = ""
+
+
+@dataclass(slots=True)
+class _Cluster:
+    tokens: list[str]
+    path: list[tuple[dict[str, Any], str]]
+    sample: str
+    baseline: int = 0
+    window: int = 0
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+
+@dataclass(slots=True)
+class TemplateStat:
+    template: str
+    window_count: int
+    baseline_count: int
+    sample: str
+
+    @property
+    def is_error(self) -> bool:
+        lowered = self.template.lower()
+        return any(token in lowered for token in ERROR_TOKENS)
+
+
+@dataclass(slots=True)
+class LogReport:
+    lines: int = 0
+    window_lines: int = 0
+    clusters: int = 0
+    evicted: int = 0
+    novel: list[TemplateStat] = field(default_factory=list)
+    spiking: list[TemplateStat] = field(default_factory=list)
+
+
+class TemplateMiner:
+    """Online Drain-style log template miner with a fixed cluster budget.
+
+    Lines are masked (numbers, IPs, hashes, UUIDs) and routed through a shallow parse
+    tree keyed by token count and the first ``depth`` tokens to a short list of
+    candidate templates. A line joins the most similar template if at least
+    ``similarity`` of its positions agree, widening differing positions to ``<*>``;
+    otherwise it starts a new template. Past ``max_clusters`` the least recently
+    matched template is evicted, so memory stays bounded however long the input.
+    """
+
+    def __init__(
+        self,
+        depth: int = 3,
+        similarity: float = 0.5,
+        max_children: int = 64,
+        max_clusters: int = 2000,
+    ):
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.evicted = 0
+        self._root: dict[str, Any] = {}
+        self._clusters: OrderedDict[int, _Cluster] = OrderedDict()
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def add(self, line: str, in_window: bool = False) -> int:
+        """Assign ``line`` to a template and return the template's id."""
+        tokens = _VARIABLES.sub(WILDCARD, line).split()
+        leaf, path = self._leaf(tokens)
+        best, best_score = None, -1.0
+        for cluster_id in leaf:
+            score = _similarity(self._clusters[cluster_id].tokens, tokens)
+            if score > best_score:
+                best, best_score = cluster_id, score
+
+        if best is not None and best_score >= self.similarity:
+            cluster = self._clusters[best]
+            cluster.tokens = [
+                held if held == token else WILDCARD for held, token in zip(cluster.tokens, tokens)
+            ]
+            self._clusters.move_to_end(best)
+        else:
+            best = self._next_id
+            self._next_id += 1
+            cluster = self._clusters[best] = _Cluster(tokens, path, line[:SAMPLE_CHARS])
+            leaf.append(best)
+            if len(self._clusters) > self.max_clusters:
+                self._evict()
+
+        if in_window:
+            cluster.window += 1
+        else:
+            cluster.baseline += 1
+        return best
+
+    def mine(
+        self,
+        lines: Iterable[str],
+        start: datetime | None = None,
+        end: datetime | None = None,
+        spike_ratio: float = 3.0,
+        min_count: int = 3,
+        limit: int = 5,
+    ) -> LogReport:
+        """Mine ``lines`` and report templates that are new or spiking inside ``[start, end]``.
+
+        Lines before ``start`` form the baseline; lines without a timestamp inherit the
+        previous line's. A template is novel if it never matched a baseline line, and
+        spiking if its window rate is ``spike_ratio`` times its baseline rate.
+        """
+        report = LogReport()
+        first_seen: datetime | None = None
+        current: datetime | None = None
+        for line in lines:
+            current = line_time(line.encode()) or current
+            if current is not None and end is not None and current > end:
+                continue
+            first_seen = first_seen or current
+            in_window = start is None or (current is not None and current >= start)
+            report.lines += 1
+            report.window_lines += in_window
+            self.add(line.rstrip("\n"), in_window)
+
+        report.clusters = len(self._clusters)
+        report.evicted = self.evicted
+        baseline_lines = report.lines - report.window_lines
+        if start is None or not baseline_lines:
+            return report
+
+        baseline_seconds = max((start - first_seen).total_seconds(), 1.0) if first_seen else 1.0
+        window_seconds = max(((end or current or start) - start).total_seconds(), 1.0)
+        novel, spiking = [], []
+        for cluster in self._clusters.values():
+            if not cluster.window:
+                continue
+            stat = TemplateStat(cluster.template, cluster.window, cluster.baseline, cluster.sample)
+            expected = cluster.baseline * window_seconds / baseline_seconds
+            if not cluster.baseline:
+                novel.append(stat)
+            elif cluster.window >= min_count and cluster.window >= spike_ratio * max(expected, 1.0):
+                spiking.append(stat)
+        report.novel = sorted(novel, key=_rank)[:limit]
+        report.spiking = sorted(spiking, key=_rank)[:limit]
+        return report
+
+    def templates(self) -> list[tuple[str, int]]:
+        return [(cluster.template, cluster.baseline + cluster.window) for cluster in self._clusters.values()]
+
+    def _leaf(self, tokens: list[str]) -> tuple[list[int], list[tuple[dict[str, Any], str]]]:
+        node = self._root
+        key = str(len(tokens))
+        path = []
+        for token in [key, *tokens[: self.depth]]:
+            if token != key and any(character.isdigit() for character in token):
+                token = WILDCARD
+            if token not in node and len(node) >= self.max_children:
+                token = WILDCARD
+            path.append((node, token))
+            node = node.setdefault(token, {})
+        return node.setdefault(_LEAF, []), path
+
+    def _evict(self) -> None:
+        cluster_id, cluster = self._clusters.popitem(last=False)
+        self.evicted += 1
+        parent, key = cluster.path[-1]
+        leaf = parent[key][_LEAF]
+        leaf.remove(cluster_id)
+        if leaf:
+            return
+        # Prune the now-empty branch so evicted shapes do not keep tree nodes alive.
+        del parent[key][_LEAF]
+        for node, key in reversed(cluster.path):
+            if node[key]:
+                break
+            del node[key]
+
+
+def _rank(stat: TemplateStat) -> tuple[bool, int]:
+    return not stat.is_error, -stat.window_count
+
+
+def _similarity(template: list[str], tokens: list[str]) -> float:
+    if not tokens:
+        return 1.0
+    return sum(held == token or held == WILDCARD for held, token in zip(template, tokens)) / len(tokens)
+
+
+def read_lines(paths: Iterable[Path]) -> Iterator[str]:
+    """Stream lines from plain or ``.gz`` log files without loading them into memory."""
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as stream:
+            yield from stream
+
+
+def pipeline_job_lines(database: Path, project: str | None = None) -> Iterator[str]:
+    """Stream ``pipeline_jobs.log_output`` lines from the backend database, oldest job first."""
+    connection = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        query = (
+            "SELECT pipeline_jobs.log_output FROM pipeline_jobs "
+            "JOIN pipelines ON pipelines.id = pipeline_jobs.pipeline_id "
+            "JOIN projects ON projects.id = pipelines.project_id "
+            "WHERE ? IS NULL OR projects.name = ? ORDER BY pipeline_jobs.id"
+        )
+        for (log_output,) in connection.execute(query, (project, project)):
+            yield from (log_output or "").splitlines()
+    finally:
+        connection.close()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+from .models import AgentDomain, Signal
+
 
 @dataclass(slots=True)
 class AuditDecision:
@@ -13,20 +16,50 @@ class AuditDecision:
 class PoetiqMetaLayer:
     """Phase 2: recursive self-audit controller (deterministic MVP)."""
 
-    def __init__(self, confidence_threshold: float = 0.82, max_iterations: int = 4):
+    def __init__(
+        self,
+        confidence_threshold: float = 0.82,
+        max_iterations: int = 4,
+        min_evidence: int = 3,
+        min_signal_evidence: int = 2,
+    ):
         self.confidence_threshold = confidence_threshold
         self.max_iterations = max_iterations
+        self.min_evidence = min_evidence
+        self.min_signal_evidence = min_signal_evidence
+
+    def weak_domains(self, signals: Sequence[Signal]) -> list[AgentDomain]:
+        """Domains whose signal is below the confidence gate or thin on evidence."""
+        return [
+            signal.domain
+            for signal in signals
+            if signal.confidence < self.confidence_threshold
+            or len(signal.evidence) < self.min_signal_evidence
+        ]
 
-    def audit(self, confidence: float, status: str, evidence_count: int) -> AuditDecision:
+    def audit(
+        self,
+        confidence: float,
+        status: str,
+        evidence_count: int,
+        timed_out_domains: Sequence[AgentDomain] = (),
+        failed_domains: Sequence[AgentDomain] = (),
+    ) -> AuditDecision:
         recommendations: list[str] = []
         sufficient = confidence >= self.confidence_threshold and status != "needs_human"
 
         if confidence < self.confidence_threshold:
             recommendations.append("Collect more telemetry before autonomous execution")
-        if evidence_count < 3:
+        if evidence_count < self.min_evidence:
             recommendations.append("Expand evidence bundle from additional data sources")
         if status == "needs_human":
             recommendations.append("Escalate to human incident commander with timeline summary")
+        if timed_out_domains:
+            domains = ", ".join(domain.value for domain in timed_out_domains)
+            recommendations.append(f"Re-run timed-out domains once their backends recover: {domains}")
+        if failed_domains:
+            domains = ", ".join(domain.value for domain in failed_domains)
+            recommendations.append(f"Fix failing agents and re-run their domains: {domains}")
 
         if not recommendations:
             recommendations.append("Quality gates passed for current iteration")
@@ -13,6 +13,8 @@ class AgentDomain(str, Enum):
     kubernetes = "kubernetes"
     cost = "cost"
     security = "security"
+    logs = "logs"
+    traces = "traces"
 
 
 class Severity(str, Enum):
@@ -22,6 +24,12 @@ class Severity(str, Enum):
     critical = "critical"
 
 
+class TenantOperation(str, Enum):
+    triage = "triage"
+    iac = "iac"
+    evolve = "evolve"
+
+
 class Signal(BaseModel):
     domain: AgentDomain
     finding: str
@@ -35,6 +43,18 @@ class IncidentRequest(BaseModel):
     symptom: str
     severity: Severity = Severity.medium
     environment: Literal["dev", "staging", "prod"] = "prod"
+    observed_at: datetime | None = None
+
+
+class SimilarIncident(BaseModel):
+    ref: str
+    kind: Literal["incident", "runbook"]
+    service: str
+    title: str
+    suggested_action: str
+    status: str
+    score: float
+    similarity: float = Field(ge=0.0, le=1.0)
 
 
 class InvestigationResult(BaseModel):
@@ -48,9 +68,124 @@ class InvestigationResult(BaseModel):
     estimated_minutes_to_mitigate: int = Field(ge=1)
     audit_recommendations: list[str] = Field(default_factory=list)
     signals: list[Signal]
+    timed_out_domains: list[AgentDomain] = Field(default_factory=list)
+    failed_domains: list[AgentDomain] = Field(default_factory=list)
+    skipped_domains: list[AgentDomain] = Field(default_factory=list)
+    related_services: list[str] = Field(default_factory=list)
+    blast_radius: list[str] = Field(default_factory=list)
+    similar_incidents: list[SimilarIncident] = Field(default_factory=list)
+    audit_iterations: int = Field(default=1, ge=1)
+    cluster_id: str | None = None
     generated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class TriageEvent(BaseModel):
+    event: Literal["signal", "provisional", "result"]
+    signal: Signal | None = None
+    result: InvestigationResult | None = None
+    pending: list[AgentDomain] = Field(default_factory=list)
+
+
+class TriageBatchError(BaseModel):
+    line: int
+    error: str
+
+
+class IncidentClusterSummary(BaseModel):
+    cluster_id: str
+    leader_incident_id: str
+    environment: str
+    services: list[str]
+    member_incident_ids: list[str]
+    opened_at: datetime
+    last_seen_at: datetime
+
+
+class CorrelatedTriageResponse(BaseModel):
+    clusters: list[IncidentClusterSummary]
+    results: list[InvestigationResult]
+
+
+class SchedulerStatus(BaseModel):
+    concurrency: int
+    running: int
+    queued: dict[Severity, int]
+    mean_wait_seconds: dict[Severity, float]
+    max_wait_seconds: dict[Severity, float]
+    submitted: int
+    completed: int
+    shed: dict[Severity, int]
+    preempted: int
+    queued_by_tenant: dict[str, int] = Field(default_factory=dict)
+    running_by_tenant: dict[str, int] = Field(default_factory=dict)
+
+
+class TenantQuota(BaseModel):
+    weight: float = Field(default=1.0, gt=0.0)
+    concurrency: dict[TenantOperation, int] = Field(
+        default_factory=lambda: {TenantOperation.triage: 16, TenantOperation.iac: 2, TenantOperation.evolve: 2}
+    )
+    rate_per_minute: dict[TenantOperation, float] = Field(
+        default_factory=lambda: {TenantOperation.triage: 600.0, TenantOperation.iac: 60.0, TenantOperation.evolve: 60.0}
+    )
+
+
+class TenantQuotaConfig(BaseModel):
+    default: TenantQuota = Field(default_factory=TenantQuota)
+    tenants: dict[str, TenantQuota] = Field(default_factory=dict)
+
+
+class OperationUsage(BaseModel):
+    requests: int = 0
+    throttled: int = 0
+    rejected: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+
+class TenantUsage(BaseModel):
+    tenant: str
+    weight: float
+    operations: dict[TenantOperation, OperationUsage]
+
+
+class ServiceDependencies(BaseModel):
+    depends_on: list[str] = Field(default_factory=list)
+
+
+class TopologyRequest(BaseModel):
+    services: dict[str, ServiceDependencies]
+
+
+class ServiceTopologyResponse(BaseModel):
+    service: str
+    direct_dependencies: list[str]
+    dependencies: list[str]
+    blast_radius: list[str]
+
+
+class SpendRecord(BaseModel):
+    service: str
+    sku: str
+    timestamp: datetime
+    amount: float = Field(ge=0.0)
+
+
+class SpendIngestResponse(BaseModel):
+    accepted: int
+    tracked_keys: int
+
+
+class RunbookRequest(BaseModel):
+    ref: str = Field(min_length=1)
+    title: str
+    text: str
+    service: str = ""
+    action: str = ""
+
+
 class IacRequest(BaseModel):
     intent: str = Field(min_length=10)
     provider: Literal["aws", "gcp", "azure"] = "aws"
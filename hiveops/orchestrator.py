@@ -1,10 +1,87 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import aclosing
+from dataclasses import dataclass, field
 
-from .agents import DEFAULT_SWARM, MicroAgent
+from .agents import CONFIDENCE_RANGES, DEFAULT_SWARM, DEFAULT_WINDOW_MINUTES, EvidenceSources, MicroAgent
+from .cache import TriageCache
+from .executors import AgentExecutor
+from .features import IncidentFeatures, extract_features
 from .meta import PoetiqMetaLayer
-from .models import AgentDomain, IncidentRequest, InvestigationResult, Severity, Signal
+from .models import AgentDomain, IncidentRequest, InvestigationResult, Severity, Signal, TriageEvent
+from .retrieval import IncidentHistory
+from .telemetry import SwarmMetrics
+from .topology import ServiceGraph
+
+
+@dataclass(frozen=True, slots=True)
+class TriageDeadline:
+    """Wall-clock budget for one incident and the timeout applied to each agent."""
+
+    total_seconds: float
+    agent_seconds: float
+
+
+DEFAULT_DEADLINES: dict[Severity, TriageDeadline] = {
+    Severity.low: TriageDeadline(total_seconds=30.0, agent_seconds=20.0),
+    Severity.medium: TriageDeadline(total_seconds=20.0, agent_seconds=12.0),
+    Severity.high: TriageDeadline(total_seconds=10.0, agent_seconds=6.0),
+    Severity.critical: TriageDeadline(total_seconds=6.0, agent_seconds=4.0),
+}
+
+
+MAX_QUORUM_PROBES = 6
+
+
+@dataclass(frozen=True, slots=True)
+class QuorumPolicy:
+    """Speculative early exit for the listed severities.
+
+    Once at least ``min_signals`` have arrived, the provisional audit passes and no
+    pending domain could override the verdict, the remaining agents are cancelled.
+    A high-severity verdict does not depend on the swarm's average confidence, so
+    once the signals in hand pass the audit every domain that cannot take over the
+    hypothesis (all but security and traces) can be cut. Low and medium incidents
+    resolve on the average, so there only stragglers whose lowest confidence could
+    not drag it under the threshold are cut, typically the last one of a large,
+    confident swarm. Critical incidents always wait for the whole swarm.
+    """
+
+    severities: frozenset[Severity] = frozenset({Severity.low, Severity.medium, Severity.high})
+    min_signals: int = 2
+
+
+@dataclass(slots=True)
+class _FanIn:
+    """Signals collected so far for one incident, keyed by swarm position."""
+
+    agents: tuple[MicroAgent, ...]
+    features: IncidentFeatures
+    arrived: dict[int, Signal] = field(default_factory=dict)
+    timed_out: set[int] = field(default_factory=set)
+    failed: set[int] = field(default_factory=set)
+    pending: set[int] = field(default_factory=set)
+    skipped: set[int] = field(default_factory=set)
+    iterations: int = 1
+    related: list[str] = field(default_factory=list)
+
+    def signals(self) -> list[Signal]:
+        return [self.arrived[index] for index in sorted(self.arrived)]
+
+    def domains(self, indexes: set[int]) -> list[AgentDomain]:
+        return [self.agents[index].domain for index in sorted(indexes)]
+
+    def merge(self, index: int, signal: Signal) -> bool:
+        """Keep the stronger of the held and re-investigated signal; return True if it improved."""
+        held = self.arrived.get(index)
+        if held is not None and _strength(signal) <= _strength(held):
+            return False
+        self.arrived[index] = signal
+        return True
 
 
 class SwarmOrchestrator:
@@ -12,15 +89,341 @@ class SwarmOrchestrator:
         self,
         agents: tuple[MicroAgent, ...] = DEFAULT_SWARM,
         meta_layer: PoetiqMetaLayer | None = None,
+        deadlines: Mapping[Severity, TriageDeadline] | None = None,
+        cache: TriageCache | None = None,
+        quorum: QuorumPolicy | None = None,
+        executor: AgentExecutor | None = None,
+        sources: EvidenceSources | None = None,
+        topology: ServiceGraph | None = None,
+        history: IncidentHistory | None = None,
+        metrics: SwarmMetrics | None = None,
     ):
         self.agents = agents
         self.meta_layer = meta_layer or PoetiqMetaLayer()
+        self.deadlines = {**DEFAULT_DEADLINES, **(deadlines or {})}
+        self.cache = cache
+        self.quorum = quorum
+        self.executor = executor or AgentExecutor()
+        self.sources = sources or EvidenceSources()
+        self.topology = topology
+        self.history = history
+        self.metrics = metrics or SwarmMetrics()
 
     async def triage(self, incident: IncidentRequest) -> InvestigationResult:
-        signals = await asyncio.gather(*(agent.investigate(incident) for agent in self.agents))
-        return self._synthesize(incident, list(signals))
+        if self.cache is not None and (cached := self.cache.get(incident)) is not None:
+            return cached
+
+        started = time.perf_counter()
+        fan_in = _FanIn(self.agents, extract_features(incident))
+        async with aclosing(self._investigate(incident, fan_in)) as batches:
+            async for _ in batches:
+                if self._quorum_reached(incident, fan_in):
+                    break
+        return await self._finish(incident, fan_in, started)
+
+    async def triage_stream(self, incident: IncidentRequest) -> AsyncIterator[TriageEvent]:
+        """Yield each signal as its agent finishes, followed by a provisional synthesis.
+
+        The final ``result`` event is synthesized from signals in swarm order so it
+        matches what :meth:`triage` returns for the same incident.
+        """
+        if self.cache is not None and (cached := self.cache.get(incident)) is not None:
+            yield TriageEvent(event="result", result=cached)
+            return
+
+        started = time.perf_counter()
+        fan_in = _FanIn(self.agents, extract_features(incident))
+        async with aclosing(self._investigate(incident, fan_in)) as batches:
+            async for batch in batches:
+                for signal in batch:
+                    yield TriageEvent(event="signal", signal=signal)
+                if self._quorum_reached(incident, fan_in):
+                    break
+                yield TriageEvent(
+                    event="provisional",
+                    result=self._synthesize_fan_in(incident, fan_in),
+                    pending=fan_in.domains(fan_in.pending),
+                )
+
+        yield TriageEvent(event="result", result=await self._finish(incident, fan_in, started))
+
+    async def triage_many(
+        self,
+        incidents: AsyncIterable[IncidentRequest],
+        concurrency: int = 16,
+        triage: Callable[[IncidentRequest], Awaitable[InvestigationResult]] | None = None,
+        on_error: Callable[[IncidentRequest, Exception], None] | None = None,
+    ) -> AsyncIterator[InvestigationResult]:
+        """Triage a stream of incidents, yielding results in completion order.
+
+        At most ``concurrency`` incidents are in flight and the source is only read
+        when a slot is free, so memory stays flat regardless of batch size. Each
+        incident goes through ``triage`` (default :meth:`triage`), which lets a caller
+        route the batch through a shared scheduler. With ``on_error``, an incident
+        whose triage raises is reported there and skipped instead of ending the batch.
+        """
+        triage = triage or self.triage
+        source = aiter(incidents)
+        reader: asyncio.Future[IncidentRequest] | None = None
+        in_flight: dict[asyncio.Task[InvestigationResult], IncidentRequest] = {}
+        exhausted = False
+        try:
+            while True:
+                if reader is None and not exhausted and len(in_flight) < concurrency:
+                    reader = asyncio.ensure_future(anext(source))
+                waiting = (in_flight.keys() | {reader}) if reader is not None else set(in_flight)
+                if not waiting:
+                    return
+
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if reader in done:
+                    try:
+                        incident = reader.result()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        in_flight[asyncio.create_task(triage(incident))] = incident
+                    reader = None
+                for task in done & in_flight.keys():
+                    incident = in_flight.pop(task)
+                    if on_error is not None and not task.cancelled() and task.exception() is not None:
+                        on_error(incident, task.exception())
+                        continue
+                    yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if reader is not None:
+                reader.cancel()
+
+    async def _finish(self, incident: IncidentRequest, fan_in: _FanIn, started: float) -> InvestigationResult:
+        result = await self._recall(incident, self._synthesize_fan_in(incident, fan_in))
+        self._remember(incident, result)
+        self.metrics.triage_seconds.observe(time.perf_counter() - started, incident.severity.value, result.status)
+        return result
 
-    def _synthesize(self, incident: IncidentRequest, signals: list[Signal]) -> InvestigationResult:
+    async def _recall(self, incident: IncidentRequest, result: InvestigationResult) -> InvestigationResult:
+        """Attach similar past incidents from ``history``, then record this one for next time.
+
+        Both run in a worker thread: the history is SQLite-backed and its lookups and
+        inserts would otherwise stall every other triage on the event loop.
+        """
+        if self.history is None:
+            return result
+        similar = await asyncio.to_thread(self.history.similar, incident.symptom, service=incident.service)
+        result = result.model_copy(update={"similar_incidents": similar})
+        if not result.timed_out_domains:
+            await asyncio.to_thread(self.history.add_result, incident, result)
+        return result
+
+    def _remember(self, incident: IncidentRequest, result: InvestigationResult) -> None:
+        # Partial results are not cached so a transient backend stall does not stick for a TTL.
+        if self.cache is not None and not result.timed_out_domains:
+            self.cache.put(incident, result)
+
+    def _quorum_reached(self, incident: IncidentRequest, fan_in: _FanIn) -> bool:
+        """Decide whether the pending agents can be cancelled, marking them skipped if so.
+
+        The synthesis thresholds are monotone in each signal's confidence, so trying every
+        pending domain at both ends of its ``CONFIDENCE_RANGES`` entry (0.0 and 1.0 for
+        domains without one) bounds anything they could still report. Only if no such
+        combination alters the status or hypothesis is the swarm cut short; with more
+        than ``MAX_QUORUM_PROBES`` domains pending it keeps running.
+        """
+        policy = self.quorum
+        if (
+            policy is None
+            or not fan_in.pending
+            or incident.severity not in policy.severities
+            or len(fan_in.arrived) < policy.min_signals
+        ):
+            return False
+
+        signals = fan_in.signals()
+        provisional = self._synthesize(incident, signals)
+        evidence_count = sum(len(signal.evidence) for signal in signals)
+        if (
+            provisional.status == "needs_human"
+            or provisional.confidence < self.meta_layer.confidence_threshold
+            or evidence_count < self.meta_layer.min_evidence
+        ):
+            return False
+
+        pending = fan_in.domains(fan_in.pending)
+        if len(pending) > MAX_QUORUM_PROBES:
+            return False
+        bounds = [CONFIDENCE_RANGES.get(domain, (0.0, 1.0)) for domain in pending]
+        for confidences in itertools.product(*bounds):
+            probes = [
+                Signal(domain=domain, finding="quorum probe", confidence=confidence)
+                for domain, confidence in zip(pending, confidences)
+            ]
+            probe = self._synthesize(incident, [*signals, *probes])
+            if (probe.status, probe.hypothesis) != (provisional.status, provisional.hypothesis):
+                return False
+
+        fan_in.skipped = set(fan_in.pending)
+        return True
+
+    def _synthesize_fan_in(self, incident: IncidentRequest, fan_in: _FanIn) -> InvestigationResult:
+        started = time.perf_counter()
+        result = self._synthesize(
+            incident,
+            fan_in.signals(),
+            timed_out=fan_in.domains(fan_in.timed_out),
+            failed=fan_in.domains(fan_in.failed),
+            skipped=fan_in.domains(fan_in.skipped),
+            iterations=fan_in.iterations,
+            related=fan_in.related,
+        )
+        self.metrics.synthesize_seconds.observe(time.perf_counter() - started)
+        return result
+
+    async def _investigate(self, incident: IncidentRequest, fan_in: _FanIn) -> AsyncIterator[list[Signal]]:
+        """POETIQ loop: fan out the whole swarm, then re-run only the weak domains.
+
+        While the audit is insufficient and ``max_iterations`` is not exhausted, domains
+        the meta layer flags as weak are re-investigated with a doubled evidence window
+        and merged into the signals already held. With a ``topology``, re-investigations
+        also cover the service's probable root-cause neighbours. The loop stops early
+        once an iteration improves nothing. All iterations share the incident's
+        severity deadline.
+        """
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + self.deadlines[incident.severity].total_seconds
+        window_minutes = DEFAULT_WINDOW_MINUTES
+        indexes = set(range(len(self.agents)))
+
+        while True:
+            improved = False
+            async with aclosing(
+                self._fan_in(incident, fan_in, indexes, window_minutes, expires_at)
+            ) as batches:
+                async for batch in batches:
+                    improved = improved or bool(batch)
+                    yield batch
+
+            if not improved or fan_in.iterations >= self.meta_layer.max_iterations:
+                return
+            signals = fan_in.signals()
+            provisional = self._synthesize(incident, signals)
+            audit = self.meta_layer.audit(
+                confidence=provisional.confidence,
+                status=provisional.status,
+                evidence_count=sum(len(signal.evidence) for signal in signals),
+            )
+            self.metrics.audits.inc("sufficient" if audit.sufficient else "insufficient")
+            weak = set(self.meta_layer.weak_domains(signals))
+            indexes = {index for index, signal in fan_in.arrived.items() if signal.domain in weak}
+            if audit.sufficient or not indexes or loop.time() >= expires_at:
+                return
+            fan_in.iterations += 1
+            window_minutes *= 2
+            if self.topology is not None:
+                fan_in.related = self.topology.root_cause_candidates(incident.service)
+
+    async def _fan_in(
+        self,
+        incident: IncidentRequest,
+        fan_in: _FanIn,
+        indexes: set[int],
+        window_minutes: int,
+        expires_at: float,
+    ) -> AsyncIterator[list[Signal]]:
+        """Run the given agents under the incident deadline, yielding each batch of new or improved signals.
+
+        Agents exceeding their own timeout, or still running when the incident budget
+        is spent, are cancelled; those with no signal in hand are recorded in
+        ``fan_in.timed_out``. An agent that raises is recorded in ``fan_in.failed``
+        the same way, without disturbing the rest of the swarm.
+        """
+        agent_seconds = self.deadlines[incident.severity].agent_seconds
+        loop = asyncio.get_running_loop()
+        tasks = {
+            asyncio.create_task(
+                self._timed(
+                    self.agents[index].domain,
+                    asyncio.wait_for(
+                        self.agents[index].investigate(
+                            incident,
+                            window_minutes=window_minutes,
+                            sources=self.sources,
+                            executor=self.executor,
+                            related=tuple(fan_in.related),
+                            features=fan_in.features,
+                        ),
+                        timeout=agent_seconds,
+                    ),
+                )
+            ): index
+            for index in sorted(indexes)
+        }
+        fan_in.pending = set(tasks.values())
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=max(expires_at - loop.time(), 0.0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    fan_in.timed_out.update(fan_in.pending - fan_in.arrived.keys())
+                    fan_in.pending.clear()
+                    return
+
+                batch: list[Signal] = []
+                for task in done:
+                    index = tasks.pop(task)
+                    fan_in.pending.discard(index)
+                    try:
+                        signal = task.result()
+                    except asyncio.TimeoutError:
+                        if index not in fan_in.arrived:
+                            fan_in.timed_out.add(index)
+                        continue
+                    except Exception:
+                        if index not in fan_in.arrived:
+                            fan_in.failed.add(index)
+                        continue
+                    if fan_in.merge(index, signal):
+                        batch.append(signal)
+                yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _timed(self, domain: AgentDomain, investigation: Awaitable[Signal]) -> Signal:
+        """Await one agent's investigation, recording its latency under the way it ended."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            signal = await investigation
+            outcome = "ok"
+            return signal
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self.metrics.agent_seconds.observe(time.perf_counter() - started, domain.value, outcome)
+
+    def _synthesize(
+        self,
+        incident: IncidentRequest,
+        signals: list[Signal],
+        timed_out: list[AgentDomain] | None = None,
+        skipped: list[AgentDomain] | None = None,
+        iterations: int = 1,
+        related: list[str] | None = None,
+        failed: list[AgentDomain] | None = None,
+    ) -> InvestigationResult:
+        timed_out = timed_out or []
+        failed = failed or []
+        skipped = skipped or []
+        related = related or []
+        blast_radius = self.topology.blast_radius(incident.service) if self.topology is not None else []
         if not signals:
             return InvestigationResult(
                 incident_id=incident.incident_id,
@@ -33,6 +436,12 @@ class SwarmOrchestrator:
                 estimated_minutes_to_mitigate=45,
                 audit_recommendations=["Increase connector coverage before autonomous triage"],
                 signals=[],
+                timed_out_domains=timed_out,
+                failed_domains=failed,
+                skipped_domains=skipped,
+                related_services=related,
+                blast_radius=blast_radius,
+                audit_iterations=iterations,
             )
 
         weighted = sorted(signals, key=lambda s: s.confidence, reverse=True)
@@ -46,6 +455,10 @@ class SwarmOrchestrator:
             "rate limiting while monitoring error budget burn"
         )
 
+        slow_hop = next((signal for signal in weighted if signal.domain == AgentDomain.traces), None)
+        if slow_hop is not None and slow_hop.confidence >= 0.8:
+            hypothesis = slow_hop.finding
+
         if top.domain == AgentDomain.security and top.confidence >= 0.85:
             hypothesis = "Potential security-driven incident impacting application stability"
             action = "Enable WAF strict mode, block suspicious IP ranges, rotate high-risk credentials"
@@ -69,6 +482,8 @@ class SwarmOrchestrator:
             confidence=avg_confidence,
             status=status,
             evidence_count=sum(len(signal.evidence) for signal in weighted),
+            timed_out_domains=timed_out,
+            failed_domains=failed,
         )
 
         return InvestigationResult(
@@ -82,4 +497,15 @@ class SwarmOrchestrator:
             estimated_minutes_to_mitigate=eta_map[status],
             audit_recommendations=audit.recommendations,
             signals=weighted,
+            timed_out_domains=timed_out,
+            failed_domains=failed,
+            skipped_domains=skipped,
+            related_services=related,
+            blast_radius=blast_radius,
+            audit_iterations=iterations,
         )
+
+
+
+def _strength(signal: Signal) -> tuple[float, int]:
+    return signal.confidence, len(signal.evidence)
@@ -59,6 +59,7 @@ def build_alignment_plan() -> StartupAlignmentPlan:
                     "FastAPI platform shell with dashboard and core endpoints",
                     "Stable /platform/screenshot endpoint to avoid expiring artifact links",
                     "Demo runbook in docs/DEMO.md",
+                    "Per-tenant quotas and fair-share triage scheduling via X-Tenant-ID",
                 ],
                 next_implementation=[
                     "API auth scaffold (API key/JWT)",
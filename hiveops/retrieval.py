@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .cache import normalize_symptom
+from .models import IncidentRequest, InvestigationResult, SimilarIncident
+
+NUM_PERM = 64
+BANDS = 16
+MAX_CANDIDATES = 256
+BUCKET_SCAN = 64
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_PRIME = np.uint64(4294967311)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    ref TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    service TEXT NOT NULL,
+    title TEXT NOT NULL,
+    action TEXT NOT NULL,
+    status TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    terms TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (key INTEGER, document INTEGER, PRIMARY KEY (key, document)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT, document INTEGER, tf INTEGER NOT NULL, PRIMARY KEY (term, document)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+"""
+
+
+@dataclass(slots=True)
+class HistoryDocument:
+    ref: str
+    text: str
+    kind: str = "incident"
+    service: str = ""
+    title: str = ""
+    action: str = ""
+    status: str = ""
+
+
+class IncidentHistory:
+    """Persistent similar-incident index over past triage results and runbooks.
+
+    Candidates come from MinHash/LSH: each document's symptom shingles are reduced to
+    ``num_perm`` min-hashes, split into ``bands`` buckets, and any shared bucket makes
+    a near-duplicate candidate. When that yields too few, postings of the rarest query
+    terms top the set up. Candidates are ranked by BM25 over the full text, boosted
+    by the estimated Jaccard similarity, so a lookup touches a bounded number of rows
+    however large the history grows. Inserts are incremental and go straight to SQLite.
+    """
+
+    def __init__(self, path: Path | str = ":memory:", num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._documents, total = self._db.execute("SELECT count(*), coalesce(sum(length), 0) FROM documents").fetchone()
+        self._total_length = total
+
+    def __len__(self) -> int:
+        return self._documents
+
+    def close(self) -> None:
+        self._db.close()
+
+    def add(self, document: HistoryDocument) -> None:
+        self.extend([document])
+
+    def extend(self, documents: Iterable[HistoryDocument]) -> int:
+        """Index ``documents`` in one transaction; a known ``ref`` is replaced."""
+        added = 0
+        with self._lock, self._db:
+            for document in documents:
+                self._insert(document)
+                added += 1
+        return added
+
+    def add_result(self, incident: IncidentRequest, result: InvestigationResult) -> None:
+        self.add(
+            HistoryDocument(
+                ref=result.incident_id,
+                text=" ".join([incident.symptom, result.hypothesis, *(signal.finding for signal in result.signals)]),
+                service=result.service,
+                title=incident.symptom,
+                action=result.suggested_action,
+                status=result.status,
+            )
+        )
+
+    def similar(self, symptom: str, service: str | None = None, k: int = 3) -> list[SimilarIncident]:
+        terms = Counter(_terms(symptom))
+        if not terms:
+            return []
+        signature = self._signature(symptom)
+        with self._lock:
+            candidates = self._candidates(signature, list(terms), k)
+            if not candidates:
+                return []
+            return self._rank(candidates, terms, signature, service, k)
+
+    def _insert(self, document: HistoryDocument) -> None:
+        existing = self._db.execute("SELECT id FROM documents WHERE ref = ?", (document.ref,)).fetchone()
+        if existing is not None:
+            self._delete(existing[0])
+        terms = Counter(_terms(document.text))
+        signature = self._signature(document.title or document.text)
+        cursor = self._db.execute(
+            "INSERT INTO documents (ref, kind, service, title, action, status, length, terms, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                document.ref,
+                document.kind,
+                document.service,
+                document.title or document.text[:200],
+                document.action,
+                document.status,
+                sum(terms.values()),
+                " ".join(f"{term}:{tf}" for term, tf in terms.items()),
+                signature.tobytes(),
+            ),
+        )
+        row = cursor.lastrowid
+        self._db.executemany(
+            "INSERT OR IGNORE INTO bands (key, document) VALUES (?, ?)",
+            ((key, row) for key in self._band_keys(signature)),
+        )
+        self._db.executemany(
+            "INSERT INTO postings (term, document, tf) VALUES (?, ?, ?)",
+            ((term, row, tf) for term, tf in terms.items()),
+        )
+        self._db.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, 1) ON CONFLICT (term) DO UPDATE SET df = df + 1",
+            ((term,) for term in terms),
+        )
+        self._documents += 1
+        self._total_length += sum(terms.values())
+
+    def _delete(self, row: int) -> None:
+        length, stored, signature = self._db.execute(
+            "SELECT length, terms, signature FROM documents WHERE id = ?", (row,)
+        ).fetchone()
+        terms = [entry.rpartition(":")[0] for entry in stored.split()]
+        self._db.executemany("UPDATE terms SET df = df - 1 WHERE term = ?", ((term,) for term in terms))
+        self._db.executemany("DELETE FROM postings WHERE term = ? AND document = ?", ((term, row) for term in terms))
+        self._db.executemany(
+            "DELETE FROM bands WHERE key = ? AND document = ?",
+            ((key, row) for key in self._band_keys(np.frombuffer(signature, dtype=np.uint64))),
+        )
+        self._db.execute("DELETE FROM documents WHERE id = ?", (row,))
+        self._documents -= 1
+        self._total_length -= length
+
+    def _candidates(self, signature: np.ndarray, terms: list[str], k: int) -> list[int]:
+        # Documents sharing the most bands are the closest near-duplicates. Only the most
+        # recent entries of each bucket are read, so a failure seen thousands of times
+        # costs no more than one seen a handful.
+        collisions: Counter[int] = Counter()
+        for key in self._band_keys(signature):
+            collisions.update(
+                row
+                for (row,) in self._db.execute(
+                    "SELECT document FROM bands WHERE key = ? ORDER BY document DESC LIMIT ?", (key, BUCKET_SCAN)
+                )
+            )
+        found = dict.fromkeys(row for row, _ in collisions.most_common(MAX_CANDIDATES))
+        if len(found) >= 4 * k:
+            return list(found)
+        # Too few near-duplicates: top up from the rarest terms' most recent postings.
+        placeholders = ",".join("?" * len(terms))
+        rare = self._db.execute(f"SELECT term FROM terms WHERE term IN ({placeholders}) ORDER BY df", terms)
+        for (term,) in rare:
+            budget = MAX_CANDIDATES - len(found)
+            if budget <= 0:
+                break
+            for (row,) in self._db.execute(
+                "SELECT document FROM postings WHERE term = ? ORDER BY document DESC LIMIT ?", (term, budget)
+            ):
+                found[row] = None
+        return list(found)
+
+    def _rank(
+        self,
+        candidates: list[int],
+        terms: Counter[str],
+        signature: np.ndarray,
+        service: str | None,
+        k: int,
+    ) -> list[SimilarIncident]:
+        term_marks = ",".join("?" * len(terms))
+        document_marks = ",".join("?" * len(candidates))
+        document_frequency = dict(
+            self._db.execute(f"SELECT term, df FROM terms WHERE term IN ({term_marks})", list(terms))
+        )
+        rows = {
+            row[0]: row
+            for row in self._db.execute(
+                "SELECT id, ref, kind, service, title, action, status, length, terms, signature FROM documents "
+                f"WHERE id IN ({document_marks})",
+                candidates,
+            )
+        }
+        average_length = self._total_length / max(self._documents, 1)
+        idf = {
+            term: math.log(1 + (self._documents - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()
+        }
+        scores = {}
+        for row, document in rows.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * document[7] / average_length)
+            score = 0.0
+            for entry in document[8].split():
+                term, _, tf = entry.rpartition(":")
+                if term in idf:
+                    score += idf[term] * int(tf) * (BM25_K1 + 1) / (int(tf) + norm)
+            scores[row] = score
+
+        order = list(scores)
+        signatures = np.frombuffer(b"".join(rows[row][9] for row in order), dtype=np.uint64)
+        similarities = (signatures.reshape(len(order), -1) == signature).mean(axis=1).tolist()
+        ranked = []
+        for row, similarity in zip(order, similarities):
+            score = scores[row] * (1.25 if service is not None and rows[row][3] == service else 1.0)
+            ranked.append((score * (1 + similarity), similarity, row))
+        ranked.sort(reverse=True)
+        return [
+            SimilarIncident(
+                ref=rows[row][1],
+                kind=rows[row][2],
+                service=rows[row][3],
+                title=rows[row][4],
+                suggested_action=rows[row][5],
+                status=rows[row][6],
+                score=round(score, 3),
+                similarity=round(similarity, 3),
+            )
+            for score, similarity, row in ranked[:k]
+            if score > 0
+        ]
+
+    def _signature(self, text: str) -> np.ndarray:
+        shingles = _shingles(normalize_symptom(text).split())
+        if not shingles:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64)
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> list[int]:
+        if signature[0] == _PRIME:
+            return []
+        rows = self.num_perm // self.bands
+        return [
+            int.from_bytes(
+                hashlib.blake2b(signature[band * rows : (band + 1) * rows].tobytes() + bytes([band]), digest_size=8)
+                .digest(),
+                "little",
+                signed=True,
+            )
+            for band in range(self.bands)
+        ]
+
+
+def _terms(text: str) -> list[str]:
+    return [token for token in normalize_symptom(text).split() if token != "#"]
+
+
+def _shingles(tokens: list[str]) -> set[str]:
+    return {*tokens, *(f"{left} {right}" for left, right in zip(tokens, tokens[1:]))}
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from .models import IncidentRequest, InvestigationResult, SchedulerStatus, Severity, TenantOperation
+from .orchestrator import SwarmOrchestrator
+from .tenancy import DEFAULT_TENANT, TenantGovernor
+
+_RANK = {severity: rank for rank, severity in enumerate(Severity)}
+
+
+class SchedulerSaturated(RuntimeError):
+    """Raised to a caller whose incident was rejected or shed from a full queue."""
+
+
+@dataclass(slots=True, eq=False)
+class _Ticket:
+    incident: IncidentRequest
+    future: asyncio.Future[InvestigationResult]
+    enqueued_at: float
+    tenant: str = DEFAULT_TENANT
+    finish: float = 0.0
+    started: bool = False
+    run: Callable[[], Awaitable[InvestigationResult | None]] | None = None
+
+    @property
+    def rank(self) -> int:
+        return _RANK[self.incident.severity]
+
+
+@dataclass(slots=True)
+class _Waits:
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.longest = max(self.longest, seconds)
+
+
+@dataclass(slots=True)
+class _Counters:
+    submitted: int = 0
+    completed: int = 0
+    shed: dict[Severity, int] = field(default_factory=lambda: dict.fromkeys(Severity, 0))
+    preempted: int = 0
+
+
+class TriageScheduler:
+    """Admission control in front of :meth:`SwarmOrchestrator.triage`.
+
+    At most ``concurrency`` investigations run at once; the rest wait in one FIFO
+    queue per severity and the most severe non-empty queue is served first. A
+    critical incident arriving at a full swarm preempts the least severe running
+    investigation below it, which goes back to the front of its queue. Once
+    ``max_queued`` incidents are waiting, a new arrival sheds the newest incident of
+    a lower severity, or is itself rejected with :class:`SchedulerSaturated`.
+
+    With ``tenants``, each tenant runs at most its triage concurrency quota at once,
+    and within a severity the queued tenants share free slots by weighted fair
+    queuing: every ticket is stamped with a virtual finish time that grows by
+    ``1 / weight`` per ticket the tenant has waiting, and the lowest stamp runs
+    first. A tenant flooding the queue therefore delays only its own incidents, and
+    shedding takes the newest incident of the tenant with the most queued.
+    """
+
+    def __init__(
+        self,
+        orchestrator: SwarmOrchestrator,
+        concurrency: int = 32,
+        max_queued: int = 1024,
+        preempt: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+        tenants: TenantGovernor | None = None,
+    ):
+        self.orchestrator = orchestrator
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.preempt = preempt
+        self.tenants = tenants
+        self._clock = clock
+        self._queues: dict[Severity, dict[str, deque[_Ticket]]] = {severity: {} for severity in Severity}
+        self._running: dict[asyncio.Task[InvestigationResult], _Ticket] = {}
+        self._active: dict[str, int] = {}
+        self._virtual = 0.0
+        self._last_finish: dict[str, float] = {}
+        self._waits = {severity: _Waits() for severity in Severity}
+        self._counters = _Counters()
+        self._ids = itertools.count()
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queues in self._queues.values() for queue in queues.values())
+
+    async def triage(self, incident: IncidentRequest, tenant: str = DEFAULT_TENANT) -> InvestigationResult:
+        ticket = _Ticket(incident, asyncio.get_running_loop().create_future(), self._clock(), tenant)
+        self._counters.submitted += 1
+        self._admit(ticket)
+        try:
+            return await asyncio.shield(ticket.future)
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            raise
+
+    async def reserve(self, incident: IncidentRequest, tenant: str = DEFAULT_TENANT) -> Callable[[], None]:
+        """Wait for a slot for work the caller runs itself, such as a streamed triage.
+
+        Returns the callable that gives the slot back; calling it again is harmless.
+        Reservations queue, shed and count like :meth:`triage` but are never
+        preempted, since the scheduler cannot restart work it does not run.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+        released = asyncio.Event()
+
+        async def hold() -> None:
+            if not started.done():
+                started.set_result(None)
+            await released.wait()
+
+        ticket = _Ticket(incident, loop.create_future(), self._clock(), tenant, run=hold)
+        self._counters.submitted += 1
+        self._admit(ticket)
+        try:
+            await asyncio.wait({started, ticket.future}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            released.set()
+            raise
+        if not started.done():
+            ticket.future.result()
+        return released.set
+
+    def status(self) -> SchedulerStatus:
+        return SchedulerStatus(
+            concurrency=self.concurrency,
+            running=len(self._running),
+            queued={severity: sum(map(len, queues.values())) for severity, queues in self._queues.items()},
+            mean_wait_seconds={
+                severity: round(waits.total / waits.count, 4) if waits.count else 0.0
+                for severity, waits in self._waits.items()
+            },
+            max_wait_seconds={severity: round(waits.longest, 4) for severity, waits in self._waits.items()},
+            submitted=self._counters.submitted,
+            completed=self._counters.completed,
+            shed=dict(self._counters.shed),
+            preempted=self._counters.preempted,
+            queued_by_tenant={
+                tenant: count
+                for tenant in sorted({tenant for queues in self._queues.values() for tenant in queues})
+                if (count := sum(len(queues.get(tenant, ())) for queues in self._queues.values()))
+            },
+            running_by_tenant={tenant: count for tenant, count in sorted(self._active.items()) if count},
+        )
+
+    def _admit(self, ticket: _Ticket) -> None:
+        allowed = self._allowed(ticket.tenant)
+        if allowed and len(self._running) < self.concurrency:
+            self._start(ticket)
+            return
+        if allowed and self.preempt and ticket.incident.severity is Severity.critical:
+            victim = self._victim(ticket.rank)
+            if victim is not None:
+                self._preempt(victim)
+                self._start(ticket)
+                return
+        if self.queued >= self.max_queued:
+            shed = self._shed(ticket.rank)
+            if shed is None:
+                self._counters.shed[ticket.incident.severity] += 1
+                ticket.future.set_exception(SchedulerSaturated("triage queue is full"))
+                return
+            self._counters.shed[shed.incident.severity] += 1
+            shed.future.set_exception(SchedulerSaturated("shed for a more severe incident"))
+        self._enqueue(ticket)
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        weight = self.tenants.weight(ticket.tenant) if self.tenants is not None else 1.0
+        ticket.finish = max(self._virtual, self._last_finish.get(ticket.tenant, 0.0)) + 1.0 / weight
+        self._last_finish[ticket.tenant] = ticket.finish
+        self._queues[ticket.incident.severity].setdefault(ticket.tenant, deque()).append(ticket)
+
+    def _allowed(self, tenant: str) -> bool:
+        if self.tenants is None:
+            return True
+        return self._active.get(tenant, 0) < self.tenants.concurrency(tenant, TenantOperation.triage)
+
+    def _start(self, ticket: _Ticket) -> None:
+        if not ticket.started:
+            ticket.started = True
+            self._waits[ticket.incident.severity].record(self._clock() - ticket.enqueued_at)
+        work = ticket.run() if ticket.run is not None else self.orchestrator.triage(ticket.incident)
+        task = asyncio.create_task(work, name=f"triage-{next(self._ids)}")
+        self._running[task] = ticket
+        self._active[ticket.tenant] = self._active.get(ticket.tenant, 0) + 1
+        task.add_done_callback(self._finished)
+
+    def _stopped(self, ticket: _Ticket) -> None:
+        self._active[ticket.tenant] -= 1
+
+    def _finished(self, task: asyncio.Task[InvestigationResult]) -> None:
+        ticket = self._running.pop(task, None)
+        if ticket is not None:
+            self._stopped(ticket)
+        if ticket is not None and not ticket.future.done():
+            if task.cancelled():
+                ticket.future.cancel()
+            elif task.exception() is not None:
+                ticket.future.set_exception(task.exception())
+            else:
+                self._counters.completed += 1
+                ticket.future.set_result(task.result())
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        for severity in reversed(Severity):
+            queues = self._queues[severity]
+            while queues and len(self._running) < self.concurrency:
+                ready = [tenant for tenant, queue in queues.items() if self._allowed(tenant)]
+                if not ready:
+                    break
+                tenant = min(ready, key=lambda name: queues[name][0].finish)
+                ticket = queues[tenant].popleft()
+                if not queues[tenant]:
+                    del queues[tenant]
+                self._virtual = max(self._virtual, ticket.finish)
+                self._start(ticket)
+
+    def _victim(self, rank: int) -> asyncio.Task[InvestigationResult] | None:
+        """The least severe running investigation below ``rank``, most recently started first."""
+        candidates = [task for task, ticket in self._running.items() if ticket.rank < rank and ticket.run is None]
+        return min(reversed(candidates), key=lambda task: self._running[task].rank, default=None)
+
+    def _preempt(self, task: asyncio.Task[InvestigationResult]) -> None:
+        ticket = self._running.pop(task)
+        self._stopped(ticket)
+        task.cancel()
+        self._counters.preempted += 1
+        self._queues[ticket.incident.severity].setdefault(ticket.tenant, deque()).appendleft(ticket)
+
+    def _shed(self, rank: int) -> _Ticket | None:
+        for severity in Severity:
+            if _RANK[severity] >= rank:
+                return None
+            queues = self._queues[severity]
+            if queues:
+                tenant = max(queues, key=lambda name: len(queues[name]))
+                shed = queues[tenant].pop()
+                if not queues[tenant]:
+                    del queues[tenant]
+                return shed
+        return None
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        queues = self._queues[ticket.incident.severity]
+        queue = queues.get(ticket.tenant)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del queues[ticket.tenant]
+        for task, running in list(self._running.items()):
+            if running is ticket:
+                task.cancel()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import gzip
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+GRAM = 4
+CHUNK_BYTES = 1 << 20
+SAMPLE_CHARS = 240
+
+_ISO_TIME = re.compile(rb"(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)")
+_EPOCH_TIME = re.compile(rb'"(?:timestamp|ts|time)"\s*:\s*(\d{10,13})(?:\.\d+)?\b')
+_HASH = np.uint32(2654435761)
+
+
+@dataclass(frozen=True, slots=True)
+class Signature:
+    """A named detection matched when any of its case-insensitive ``literals`` appears in a line."""
+
+    name: str
+    source: str
+    literals: tuple[str, ...]
+    severity: str = "high"
+
+
+DEFAULT_SIGNATURES: tuple[Signature, ...] = (
+    Signature(
+        "sql-injection",
+        "waf",
+        (
+            "union select",
+            "union all select",
+            "' or '1'='1",
+            "or 1=1--",
+            "information_schema",
+            "xp_cmdshell",
+            "sleep(",
+            "benchmark(",
+        ),
+    ),
+    Signature("xss", "waf", ("<script", "javascript:", "onerror=", "document.cookie", "<iframe")),
+    Signature("path-traversal", "waf", ("../../", "..%2f", "%2e%2e%2f", "/etc/passwd")),
+    Signature("log4shell", "waf", ("${jndi:",), severity="critical"),
+    Signature("ssrf-metadata", "waf", ("169.254.169.254", "metadata.google.internal")),
+    Signature("command-injection", "waf", (";cat ", "|cat ", "/bin/sh", "/bin/bash", "cmd.exe", "wget http")),
+    Signature("scanner", "waf", ("sqlmap", "nikto", "masscan", "nuclei", "zgrab"), severity="low"),
+    Signature("shell-in-container", "runtime", ("terminal shell in container", "a shell was spawned")),
+    Signature(
+        "sensitive-file-access", "runtime", ("read sensitive file", "write below etc", "write below binary dir")
+    ),
+    Signature("privileged-container", "runtime", ("launch privileged container",), severity="critical"),
+    Signature("crypto-mining", "runtime", ("crypto miners", "stratum+tcp"), severity="critical"),
+    Signature("c2-connection", "runtime", ("outbound connection to c2",), severity="critical"),
+)
+
+
+@dataclass(slots=True)
+class SignatureHit:
+    signature: Signature
+    timestamp: datetime | None
+    line: bytes
+
+
+@dataclass(slots=True)
+class ScanReport:
+    counts: dict[str, int] = field(default_factory=dict)
+    samples: dict[str, str] = field(default_factory=dict)
+    sources: dict[str, int] = field(default_factory=dict)
+    bytes_scanned: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def top(self, limit: int = 3) -> list[tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+class SignatureScanner:
+    """Multi-pattern scanner that finds every signature literal in one vectorized pass per chunk.
+
+    Each literal's first four bytes are hashed into a bitmap. A chunk is lowercased
+    and read as little-endian ``uint32`` words at each of the four byte offsets; those
+    words are hashed and looked up in the bitmap together, so the per-byte work runs in
+    NumPy no matter how many signatures there are. Only the few candidate positions
+    this leaves are verified in Python, against the literals that share the hit gram.
+    """
+
+    def __init__(self, signatures: Iterable[Signature] = DEFAULT_SIGNATURES, table_bits: int = 18):
+        self.signatures = tuple(signatures)
+        self._shift = np.uint32(32 - table_bits)
+        self._table = np.zeros(1 << table_bits, dtype=bool)
+        self._literals: dict[bytes, list[tuple[bytes, int]]] = {}
+        for position, signature in enumerate(self.signatures):
+            for literal in signature.literals:
+                encoded = literal.lower().encode()
+                if len(encoded) < GRAM:
+                    raise ValueError(f"signature literal {literal!r} is shorter than {GRAM} bytes")
+                self._literals.setdefault(encoded[:GRAM], []).append((encoded, position))
+        grams = np.array([int.from_bytes(gram, "little") for gram in self._literals], dtype=np.uint32)
+        self._table[(grams * _HASH) >> self._shift] = True
+
+    def scan(
+        self, chunks: Iterable[bytes], start: datetime | None = None, end: datetime | None = None
+    ) -> ScanReport:
+        """Count lines hitting each signature; lines without a timestamp are always counted."""
+        report = ScanReport()
+        for chunk in chunks:
+            report.bytes_scanned += len(chunk)
+            for hit in self._hits(chunk, start, end):
+                name = hit.signature.name
+                report.counts[name] = report.counts.get(name, 0) + 1
+                report.sources[hit.signature.source] = report.sources.get(hit.signature.source, 0) + 1
+                report.samples.setdefault(name, hit.line[:SAMPLE_CHARS].decode(errors="replace"))
+        return report
+
+    def hits(
+        self, chunks: Iterable[bytes], start: datetime | None = None, end: datetime | None = None
+    ) -> Iterator[SignatureHit]:
+        for chunk in chunks:
+            yield from self._hits(chunk, start, end)
+
+    def candidates(self, lowered: bytes) -> np.ndarray:
+        """Sorted offsets in ``lowered`` where some literal's first four bytes may start."""
+        found = []
+        for offset in range(GRAM):
+            words = (len(lowered) - offset) // GRAM
+            if words <= 0:
+                continue
+            grams = np.frombuffer(lowered, dtype="<u4", count=words, offset=offset)
+            flagged = np.flatnonzero(self._table.take((grams * _HASH) >> self._shift))
+            if len(flagged):
+                found.append(flagged * GRAM + offset)
+        return np.sort(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def _hits(self, chunk: bytes, start: datetime | None, end: datetime | None) -> Iterator[SignatureHit]:
+        lowered = chunk.lower()
+        seen: set[tuple[int, int]] = set()
+        for position in self.candidates(lowered).tolist():
+            for literal, signature in self._literals.get(lowered[position : position + GRAM], ()):
+                if not lowered.startswith(literal, position):
+                    continue
+                line_start = lowered.rfind(b"\n", 0, position) + 1
+                if (line_start, signature) in seen:
+                    continue
+                seen.add((line_start, signature))
+                line_end = lowered.find(b"\n", position)
+                line = chunk[line_start : line_end if line_end != -1 else len(chunk)]
+                timestamp = line_time(line)
+                if timestamp is not None and (
+                    (start is not None and timestamp < start) or (end is not None and timestamp > end)
+                ):
+                    continue
+                yield SignatureHit(self.signatures[signature], timestamp, line)
+
+
+def line_time(line: bytes) -> datetime | None:
+    """Best-effort event time of a log line: an ISO-8601 stamp or an epoch ``timestamp`` field."""
+    epoch = _EPOCH_TIME.search(line)
+    if epoch is not None:
+        value = int(epoch.group(1))
+        return datetime.fromtimestamp(value / 1000 if value > 10**11 else value, tz=timezone.utc)
+    iso = _ISO_TIME.search(line)
+    if iso is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(iso.group(1).decode().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def iter_chunks(stream: BinaryIO, chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Yield newline-terminated chunks of roughly ``chunk_bytes`` so no line is split."""
+    carry = b""
+    while block := stream.read(chunk_bytes):
+        block = carry + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            carry = block
+            continue
+        carry = block[cut:]
+        yield block[:cut]
+    if carry:
+        yield carry
+
+
+def read_chunks(paths: Iterable[Path], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Stream chunks from plain or ``.gz`` log files in turn."""
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rb") as stream:
+            yield from iter_chunks(stream, chunk_bytes)
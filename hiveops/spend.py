@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+SPIKE_RATIO = 1.5
+SPIKE_QUANTILE = 0.99
+SPIKE_SIGMAS = 3.0
+MIN_HOURS = 6
+MAX_GAP_HOURS = 24
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch over positive values (DDSketch-style log buckets).
+
+    A value lands in bucket ``ceil(log_gamma(value))``, so any quantile is answered
+    within ``relative_accuracy`` of the true value. Sketches merge by adding bucket
+    counts, which makes the merge exact and order independent. Past ``max_bins`` the
+    lowest buckets are folded together, trading accuracy only at the cheap tail.
+    """
+
+    __slots__ = ("relative_accuracy", "max_bins", "bins", "zeros", "count", "_gamma", "_log_gamma")
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 512):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.bins: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        self.count += weight
+        if value <= 0:
+            self.zeros += weight
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + weight
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "zeros": self.zeros,
+            "bins": [[key, count] for key, count in sorted(self.bins.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, document: Mapping[str, Any]) -> QuantileSketch:
+        sketch = cls(document["relative_accuracy"], document["max_bins"])
+        sketch.bins = {int(key): int(count) for key, count in document["bins"]}
+        sketch.zeros = int(document["zeros"])
+        sketch.count = sketch.zeros + sum(sketch.bins.values())
+        return sketch
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        folded = sum(self.bins.pop(key) for key in keys[:excess])
+        self.bins[keys[excess]] += folded
+
+
+@dataclass(slots=True)
+class _KeyState:
+    sketch: QuantileSketch
+    mean: float = 0.0
+    variance: float = 0.0
+    hours: int = 0
+    hour: int = -1
+    pending: float = 0.0
+
+
+@dataclass(slots=True)
+class SpendSpike:
+    service: str
+    sku: str
+    hour: datetime
+    amount: float
+    baseline: float
+    p99: float
+
+    @property
+    def ratio(self) -> float:
+        return self.amount / self.baseline if self.baseline > 0 else math.inf
+
+
+@dataclass(slots=True)
+class SpendMonitor:
+    """Per ``(service, sku)`` hourly spend baselines built from a stream of billing records.
+
+    Records for the same key and hour are summed into an open hour; when a later hour
+    arrives the total is folded into the key's :class:`QuantileSketch` and an EWMA of
+    mean and variance, and no raw history is kept. Hours without records count as zero
+    spend (up to a day). Monitors serialize with :meth:`to_dict` and combine with
+    :meth:`merge`; workers should shard records by key so each hour is seen whole.
+    """
+
+    half_life_hours: float = 24.0
+    relative_accuracy: float = 0.01
+    keys: dict[str, dict[str, _KeyState]] = field(default_factory=dict)
+    late_records: int = 0
+
+    def __len__(self) -> int:
+        return sum(len(skus) for skus in self.keys.values())
+
+    @property
+    def alpha(self) -> float:
+        return 1 - 0.5 ** (1 / self.half_life_hours)
+
+    def observe(self, service: str, sku: str, timestamp: float, amount: float) -> None:
+        skus = self.keys.setdefault(service, {})
+        state = skus.get(sku)
+        if state is None:
+            state = skus[sku] = _KeyState(QuantileSketch(self.relative_accuracy))
+        hour = int(timestamp // 3600)
+        if state.hour < 0:
+            state.hour = hour
+        elif hour > state.hour:
+            self._roll(state, hour)
+        elif hour < state.hour:
+            self.late_records += 1
+            return
+        state.pending += amount
+
+    def observe_many(self, records: Iterable[Mapping[str, Any]]) -> int:
+        """Feed ``{"service", "sku", "timestamp", "amount"}`` records; returns how many were read."""
+        count = 0
+        for record in records:
+            timestamp = record["timestamp"]
+            if isinstance(timestamp, datetime):
+                timestamp = timestamp.timestamp()
+            self.observe(record["service"], record["sku"], float(timestamp), float(record["amount"]))
+            count += 1
+        return count
+
+    def spikes(
+        self,
+        services: Iterable[str],
+        at: datetime | None = None,
+        ratio: float = SPIKE_RATIO,
+        lookback_hours: int = 1,
+    ) -> list[SpendSpike]:
+        """Open hours of ``services`` above ``ratio`` times the EWMA, ``SPIKE_SIGMAS`` deviations and p99.
+
+        With ``at``, only keys whose open hour is that hour or within ``lookback_hours`` before it count.
+        """
+        earliest = -1 if at is None else int(at.timestamp() // 3600) - lookback_hours
+        found = []
+        for service in dict.fromkeys(services):
+            for sku, state in self.keys.get(service, {}).items():
+                if state.hours < MIN_HOURS or state.hour < earliest:
+                    continue
+                p99 = state.sketch.quantile(SPIKE_QUANTILE) or 0.0
+                floor = max(p99, state.mean + SPIKE_SIGMAS * math.sqrt(state.variance))
+                if state.pending > floor and state.pending >= ratio * state.mean:
+                    found.append(
+                        SpendSpike(
+                            service=service,
+                            sku=sku,
+                            hour=datetime.fromtimestamp(state.hour * 3600, tz=timezone.utc),
+                            amount=state.pending,
+                            baseline=state.mean,
+                            p99=p99,
+                        )
+                    )
+        return sorted(found, key=lambda spike: spike.amount - spike.baseline, reverse=True)
+
+    def tracked(self, services: Iterable[str]) -> int:
+        return sum(len(self.keys.get(service, {})) for service in dict.fromkeys(services))
+
+    def merge(self, other: SpendMonitor) -> None:
+        """Fold ``other`` in: sketches add, EWMA state is count-weighted, open hours sum.
+
+        Whichever side's open hour is older is closed first, as a later record would
+        close it, so neither side's pending spend is lost.
+        """
+        for service, skus in other.keys.items():
+            ours = self.keys.setdefault(service, {})
+            for sku, theirs in skus.items():
+                state = ours.get(sku)
+                if state is None:
+                    ours[sku] = _copy(theirs)
+                    continue
+                if theirs.hour > state.hour:
+                    self._roll(state, theirs.hour)
+                elif theirs.hour < state.hour:
+                    theirs = _copy(theirs)
+                    self._roll(theirs, state.hour)
+                weight = theirs.hours / max(state.hours + theirs.hours, 1)
+                state.mean += weight * (theirs.mean - state.mean)
+                state.variance += weight * (theirs.variance - state.variance)
+                state.hours += theirs.hours
+                state.sketch.merge(theirs.sketch)
+                state.pending += theirs.pending
+        self.late_records += other.late_records
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "half_life_hours": self.half_life_hours,
+            "relative_accuracy": self.relative_accuracy,
+            "late_records": self.late_records,
+            "keys": [
+                {
+                    "service": service,
+                    "sku": sku,
+                    "sketch": state.sketch.to_dict(),
+                    "mean": state.mean,
+                    "variance": state.variance,
+                    "hours": state.hours,
+                    "hour": state.hour,
+                    "pending": state.pending,
+                }
+                for service, skus in self.keys.items()
+                for sku, state in skus.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, document: Mapping[str, Any]) -> SpendMonitor:
+        monitor = cls(
+            half_life_hours=document["half_life_hours"],
+            relative_accuracy=document["relative_accuracy"],
+            late_records=document.get("late_records", 0),
+        )
+        for entry in document["keys"]:
+            monitor.keys.setdefault(entry["service"], {})[entry["sku"]] = _KeyState(
+                sketch=QuantileSketch.from_dict(entry["sketch"]),
+                mean=entry["mean"],
+                variance=entry["variance"],
+                hours=entry["hours"],
+                hour=entry["hour"],
+                pending=entry["pending"],
+            )
+        return monitor
+
+    def _roll(self, state: _KeyState, hour: int) -> None:
+        """Close the open hour and any empty hours before ``hour``, which becomes the open hour."""
+        self._fold(state, state.pending)
+        for _ in range(min(hour - state.hour - 1, MAX_GAP_HOURS)):
+            self._fold(state, 0.0)
+        state.hour, state.pending = hour, 0.0
+
+    def _fold(self, state: _KeyState, amount: float) -> None:
+        state.sketch.add(amount)
+        if not state.hours:
+            state.mean, state.variance = amount, 0.0
+        else:
+            delta = amount - state.mean
+            increment = self.alpha * delta
+            state.mean += increment
+            state.variance = (1 - self.alpha) * (state.variance + delta * increment)
+        state.hours += 1
+
+
+def _copy(state: _KeyState) -> _KeyState:
+    return _KeyState(
+        QuantileSketch.from_dict(state.sketch.to_dict()),
+        state.mean,
+        state.variance,
+        state.hours,
+        state.hour,
+        state.pending,
+    )
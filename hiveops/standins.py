@@ -0,0 +1,249 @@
+"""Local stand-in backends that replay recorded fixtures for offline testing and load tests.
+
+Run standalone with ``uvicorn --factory hiveops.standins:create_standin_app`` and point
+``HIVEOPS_PROMETHEUS_URL`` / ``HIVEOPS_KUBERNETES_URL`` / ``HIVEOPS_GITHUB_URL`` at it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "standin.json"
+KUBERNETES_KINDS = ("pods", "replicasets", "events")
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def create_standin_app(fixtures: Mapping[str, Any] | None = None) -> FastAPI:
+    """Serve Prometheus-, Kubernetes- and GitHub-shaped APIs from one fixture document.
+
+    Prometheus responses are replayed by exact query string. Commit timestamps are
+    recorded as ``minutes_ago`` and materialized relative to the request time so
+    window filtering behaves like a live backend. Kubernetes objects live in a
+    mutable :class:`FakeKubernetes` exposed as ``app.state.kubernetes``; its list
+    endpoints also serve ``?watch=true`` streams.
+    """
+    recorded = dict(fixtures) if fixtures is not None else load_fixtures()
+    prometheus = recorded.get("prometheus", {})
+    kubernetes = FakeKubernetes(recorded.get("kubernetes", {}))
+    github = recorded.get("github", {})
+    app = FastAPI(title="HiveOps stand-in backends")
+    app.state.kubernetes = kubernetes
+
+    @app.get("/api/v1/query")
+    async def prometheus_query(query: str) -> dict[str, Any]:
+        return _vector(prometheus.get("queries", {}).get(query, []))
+
+    @app.get("/api/v1/query_range")
+    async def prometheus_query_range(query: str) -> dict[str, Any]:
+        return {
+            "status": "success",
+            "data": {"resultType": "matrix", "result": prometheus.get("ranges", {}).get(query, [])},
+        }
+
+    @app.get("/api/v1/pods", response_model=None)
+    @app.get("/api/v1/namespaces/{namespace}/pods", response_model=None)
+    async def list_pods(
+        namespace: str | None = None,
+        label_selector: str | None = Query(None, alias="labelSelector"),
+        watch: bool = False,
+        resource_version: int = Query(0, alias="resourceVersion"),
+        timeout_seconds: float = Query(30.0, alias="timeoutSeconds"),
+    ) -> dict[str, Any] | StreamingResponse:
+        return kubernetes.respond(
+            "pods", namespace, label_selector, "metadata.labels.", watch, resource_version, timeout_seconds
+        )
+
+    @app.get("/apis/apps/v1/replicasets", response_model=None)
+    @app.get("/apis/apps/v1/namespaces/{namespace}/replicasets", response_model=None)
+    async def list_replicasets(
+        namespace: str | None = None,
+        label_selector: str | None = Query(None, alias="labelSelector"),
+        watch: bool = False,
+        resource_version: int = Query(0, alias="resourceVersion"),
+        timeout_seconds: float = Query(30.0, alias="timeoutSeconds"),
+    ) -> dict[str, Any] | StreamingResponse:
+        return kubernetes.respond(
+            "replicasets", namespace, label_selector, "metadata.labels.", watch, resource_version, timeout_seconds
+        )
+
+    @app.get("/api/v1/events", response_model=None)
+    @app.get("/api/v1/namespaces/{namespace}/events", response_model=None)
+    async def list_events(
+        namespace: str | None = None,
+        field_selector: str | None = Query(None, alias="fieldSelector"),
+        watch: bool = False,
+        resource_version: int = Query(0, alias="resourceVersion"),
+        timeout_seconds: float = Query(30.0, alias="timeoutSeconds"),
+    ) -> dict[str, Any] | StreamingResponse:
+        return kubernetes.respond("events", namespace, field_selector, "", watch, resource_version, timeout_seconds)
+
+    @app.get("/repos/{owner}/{repo}/commits")
+    async def list_commits(owner: str, repo: str, since: datetime | None = None) -> list[dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        commits = []
+        for commit in github.get("commits", {}).get(repo, []):
+            committed_at = now - timedelta(minutes=commit["minutes_ago"])
+            if since is not None and committed_at < since:
+                continue
+            commits.append(
+                {
+                    "sha": commit["sha"],
+                    "commit": {
+                        "message": commit["message"],
+                        "author": {"name": commit.get("author", "unknown"), "date": committed_at.isoformat()},
+                    },
+                }
+            )
+        return commits
+
+    @app.get("/repos/{owner}/{repo}/deployments")
+    async def list_deployments(owner: str, repo: str) -> list[dict[str, Any]]:
+        if repo not in github.get("deployments", {}) and repo not in github.get("commits", {}):
+            raise HTTPException(status_code=404, detail="Not Found")
+        return github.get("deployments", {}).get(repo, [])
+
+    return app
+
+
+class FakeKubernetes:
+    """In-memory API server state: versioned pods, replicasets and events plus a bounded watch history.
+
+    Watches starting from a resource version that has fallen out of the history get
+    a ``410 Expired`` error event, as from a real API server after compaction.
+    """
+
+    def __init__(self, recorded: Mapping[str, Any], history: int = 1024):
+        self.resource_version = 0
+        self.objects: dict[str, dict[tuple[str, str], dict[str, Any]]] = {kind: {} for kind in KUBERNETES_KINDS}
+        self.history: deque[tuple[int, str, dict[str, Any]]] = deque(maxlen=history)
+        self.compacted = 0
+        self._changed: asyncio.Event | None = None
+        for kind in KUBERNETES_KINDS:
+            for item in recorded.get(kind, []):
+                self.apply(kind, item)
+
+    def apply(self, kind: str, item: Mapping[str, Any]) -> dict[str, Any]:
+        """Create or replace an object, bumping its resource version and notifying watchers."""
+        key = _object_key(item)
+        event_type = "MODIFIED" if key in self.objects[kind] else "ADDED"
+        stored = self._record(kind, event_type, item)
+        self.objects[kind][key] = stored
+        return stored
+
+    def delete(self, kind: str, namespace: str, name: str) -> None:
+        item = self.objects[kind].pop((namespace, name))
+        self._record(kind, "DELETED", item)
+
+    def respond(
+        self,
+        kind: str,
+        namespace: str | None,
+        selector: str | None,
+        prefix: str,
+        watch: bool,
+        resource_version: int,
+        timeout_seconds: float,
+    ) -> dict[str, Any] | StreamingResponse:
+        if watch:
+            return StreamingResponse(
+                self.watch(kind, namespace, selector, prefix, resource_version, timeout_seconds),
+                media_type="application/json",
+            )
+        listed = _list(list(self.objects[kind].values()), namespace, selector, prefix)
+        listed["metadata"] = {"resourceVersion": str(self.resource_version)}
+        return listed
+
+    async def watch(
+        self,
+        kind: str,
+        namespace: str | None,
+        selector: str | None,
+        prefix: str,
+        resource_version: int,
+        timeout_seconds: float,
+    ) -> AsyncIterator[str]:
+        if resource_version < self.compacted:
+            status = {"kind": "Status", "code": 410, "reason": "Expired"}
+            yield json.dumps({"type": "ERROR", "object": status}) + "\n"
+            return
+
+        deadline = time.monotonic() + timeout_seconds
+        cursor = resource_version
+        while True:
+            changed = self._changed_event()
+            for version, event_kind, event in list(self.history):
+                if version <= cursor or event_kind != kind:
+                    continue
+                cursor = version
+                if _list([event["object"]], namespace, selector, prefix)["items"]:
+                    yield json.dumps(event) + "\n"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    def _record(self, kind: str, event_type: str, item: Mapping[str, Any]) -> dict[str, Any]:
+        self.resource_version += 1
+        stored = {**item, "metadata": {**item.get("metadata", {}), "resourceVersion": str(self.resource_version)}}
+        if len(self.history) == self.history.maxlen:
+            self.compacted = self.history[0][0]
+        self.history.append((self.resource_version, kind, {"type": event_type, "object": stored}))
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+        return stored
+
+    def _changed_event(self) -> asyncio.Event:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+
+def _object_key(item: Mapping[str, Any]) -> tuple[str, str]:
+    metadata = item.get("metadata", {})
+    return metadata.get("namespace", "default"), metadata["name"]
+
+
+def _vector(samples: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"status": "success", "data": {"resultType": "vector", "result": samples}}
+
+
+def _list(items: list[dict[str, Any]], namespace: str | None, selector: str | None, prefix: str) -> dict[str, Any]:
+    wanted = [term.split("=", 1) for term in selector.split(",")] if selector else []
+    matched = [
+        item
+        for item in items
+        if (namespace is None or item.get("metadata", {}).get("namespace") == namespace)
+        and all(_lookup(item, prefix + key) == value for key, value in wanted)
+    ]
+    return {"kind": "List", "items": matched}
+
+
+def _lookup(item: Mapping[str, Any], dotted: str) -> Any:
+    # Label keys may themselves contain dots, so only the leading path segments are split.
+    node: Any = item
+    parts = dotted.split(".")
+    for index, part in enumerate(parts):
+        if not isinstance(node, Mapping):
+            return None
+        if part in node:
+            node = node[part]
+            continue
+        return node.get(".".join(parts[index:]))
+    return node
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .anomaly import MetricWindow
+
+
+@dataclass(frozen=True, slots=True)
+class Resolution:
+    name: str
+    step_seconds: int
+    retention_seconds: int
+
+    @property
+    def capacity(self) -> int:
+        return self.retention_seconds // self.step_seconds
+
+
+DEFAULT_RESOLUTIONS: tuple[Resolution, ...] = (
+    Resolution("1m", 60, 24 * 3600),
+    Resolution("5m", 300, 7 * 24 * 3600),
+    Resolution("1h", 3600, 90 * 24 * 3600),
+)
+
+
+def series_key(metric: str, labels: dict[str, str]) -> str:
+    rendered = ",".join(f'{name}="{value}"' for name, value in sorted(labels.items()))
+    return f"{metric}{{{rendered}}}"
+
+
+class _Column:
+    """One resolution of one series: memory-mapped ring buffers of bucket means and sample counts.
+
+    Timestamps are implicit in the fixed step, so the only time state stored is the
+    newest bucket index; a slot's bucket is recovered as an offset from it.
+    """
+
+    def __init__(self, directory: Path, resolution: Resolution, head: np.memmap, head_index: int):
+        self.resolution = resolution
+        self._head = head
+        self._head_index = head_index
+        capacity = resolution.capacity
+        means_path = directory / f"{resolution.name}.f8"
+        counts_path = directory / f"{resolution.name}.u4"
+        fresh = not means_path.exists()
+        mode = "w+" if fresh else "r+"
+        self.means = np.memmap(means_path, dtype=np.float64, mode=mode, shape=(capacity,))
+        self.counts = np.memmap(counts_path, dtype=np.uint32, mode=mode, shape=(capacity,))
+        if fresh:
+            self.means[:] = np.nan
+
+    @property
+    def last_bucket(self) -> int:
+        return int(self._head[self._head_index])
+
+    def write(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        step, capacity = self.resolution.step_seconds, self.resolution.capacity
+        buckets = timestamps.astype(np.int64) // step
+        last = self.last_bucket
+        newest = int(buckets.max())
+
+        if newest > last:
+            # Clear the slots being recycled so stale data from a previous lap never leaks.
+            cleared = np.arange(max(last + 1, newest - capacity + 1), newest + 1) % capacity
+            self.means[cleared] = np.nan
+            self.counts[cleared] = 0
+            self._head[self._head_index] = last = newest
+
+        keep = buckets > last - capacity
+        unique, inverse = np.unique(buckets[keep], return_inverse=True)
+        sums = np.bincount(inverse, weights=values[keep])
+        added = np.bincount(inverse).astype(np.uint32)
+        slots = unique % capacity
+        held = self.counts[slots].astype(np.float64)
+        previous = np.where(held > 0, self.means[slots], 0.0)
+        self.means[slots] = (previous * held + sums) / (held + added)
+        self.counts[slots] = self.counts[slots] + added
+
+    def read(self, start: float, end: float) -> tuple[np.ndarray, np.ndarray]:
+        """Bucket start times and means in ``[start, end)``.
+
+        The values are a view onto the memory map unless the range wraps around the
+        ring, in which case the two halves are concatenated.
+        """
+        step, capacity = self.resolution.step_seconds, self.resolution.capacity
+        last = self.last_bucket
+        first = max(int(start) // step, last - capacity + 1)
+        stop = min(-(-int(end) // step), last + 1)
+        if stop <= first:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        timestamps = np.arange(first, stop, dtype=np.int64) * step
+        head, tail = first % capacity, stop % capacity
+        if head < tail or tail == 0:
+            return timestamps, self.means[head : tail or capacity]
+        return timestamps, np.concatenate([self.means[head:], self.means[:tail]])
+
+
+class _Series:
+    def __init__(self, directory: Path, resolutions: tuple[Resolution, ...]):
+        directory.mkdir(parents=True, exist_ok=True)
+        head_path = directory / "head.i8"
+        fresh = not head_path.exists()
+        head = np.memmap(head_path, dtype=np.int64, mode="w+" if fresh else "r+", shape=(len(resolutions),))
+        if fresh:
+            head[:] = np.iinfo(np.int64).min // 2
+        self.columns = {
+            resolution.name: _Column(directory, resolution, head, index)
+            for index, resolution in enumerate(resolutions)
+        }
+
+    def flush(self) -> None:
+        for column in self.columns.values():
+            column.means.flush()
+            column.counts.flush()
+        next(iter(self.columns.values()))._head.flush()
+
+
+class EvidenceStore:
+    """Embedded time-series store for evidence that agents re-read during an incident.
+
+    Each series keeps one memory-mapped ring buffer per resolution (1m, 5m and 1h by
+    default). Writes roll samples up into every resolution at once, and each ring's
+    capacity is its retention, so old buckets age out as new ones are written.
+
+    Buckets are stored as raw float64 means rather than delta- or block-compressed:
+    timestamps are already implicit in the ring position, a full day of 1m buckets is
+    11 KiB per series, and raw slots let a write update a bucket in place and let
+    :meth:`read` hand out NumPy views over the mapped file. :meth:`window` stays a
+    view only for a single series; stacking several series, whose rings have their
+    own heads and live in separate files, costs one copy of each row.
+
+    The series index is an append-only JSON-lines file, so registering a series
+    writes one line, and lookups go through a per-metric dict.
+    """
+
+    def __init__(self, root: Path, resolutions: tuple[Resolution, ...] = DEFAULT_RESOLUTIONS):
+        self.root = Path(root)
+        self.resolutions = resolutions
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / "index.jsonl"
+        self._index: dict[str, dict[str, dict[str, str]]] = {}
+        self._metric_of: dict[str, str] = {}
+        legacy = self.root / "index.json"
+        if legacy.exists():
+            for key, entry in json.loads(legacy.read_text()).items():
+                self._register(key, entry["metric"], entry["labels"])
+        if self._index_path.exists():
+            with self._index_path.open() as lines:
+                for line in lines:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._register(entry["key"], entry["metric"], entry["labels"])
+        self._open: dict[str, _Series] = {}
+
+    def append(self, metric: str, labels: dict[str, str], timestamps: np.ndarray, values: np.ndarray) -> str:
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        present = ~np.isnan(values)
+        key = series_key(metric, labels)
+        if not present.any():
+            return key
+
+        if key not in self._metric_of:
+            with self._index_path.open("a") as index:
+                index.write(json.dumps({"key": key, "metric": metric, "labels": labels}) + "\n")
+            self._register(key, metric, dict(labels))
+        for column in self._series(key).columns.values():
+            column.write(timestamps[present], values[present])
+        return key
+
+    def read(
+        self, key: str, start: float, end: float, resolution: str = "1m"
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if key not in self._metric_of:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return self._series(key).columns[resolution].read(start, end)
+
+    def latest(self, key: str, resolution: str = "1m") -> float | None:
+        """Start time of the newest bucket written for ``key``, or ``None``."""
+        if key not in self._metric_of:
+            return None
+        column = self._series(key).columns[resolution]
+        return float(column.last_bucket * column.resolution.step_seconds)
+
+    def window(self, metric: str, start: float, end: float, resolution: str = "1m", **labels: str) -> MetricWindow:
+        """Every stored series of ``metric`` matching ``labels`` over ``[start, end)``, stacked per series.
+
+        A single matching series comes back as a read-only view onto its ring unless the
+        range wraps around it; several series are copied into one matrix.
+        """
+        matches = self.find(metric, **labels)
+        rows = [self.read(key, start, end, resolution) for key, _ in matches]
+        present = [timestamps for timestamps, _ in rows if len(timestamps)]
+        if not present:
+            return MetricWindow(labels=[], timestamps=np.empty(0), values=np.empty((0, 0)))
+        if len(rows) == 1:
+            timestamps, series = rows[0]
+            values = series.view(np.ndarray)[np.newaxis]
+            values.flags.writeable = False
+            return MetricWindow(labels=[matches[0][1]], timestamps=timestamps.astype(np.float64), values=values)
+        # Each series' ring has its own head, so place every row by absolute bucket and
+        # leave buckets a series has not written (or no longer holds) as NaN.
+        step = next(item for item in self.resolutions if item.name == resolution).step_seconds
+        first = min(int(timestamps[0]) for timestamps in present) // step
+        stop = max(int(timestamps[-1]) for timestamps in present) // step + 1
+        values = np.full((len(rows), stop - first), np.nan)
+        for row, (timestamps, series) in zip(values, rows):
+            if len(timestamps):
+                offset = int(timestamps[0]) // step - first
+                row[offset : offset + len(series)] = series
+        return MetricWindow(
+            labels=[series_labels for _, series_labels in matches],
+            timestamps=np.arange(first, stop, dtype=np.float64) * step,
+            values=values,
+        )
+
+    def covers(self, metric: str, start: float, end: float, **labels: str) -> bool:
+        """Whether finest-resolution buckets for ``metric`` span ``start`` up to the bucket before ``end``."""
+        finest = self.resolutions[0]
+        matches = self.find(metric, **labels)
+        if not matches:
+            return False
+        for key, _ in matches:
+            timestamps, values = self.read(key, start, end, finest.name)
+            if (
+                not len(timestamps)
+                or timestamps[0] > start
+                or timestamps[-1] < end - finest.step_seconds
+                or np.isnan(values[0])
+            ):
+                return False
+        return True
+
+    def find(self, metric: str, **labels: str) -> list[tuple[str, dict[str, str]]]:
+        return [
+            (key, series_labels)
+            for key, series_labels in self._index.get(metric, {}).items()
+            if all(series_labels.get(name) == value for name, value in labels.items())
+        ]
+
+    def flush(self) -> None:
+        for series in self._open.values():
+            series.flush()
+
+    def _register(self, key: str, metric: str, labels: dict[str, str]) -> None:
+        self._index.setdefault(metric, {})[key] = labels
+        self._metric_of[key] = metric
+
+    def _series(self, key: str) -> _Series:
+        series = self._open.get(key)
+        if series is None:
+            digest = hashlib.sha1(key.encode()).hexdigest()
+            series = self._open[key] = _Series(self.root / digest[:2] / digest, self.resolutions)
+        return series
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = tuple[str, ...]
+Sample = tuple[Labels, float]
+
+
+class Counter:
+    __slots__ = ("name", "help", "labels", "_values")
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class Histogram:
+    """Fixed-bucket histogram; each label set keeps per-bucket counts plus a running sum."""
+
+    __slots__ = ("name", "help", "labels", "buckets", "_series")
+
+    def __init__(self, name: str, help: str, labels: Labels = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # One slot per bucket, one for +Inf, then the sum.
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series is not None else 0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in list(self._series.items()):
+            series = list(series)
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _number(bound)
+                yield f"{self.name}_bucket{_labels((*self.labels, 'le'), (*labels, le))} {_number(cumulative)}"
+            yield f"{self.name}_sum{_labels(self.labels, labels)} {_number(series[-1])}"
+            yield f"{self.name}_count{_labels(self.labels, labels)} {_number(cumulative)}"
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from ``collect`` at scrape time, costing nothing to record."""
+
+    __slots__ = ("name", "help", "labels", "kind", "collect")
+
+    def __init__(self, name: str, help: str, labels: Labels, collect: Callable[[], Iterable[Sample]], kind: str):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.kind = kind
+        self.collect = collect
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in self.collect():
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class MetricsRegistry:
+    """Named instruments rendered together in the Prometheus text exposition format.
+
+    Instruments are updated without locks. Everything on the triage path records from
+    the event loop thread, where a dict lookup and a list increment cannot interleave;
+    a scrape copies each series before reading it. Queue depths and cache counters
+    that other components already keep are exposed through callbacks instead.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | CallbackMetric] = {}
+
+    def counter(self, name: str, help: str, labels: Labels = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Labels = (), buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name: str, help: str, labels: Labels, collect: Callable[[], Iterable[Sample]]) -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, labels, collect, "gauge"))
+
+    def counter_callback(
+        self, name: str, help: str, labels: Labels, collect: Callable[[], Iterable[Sample]]
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, labels, collect, "counter"))
+
+    def render(self) -> str:
+        return "".join(f"{line}\n" for metric in self._metrics.values() for line in metric.render())
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+class SwarmMetrics:
+    """Instruments the orchestrator records while triaging."""
+
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        self.agent_seconds = self.registry.histogram(
+            "hiveops_agent_duration_seconds", "Time one agent spent investigating.", ("domain", "outcome")
+        )
+        self.triage_seconds = self.registry.histogram(
+            "hiveops_triage_duration_seconds", "End-to-end triage time of swarm investigations.", ("severity", "status")
+        )
+        self.synthesize_seconds = self.registry.histogram(
+            "hiveops_synthesize_duration_seconds", "Time spent synthesizing signals into a result."
+        )
+        self.audits = self.registry.counter(
+            "hiveops_audit_decisions_total", "Meta-layer audits between POETIQ iterations.", ("outcome",)
+        )
+
+
+def _labels(names: Labels, values: Labels) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
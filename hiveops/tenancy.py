@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from .models import OperationUsage, TenantOperation, TenantQuota, TenantQuotaConfig, TenantUsage
+
+DEFAULT_TENANT = "default"
+BURST_SECONDS = 10.0
+
+
+class QuotaExceeded(RuntimeError):
+    """A tenant exceeded its rate or concurrency quota; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class _Bucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated: float
+
+    def take(self, now: float) -> float:
+        """Spend one token; returns 0 on success or the seconds until one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+
+class TenantGovernor:
+    """Per-tenant quotas and usage counters for the swarm's shared capacity.
+
+    Each tenant and operation gets a token bucket refilled at ``rate_per_minute`` that
+    holds ``BURST_SECONDS`` worth of requests, and a cap on requests in flight.
+    Tenants without their own entry share the ``default`` quota values but are
+    counted separately. Triage does not reject at the concurrency cap: the
+    :class:`~hiveops.scheduler.TriageScheduler` queues the excess and uses
+    :meth:`weight` and :meth:`concurrency` to share contended slots fairly.
+    """
+
+    def __init__(self, config: TenantQuotaConfig | None = None, clock: Callable[[], float] = time.monotonic):
+        self.config = config or TenantQuotaConfig()
+        self._clock = clock
+        self._buckets: dict[tuple[str, TenantOperation], _Bucket] = {}
+        self._usage: dict[str, dict[TenantOperation, OperationUsage]] = {}
+
+    @classmethod
+    def from_file(cls, path: Path) -> TenantGovernor:
+        return cls(TenantQuotaConfig.model_validate_json(path.read_text()))
+
+    def quota(self, tenant: str) -> TenantQuota:
+        return self.config.tenants.get(tenant, self.config.default)
+
+    def weight(self, tenant: str) -> float:
+        return self.quota(tenant).weight
+
+    def concurrency(self, tenant: str, operation: TenantOperation) -> int:
+        return self._limit(tenant, operation, "concurrency")
+
+    @contextmanager
+    def track(self, tenant: str, operation: TenantOperation) -> Iterator[None]:
+        """Admit one ``operation`` for ``tenant`` or raise :class:`QuotaExceeded`, counting its usage."""
+        usage = self._counters(tenant)[operation]
+        usage.requests += 1
+        now = self._clock()
+        wait = self._bucket(tenant, operation, now).take(now)
+        if wait:
+            usage.throttled += 1
+            raise QuotaExceeded(f"tenant {tenant!r} exceeded its {operation.value} rate quota", wait)
+        if operation is not TenantOperation.triage and usage.running >= self.concurrency(tenant, operation):
+            usage.rejected += 1
+            raise QuotaExceeded(f"tenant {tenant!r} exceeded its {operation.value} concurrency quota", 1.0)
+        usage.running += 1
+        try:
+            yield
+        except BaseException:
+            usage.failed += 1
+            raise
+        else:
+            usage.completed += 1
+        finally:
+            usage.running -= 1
+            usage.busy_seconds += self._clock() - now
+
+    def usage(self) -> list[TenantUsage]:
+        return [
+            TenantUsage(
+                tenant=tenant,
+                weight=self.weight(tenant),
+                operations={
+                    operation: counters.model_copy(update={"busy_seconds": round(counters.busy_seconds, 4)})
+                    for operation, counters in operations.items()
+                },
+            )
+            for tenant, operations in sorted(self._usage.items())
+        ]
+
+    def _counters(self, tenant: str) -> dict[TenantOperation, OperationUsage]:
+        counters = self._usage.get(tenant)
+        if counters is None:
+            counters = self._usage[tenant] = {operation: OperationUsage() for operation in TenantOperation}
+        return counters
+
+    def _bucket(self, tenant: str, operation: TenantOperation, now: float) -> _Bucket:
+        bucket = self._buckets.get((tenant, operation))
+        if bucket is None:
+            rate = self._limit(tenant, operation, "rate_per_minute") / 60.0
+            capacity = max(1.0, rate * BURST_SECONDS)
+            bucket = self._buckets[(tenant, operation)] = _Bucket(rate, capacity, capacity, now)
+        return bucket
+
+    def _limit(self, tenant: str, operation: TenantOperation, name: str):
+        for quota in (self.quota(tenant), self.config.default, TenantQuota()):
+            limits = getattr(quota, name)
+            if operation in limits:
+                return limits[operation]
+        raise KeyError(operation)
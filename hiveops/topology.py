@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+
+class ServiceGraph:
+    """Service dependency graph with precomputed transitive reachability.
+
+    ``dependencies`` maps each service to the services it calls. Reachability is
+    closed once at construction into one bitset (a Python ``int``) per service in
+    each direction, so dependency and blast-radius lookups are a bit test or a walk
+    over the set bits, independent of graph depth. Cycles are collapsed via
+    strongly connected components before the closure is propagated.
+    """
+
+    def __init__(self, dependencies: Mapping[str, Iterable[str]]):
+        edges = {service: sorted(set(targets)) for service, targets in dependencies.items()}
+        self.services = sorted(set(edges) | {target for targets in edges.values() for target in targets})
+        self._index = {service: position for position, service in enumerate(self.services)}
+        calls: list[list[int]] = [[] for _ in self.services]
+        callers: list[list[int]] = [[] for _ in self.services]
+        for service, targets in edges.items():
+            for target in targets:
+                calls[self._index[service]].append(self._index[target])
+                callers[self._index[target]].append(self._index[service])
+        self._direct = [_mask(targets) for targets in calls]
+        self._downstream = _closure(calls)
+        self._upstream = _closure(callers)
+
+    def __contains__(self, service: object) -> bool:
+        return service in self._index
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    @classmethod
+    def from_file(cls, path: Path) -> ServiceGraph:
+        """Load ``{"services": {"<name>": {"depends_on": [...]}}}``."""
+        return cls.from_document(json.loads(Path(path).read_text()))
+
+    @classmethod
+    def from_document(cls, document: Mapping[str, Any]) -> ServiceGraph:
+        return cls(
+            {service: spec.get("depends_on", []) for service, spec in document.get("services", {}).items()}
+        )
+
+    def depends_on(self, service: str, dependency: str) -> bool:
+        """Whether ``service`` calls ``dependency`` directly or transitively."""
+        if service not in self._index or dependency not in self._index:
+            return False
+        return bool(self._downstream[self._index[service]] >> self._index[dependency] & 1)
+
+    def direct_dependencies(self, service: str) -> list[str]:
+        return self._names(self._direct, service)
+
+    def dependencies(self, service: str) -> list[str]:
+        """Everything ``service`` transitively calls: where its root cause may live."""
+        return self._names(self._downstream, service)
+
+    def blast_radius(self, service: str) -> list[str]:
+        """Everything that transitively calls ``service`` and may be impacted by it."""
+        return self._names(self._upstream, service)
+
+    def blast_radius_size(self, service: str) -> int:
+        position = self._index.get(service)
+        return 0 if position is None else self._upstream[position].bit_count()
+
+    def root_cause_candidates(self, service: str, limit: int = 16) -> list[str]:
+        """Direct dependencies first, then deeper ones, capped at ``limit``."""
+        direct = self.direct_dependencies(service)
+        seen = set(direct)
+        return (direct + [name for name in self.dependencies(service) if name not in seen])[:limit]
+
+    def _names(self, bitsets: list[int], service: str) -> list[str]:
+        position = self._index.get(service)
+        if position is None:
+            return []
+        names = []
+        remaining = bitsets[position]
+        while remaining:
+            lowest = remaining & -remaining
+            names.append(self.services[lowest.bit_length() - 1])
+            remaining ^= lowest
+        return names
+
+
+def _mask(positions: Iterable[int]) -> int:
+    mask = 0
+    for position in positions:
+        mask |= 1 << position
+    return mask
+
+
+def _closure(adjacency: list[list[int]]) -> list[int]:
+    """Reachability bitset per node, excluding the node itself.
+
+    Iterative Tarjan: components are completed in reverse topological order, so every
+    successor outside the current component already has its closure when needed.
+    """
+    count = len(adjacency)
+    order = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    stack: list[int] = []
+    closure = [0] * count
+    counter = 0
+
+    for root in range(count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, cursor = work[-1]
+            if cursor < len(adjacency[node]):
+                work[-1] = (node, cursor + 1)
+                successor = adjacency[node][cursor]
+                if order[successor] == -1:
+                    order[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, 0))
+                elif on_stack[successor]:
+                    low[node] = min(low[node], order[successor])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] != order[node]:
+                continue
+
+            members = []
+            while True:
+                member = stack.pop()
+                on_stack[member] = False
+                members.append(member)
+                if member == node:
+                    break
+            reach = 0
+            for member in members:
+                for successor in adjacency[member]:
+                    reach |= (1 << successor) | closure[successor]
+            if len(members) > 1:
+                reach |= _mask(members)
+            for member in members:
+                closure[member] = reach & ~(1 << member)
+    return closure
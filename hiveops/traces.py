@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+NANOS = 1_000_000_000
+
+
+@dataclass(slots=True)
+class HopStat:
+    """One ``service`` / ``operation`` pair's share of the critical path across traces."""
+
+    service: str
+    operation: str
+    calls: int
+    critical_share: float
+    critical_ms: float
+    self_ms: float
+    baseline_critical_ms: float | None = None
+
+    @property
+    def regression(self) -> float | None:
+        if self.baseline_critical_ms is None:
+            return None
+        return self.critical_ms / max(self.baseline_critical_ms, 1e-3)
+
+
+@dataclass(slots=True)
+class TraceReport:
+    traces: int = 0
+    spans: int = 0
+    window_traces: int = 0
+    baseline_traces: int = 0
+    p95_ms: float = 0.0
+    hops: list[HopStat] = field(default_factory=list)
+
+    @property
+    def slow_hop(self) -> HopStat | None:
+        """The hop whose critical-path time grew most against baseline, else the largest one."""
+        regressed = [hop for hop in self.hops if hop.baseline_critical_ms is not None]
+        if regressed:
+            return max(regressed, key=lambda hop: hop.critical_ms - hop.baseline_critical_ms)
+        return self.hops[0] if self.hops else None
+
+
+class SpanTable:
+    """Spans from many traces in columnar form, grouped by trace and ordered by start.
+
+    ``parent`` holds row indexes (``-1`` for roots and for spans whose parent was not
+    sampled), so trace trees are rebuilt once at load and every aggregate is a NumPy
+    reduction over the columns.
+    """
+
+    def __init__(
+        self,
+        trace: np.ndarray,
+        parent: np.ndarray,
+        hop: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        hops: list[tuple[str, str]],
+    ):
+        self.trace = trace
+        self.parent = parent
+        self.hop = hop
+        self.start = start
+        self.end = end
+        self.hops = hops
+
+    def __len__(self) -> int:
+        return len(self.trace)
+
+    @classmethod
+    def from_otlp(cls, documents: Iterable[Mapping[str, Any]]) -> SpanTable:
+        """Build from OTLP-JSON ``ExportTraceServiceRequest`` documents."""
+        trace_ids: list[str] = []
+        span_ids: list[str] = []
+        parent_ids: list[str] = []
+        hop_codes: list[int] = []
+        starts: list[int] = []
+        ends: list[int] = []
+        hops: dict[tuple[str, str], int] = {}
+        for document in documents:
+            for resource_spans in document.get("resourceSpans", []):
+                service = _service_name(resource_spans.get("resource", {}))
+                scopes = resource_spans.get("scopeSpans") or resource_spans.get("instrumentationLibrarySpans", [])
+                for scope in scopes:
+                    for span in scope.get("spans", []):
+                        trace_ids.append(span["traceId"])
+                        span_ids.append(span["spanId"])
+                        parent_ids.append(span.get("parentSpanId") or "")
+                        hop_codes.append(hops.setdefault((service, span.get("name", "")), len(hops)))
+                        starts.append(int(span["startTimeUnixNano"]))
+                        ends.append(int(span["endTimeUnixNano"]))
+
+        _, trace = np.unique(np.asarray(trace_ids, dtype=str), return_inverse=True) if trace_ids else (None, [])
+        trace = np.asarray(trace, dtype=np.int64)
+        start = np.asarray(starts, dtype=np.int64)
+        end = np.maximum(np.asarray(ends, dtype=np.int64), start)
+        rows = {key: row for row, key in enumerate(zip(trace_ids, span_ids))}
+        parent = np.fromiter(
+            (rows.get((trace_id, parent_id), -1) for trace_id, parent_id in zip(trace_ids, parent_ids)),
+            dtype=np.int64,
+            count=len(trace_ids),
+        )
+
+        order = np.lexsort((start, trace))
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        parent = parent[order]
+        parent[parent >= 0] = position[parent[parent >= 0]]
+        return cls(
+            trace[order],
+            parent,
+            np.asarray(hop_codes, dtype=np.int64)[order],
+            start[order],
+            end[order],
+            list(hops),
+        )
+
+    @classmethod
+    def from_files(cls, paths: Iterable[Path]) -> SpanTable:
+        """Load ``.json`` exports or ``.jsonl`` files of one export per line, optionally gzipped."""
+        return cls.from_otlp(read_documents(paths))
+
+    def self_time(self) -> np.ndarray:
+        """Nanoseconds each span spent outside its children, clipped to the parent's own interval."""
+        duration = self.end - self.start
+        child = np.flatnonzero(self.parent >= 0)
+        parent = self.parent[child]
+        overlap = np.minimum(self.end[child], self.end[parent]) - np.maximum(self.start[child], self.start[parent])
+        busy = np.bincount(parent, weights=np.maximum(overlap, 0), minlength=len(self))
+        return np.maximum(duration - busy, 0)
+
+    def critical_time(self) -> np.ndarray:
+        """Nanoseconds each span contributes to its trace's critical path.
+
+        Walking back from a span's end, the child finishing last before the cursor is
+        on the path; the gap after it is the parent's own time, and the cursor moves to
+        that child's start. Contributions within a trace sum to the root's duration.
+        """
+        count = len(self)
+        critical = np.zeros(count, dtype=np.int64)
+        if not count:
+            return critical
+        has_parent = self.parent >= 0
+        children = np.flatnonzero(has_parent)
+        children = children[np.lexsort((-self.end[children], self.parent[children]))]
+        bounds = np.searchsorted(self.parent[children], np.arange(count + 1)).tolist()
+        children = children.tolist()
+        start, end = self.start.tolist(), self.end.tolist()
+        totals = critical.tolist()
+
+        for root in np.flatnonzero(~has_parent).tolist():
+            stack = [(root, end[root])]
+            while stack:
+                span, limit = stack.pop()
+                floor = start[span]
+                cursor = min(end[span], limit)
+                for child in children[bounds[span] : bounds[span + 1]]:
+                    if cursor <= floor:
+                        break
+                    if start[child] >= cursor:
+                        continue
+                    child_end = min(end[child], cursor)
+                    totals[span] += cursor - child_end
+                    stack.append((child, child_end))
+                    cursor = max(start[child], floor)
+                totals[span] += max(cursor - floor, 0)
+        return np.asarray(totals, dtype=np.int64)
+
+    def analyze(
+        self, start: datetime | None = None, end: datetime | None = None, limit: int = 5
+    ) -> TraceReport:
+        """Aggregate critical-path and self time per hop for traces rooted in ``[start, end]``.
+
+        Traces rooted before ``start`` form a per-trace baseline for each hop.
+        """
+        report = TraceReport(traces=int(self.trace.max()) + 1 if len(self) else 0, spans=len(self))
+        if not len(self):
+            return report
+        roots = np.flatnonzero(self.parent < 0)
+        # Orphaned spans are roots too; the earliest root stands for the trace's start.
+        trace_start = np.full(report.traces, np.iinfo(np.int64).max)
+        np.minimum.at(trace_start, self.trace[roots], self.start[roots])
+        lower = -np.inf if start is None else start.timestamp() * NANOS
+        upper = np.inf if end is None else end.timestamp() * NANOS
+        in_window = (trace_start >= lower) & (trace_start <= upper)
+        baseline = trace_start < lower
+        report.window_traces = int(in_window.sum())
+        report.baseline_traces = int(baseline.sum())
+        if not report.window_traces:
+            return report
+
+        critical = self.critical_time()
+        self_time = self.self_time()
+        span_window = in_window[self.trace]
+        hop_count = len(self.hops)
+        critical_ns = np.bincount(self.hop[span_window], weights=critical[span_window], minlength=hop_count)
+        self_ns = np.bincount(self.hop[span_window], weights=self_time[span_window], minlength=hop_count)
+        calls = np.bincount(self.hop[span_window], minlength=hop_count)
+        trace_end = np.zeros(report.traces, dtype=np.int64)
+        np.maximum.at(trace_end, self.trace[roots], self.end[roots])
+        durations = (trace_end - trace_start)[in_window]
+        report.p95_ms = round(float(np.percentile(durations, 95)) / 1e6, 2)
+
+        baseline_ns = None
+        if report.baseline_traces:
+            span_baseline = baseline[self.trace]
+            baseline_ns = np.bincount(self.hop[span_baseline], weights=critical[span_baseline], minlength=hop_count)
+
+        total = max(float(critical_ns.sum()), 1.0)
+        for code in np.argsort(-critical_ns)[:limit].tolist():
+            if not calls[code]:
+                break
+            service, operation = self.hops[code]
+            report.hops.append(
+                HopStat(
+                    service=service,
+                    operation=operation,
+                    calls=int(calls[code]),
+                    critical_share=round(float(critical_ns[code]) / total, 3),
+                    critical_ms=round(float(critical_ns[code]) / report.window_traces / 1e6, 2),
+                    self_ms=round(float(self_ns[code] / calls[code]) / 1e6, 2),
+                    baseline_critical_ms=(
+                        None
+                        if baseline_ns is None
+                        else round(float(baseline_ns[code]) / report.baseline_traces / 1e6, 2)
+                    ),
+                )
+            )
+        return report
+
+
+def _service_name(resource: Mapping[str, Any]) -> str:
+    for attribute in resource.get("attributes", []):
+        if attribute.get("key") == "service.name":
+            return str(attribute.get("value", {}).get("stringValue", "unknown"))
+    return "unknown"
+
+
+def read_documents(paths: Iterable[Path]) -> Iterator[dict[str, Any]]:
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as stream:
+            if ".jsonl" in path.suffixes:
+                yield from (json.loads(line) for line in stream if line.strip())
+            else:
+                yield json.load(stream)
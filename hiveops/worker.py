@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+from .agents import EvidenceSources
+from .broker import AgentWorker, SqliteBroker
+from .changes import ChangeIndex
+from .connectors import ConnectorRuntime
+from .executors import AgentExecutor
+from .models import AgentDomain
+from .spend import SpendMonitor
+from .store import EvidenceStore
+
+
+def sources_from_env(environ: Mapping[str, str] = os.environ) -> EvidenceSources:
+    """Evidence sources configured by the same ``HIVEOPS_*`` variables the API reads.
+
+    The spend monitor is loaded from ``HIVEOPS_SPEND_STATE`` as a read-only snapshot;
+    the API process owns ingestion and writes the state back.
+    """
+
+    def path(name: str) -> Path | None:
+        return Path(environ[name]) if environ.get(name) else None
+
+    changes = path("HIVEOPS_CHANGES_DB")
+    store = path("HIVEOPS_EVIDENCE_STORE")
+    spend_state = path("HIVEOPS_SPEND_STATE")
+    return EvidenceSources(
+        connectors=ConnectorRuntime.from_env(environ),
+        store=EvidenceStore(store) if store is not None else None,
+        changes=ChangeIndex.from_database(changes) if changes is not None else None,
+        security_logs=path("HIVEOPS_SECURITY_LOGS"),
+        app_logs=path("HIVEOPS_APP_LOGS"),
+        traces=path("HIVEOPS_TRACES"),
+        spend=(
+            SpendMonitor.from_dict(json.loads(spend_state.read_text()))
+            if spend_state is not None and spend_state.is_file()
+            else SpendMonitor()
+        ),
+    )
+
+
+async def _serve(worker: AgentWorker, sources: EvidenceSources) -> None:
+    try:
+        await worker.run()
+    finally:
+        if sources.connectors is not None:
+            await sources.connectors.aclose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run an agent worker against a shared broker database until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m hiveops.worker", description=main.__doc__)
+    parser.add_argument("database", type=Path, help="broker SQLite file shared with the API")
+    parser.add_argument("--domain", action="append", type=AgentDomain, help="domain to serve; repeatable, default all")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--worker-id")
+    args = parser.parse_args(argv)
+
+    sources = sources_from_env()
+    broker = SqliteBroker(args.database)
+    worker = AgentWorker(
+        broker,
+        args.domain or tuple(AgentDomain),
+        sources,
+        executor=AgentExecutor.from_env(),
+        worker_id=args.worker_id,
+        concurrency=args.concurrency,
+    )
+    try:
+        asyncio.run(_serve(worker, sources))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.executor.shutdown(wait=False)
+        broker.close()
+
+
+if __name__ == "__main__":
+    main()
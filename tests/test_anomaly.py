@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hiveops.agents import EvidenceSources, MicroAgent
+from hiveops.anomaly import AnomalyAnalyzer, MetricWindow
+from hiveops.models import AgentDomain, IncidentRequest
+
+FIXTURES = Path(__file__).resolve().parent.parent / "hiveops" / "fixtures" / "metrics"
+
+
+def _noise(series, samples, seed=7):
+    return 0.2 + 0.01 * np.random.default_rng(seed).standard_normal((series, samples))
+
+
+def test_level_shift_is_found_across_thousands_of_series():
+    latency = _noise(5000, 60)
+    latency[1234, 40:] += 0.25
+
+    report = AnomalyAnalyzer().analyze(latency=latency)
+
+    assert report.series == 5000
+    assert report.change_point_series >= 1
+    assert report.dominant == "latency"
+    assert report.score == 1.0
+    _, statistic = AnomalyAnalyzer().change_points(latency)
+    assert statistic.argmax() == 1234
+
+
+def test_recent_spike_raises_rolling_zscore():
+    latency = _noise(10, 30)
+    latency[3, -2:] += 0.5
+
+    report = AnomalyAnalyzer().analyze(latency=latency)
+
+    assert report.anomalous_series == 1
+    assert report.worst_series == 3
+
+
+def test_burn_rate_uses_the_lesser_of_short_and_long_windows():
+    errors = np.full((2, 20), 0.0005)
+    errors[0, -3:] = 0.05
+    errors[1, :] = 0.02
+
+    burn = AnomalyAnalyzer(slo_target=0.999).burn_rates(errors)
+
+    assert burn[0] == pytest.approx(errors[0].mean() / 0.001)
+    assert burn[1] == pytest.approx(20.0)
+
+
+def test_quiet_series_score_low():
+    report = AnomalyAnalyzer().analyze(latency=_noise(200, 60), errors=np.full((200, 60), 0.0002))
+
+    assert report.score < 0.3
+
+
+def test_matrix_alignment_fills_missing_samples_with_nan():
+    window = MetricWindow.from_matrix(
+        [
+            {"metric": {"instance": "a"}, "values": [[0, "1"], [60, "2"]]},
+            {"metric": {"instance": "b"}, "values": [[60, "5"]]},
+        ]
+    )
+
+    assert window.labels == [{"instance": "a"}, {"instance": "b"}]
+    assert np.array_equal(window.timestamps, [0, 60])
+    assert np.isnan(window.values[1, 0]) and window.values[1, 1] == 5
+
+
+@pytest.mark.asyncio
+async def test_metrics_agent_confidence_comes_from_fixture_windows():
+    agent = MicroAgent(AgentDomain.metrics)
+    request = IncidentRequest(incident_id="INC-811", service="checkout-api", symptom="error rate increase")
+
+    signal = await agent.investigate(request, sources=EvidenceSources(metric_windows=FIXTURES))
+
+    assert signal.finding.startswith("P95 latency regression detected for checkout-api")
+    assert signal.confidence > 0.9
+    assert signal.evidence[0].startswith("fixture:checkout-api.json latency series=3")
@@ -1,3 +1,5 @@
+import json
+
 from fastapi.testclient import TestClient
 
 from hiveops.api import app
@@ -70,6 +72,25 @@ def test_triage_endpoint():
     assert isinstance(payload['audit_recommendations'], list)
 
 
+def test_triage_stream_endpoint():
+    response = client.post(
+        '/incidents/triage/stream',
+        json={
+            'incident_id': 'INC-778',
+            'service': 'payments-api',
+            'symptom': 'latency spike',
+            'severity': 'medium',
+            'environment': 'prod',
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert len({event['signal']['domain'] for event in events if event['event'] == 'signal'}) == 5
+    assert events[-1]['event'] == 'result'
+    assert events[-1]['result']['incident_id'] == 'INC-778'
+
+
 def test_iac_generate_endpoint():
     response = client.post(
         '/iac/generate',
@@ -91,3 +112,116 @@ def test_pipelines_evolve_endpoint():
     payload = response.json()
     assert payload['generation'] == 12
     assert payload['composite_fitness'] > 0
+
+
+def test_triage_batch_endpoint_streams_results_and_reports_bad_lines():
+    incidents = [
+        {'incident_id': f'INC-9{index:02d}', 'service': 'payments-api', 'symptom': 'latency spike'}
+        for index in range(20)
+    ]
+    body = '\n'.join(json.dumps(incident) for incident in incidents) + '\n{"service": "x"}\n'
+    response = client.post(
+        '/incidents/triage/batch?concurrency=4',
+        content=body,
+        headers={'content-type': 'application/x-ndjson'},
+    )
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    results = [record for record in records if 'incident_id' in record]
+    errors = [record for record in records if 'error' in record]
+    assert sorted(result['incident_id'] for result in results) == sorted(i['incident_id'] for i in incidents)
+    assert [error['line'] for error in errors] == [21]
+
+
+def test_correlate_endpoint_groups_related_incidents():
+    incidents = [
+        {'incident_id': f'INC-5{index:02d}', 'service': service, 'symptom': 'pod crashloop after rollout 17'}
+        for index, service in enumerate(['orders-api', 'orders-api', 'orders-worker'])
+    ]
+    response = client.post('/incidents/correlate', json=incidents)
+    assert response.status_code == 200
+    payload = response.json()
+    assert len(payload['clusters']) == 1
+    assert payload['clusters'][0]['services'] == ['orders-api', 'orders-worker']
+    assert {result['cluster_id'] for result in payload['results']} == {payload['clusters'][0]['cluster_id']}
+
+    clusters = client.get('/incidents/clusters').json()
+    assert payload['clusters'][0]['cluster_id'] in {cluster['cluster_id'] for cluster in clusters}
+
+
+def test_topology_endpoints_report_dependencies_and_blast_radius():
+    from hiveops.api import orchestrator
+
+    try:
+        loaded = client.put(
+            "/topology",
+            json={
+                "services": {
+                    "web-frontend": {"depends_on": ["checkout-api"]},
+                    "checkout-api": {"depends_on": ["payments-api"]},
+                }
+            },
+        )
+        response = client.get("/topology/checkout-api")
+    finally:
+        orchestrator.topology = None
+
+    assert loaded.status_code == 200
+    assert response.json() == {
+        "service": "checkout-api",
+        "direct_dependencies": ["payments-api"],
+        "dependencies": ["payments-api"],
+        "blast_radius": ["web-frontend"],
+    }
+
+
+def test_tenant_header_scopes_quotas_and_usage():
+    response = client.post('/pipelines/evolve', json={'generation': 3}, headers={'X-Tenant-ID': 'team-api'})
+    assert response.status_code == 200
+
+    usage = {entry['tenant']: entry for entry in client.get('/tenants/usage').json()}
+    assert usage['team-api']['operations']['evolve']['completed'] == 1
+    assert usage['team-api']['operations']['triage']['requests'] == 0
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    client.post('/incidents/triage', json={'incident_id': 'INC-metrics', 'service': 'checkout-api', 'symptom': 'slow'})
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'hiveops_triage_duration_seconds_count{severity="medium"' in response.text
+    assert 'hiveops_triage_queue_depth{severity="critical"} 0' in response.text
+    assert 'hiveops_triage_cache_lookups_total{outcome="miss"}' in response.text
+
+
+def test_batch_stream_and_correlate_are_scoped_to_the_tenant_quota():
+    from hiveops.api import tenants
+    from hiveops.models import TenantOperation, TenantQuota
+
+    tenants.config.tenants['storm-team'] = TenantQuota(rate_per_minute={TenantOperation.triage: 12.0})
+    headers = {'X-Tenant-ID': 'storm-team'}
+    body = '\n'.join(
+        json.dumps({'incident_id': f'INC-S{index}', 'service': 'search-api', 'symptom': 'latency spike'})
+        for index in range(3)
+    )
+    try:
+        batch = client.post(
+            '/incidents/triage/batch?concurrency=1',
+            content=body,
+            headers={**headers, 'content-type': 'application/x-ndjson'},
+        )
+        stream = client.post('/incidents/triage/stream', json=json.loads(body.splitlines()[0]), headers=headers)
+        correlate = client.post('/incidents/correlate', json=[json.loads(body.splitlines()[0])], headers=headers)
+    finally:
+        del tenants.config.tenants['storm-team']
+
+    records = [json.loads(line) for line in batch.text.splitlines()]
+    assert sum('error' in record for record in records) == 1
+    assert stream.status_code == 429 and correlate.status_code == 429
+    usage = {entry['tenant']: entry for entry in client.get('/tenants/usage').json()}
+    assert usage['storm-team']['operations']['triage']['requests'] == 5
+    assert usage['storm-team']['operations']['triage']['throttled'] == 3
+    own = {cluster['cluster_id'] for cluster in client.get('/incidents/clusters', headers=headers).json()}
+    assert len(own) == 1 and not own & {cluster['cluster_id'] for cluster in client.get('/incidents/clusters').json()}
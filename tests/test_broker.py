@@ -0,0 +1,127 @@
+import asyncio
+import json
+import subprocess
+import sys
+
+import pytest
+
+from hiveops.agents import DEFAULT_SWARM
+from hiveops.broker import AgentWorker, BrokerError, SqliteBroker, distributed_swarm
+from hiveops.models import AgentDomain, IncidentRequest, Severity, Signal
+from hiveops.orchestrator import SwarmOrchestrator
+from hiveops.spend import SpendMonitor
+from hiveops.worker import sources_from_env
+
+INCIDENT = IncidentRequest(incident_id="INC-510", service="checkout-api", symptom="p95 latency spike after deploy")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_leases_by_severity_expire_retry_and_die(tmp_path):
+    clock = Clock()
+    broker = SqliteBroker(tmp_path / "broker.db", lease_seconds=10, max_attempts=2, clock=clock)
+    low = broker.publish(AgentDomain.metrics, INCIDENT.model_copy(update={"severity": Severity.low}))
+    critical = broker.publish(AgentDomain.metrics, INCIDENT.model_copy(update={"severity": Severity.critical}))
+
+    first = broker.lease("a", [AgentDomain.metrics])
+    assert [unit.task_id for unit in first] == [critical]
+    assert broker.lease("b", [AgentDomain.logs]) == []
+
+    clock.now += 11  # worker "a" died without a heartbeat
+    retried = broker.lease("b", [AgentDomain.metrics], limit=2)
+    assert [(unit.task_id, unit.attempts) for unit in retried] == [(critical, 2), (low, 1)]
+    assert not broker.complete(critical, "a", Signal(domain=AgentDomain.metrics, finding="late", confidence=0.5))
+
+    broker.fail(critical, "b", "RuntimeError: boom")
+    with pytest.raises(BrokerError, match="boom"):
+        broker.result(critical)
+    assert broker.complete(low, "b", Signal(domain=AgentDomain.metrics, finding="ok", confidence=0.5))
+    assert broker.result(low).finding == "ok"
+    broker.acknowledge(low)
+    assert broker.depth() == {"dead": 1}
+
+
+@pytest.mark.asyncio
+async def test_distributed_swarm_matches_local_and_drains_the_queue(tmp_path):
+    broker = SqliteBroker(tmp_path / "broker.db")
+    stop = asyncio.Event()
+    workers = [AgentWorker(broker, worker_id=f"node-{index}", poll_seconds=0.005) for index in range(2)]
+    running = [asyncio.create_task(worker.run(stop)) for worker in workers]
+    while len(broker.live_workers()) < 2:
+        await asyncio.sleep(0.005)
+
+    remote = await SwarmOrchestrator(agents=distributed_swarm(broker)).triage(INCIDENT)
+    local = await SwarmOrchestrator().triage(INCIDENT)
+    stop.set()
+    await asyncio.gather(*running)
+
+    assert remote.signals == local.signals
+    assert broker.depth() == {} and broker.live_workers() == []
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_agents_without_live_workers(tmp_path):
+    broker = SqliteBroker(tmp_path / "broker.db")
+
+    result = await SwarmOrchestrator(agents=distributed_swarm(broker)).triage(INCIDENT)
+
+    assert {signal.domain for signal in result.signals} == {agent.domain for agent in DEFAULT_SWARM}
+    assert broker.depth() == {}
+
+
+@pytest.mark.asyncio
+async def test_investigates_locally_once_the_last_worker_for_the_domain_is_gone(tmp_path):
+    clock = Clock()
+    broker = SqliteBroker(tmp_path / "broker.db", lease_seconds=10, clock=clock)
+    broker.heartbeat("ghost", [AgentDomain.metrics])
+    agents = distributed_swarm(broker, [agent for agent in DEFAULT_SWARM if agent.domain is AgentDomain.metrics])
+
+    triage = asyncio.create_task(SwarmOrchestrator(agents=agents).triage(INCIDENT))
+    while not broker.depth():
+        await asyncio.sleep(0.005)
+    clock.now += 11  # the worker died without ever leasing the task
+    result = await asyncio.wait_for(triage, timeout=5)
+
+    assert [signal.domain for signal in result.signals] == [AgentDomain.metrics]
+    assert broker.depth() == {}
+
+
+def test_worker_sources_match_the_api_configuration(tmp_path):
+    monitor = SpendMonitor()
+    monitor.observe("checkout-api", "sku-1", 3600.0, 2.0)
+    state = tmp_path / "spend.json"
+    state.write_text(json.dumps(monitor.to_dict()))
+
+    sources = sources_from_env(
+        {"HIVEOPS_PROMETHEUS_URL": "http://prometheus:9090", "HIVEOPS_SPEND_STATE": str(state)}
+    )
+
+    assert sources.connectors.prometheus is not None and sources.connectors.github is None
+    assert sources.spend.tracked(["checkout-api"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_process_serves_the_orchestrator(tmp_path):
+    path = tmp_path / "broker.db"
+    broker = SqliteBroker(path)
+    process = subprocess.Popen([sys.executable, "-m", "hiveops.worker", str(path), "--worker-id", "node-x"])
+    try:
+        for _ in range(500):
+            if broker.live_workers(AgentDomain.metrics):
+                break
+            await asyncio.sleep(0.02)
+        agents = distributed_swarm(broker, [agent for agent in DEFAULT_SWARM if agent.domain is AgentDomain.metrics])
+
+        result = await asyncio.wait_for(SwarmOrchestrator(agents=agents).triage(INCIDENT), timeout=10)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    assert broker.live_workers() == ["node-x"] and broker.depth() == {}
+    assert [signal.domain for signal in result.signals] == [AgentDomain.metrics]
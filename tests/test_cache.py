@@ -0,0 +1,46 @@
+import pytest
+
+from hiveops.cache import TriageCache, fingerprint
+from hiveops.models import IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+
+
+def _incident(incident_id: str, symptom: str = "P95 latency 1200ms on checkout") -> IncidentRequest:
+    return IncidentRequest(incident_id=incident_id, service="checkout-api", symptom=symptom, severity="high")
+
+
+def test_fingerprint_ignores_incident_id_case_and_reported_values():
+    assert fingerprint(_incident("INC-1")) == fingerprint(_incident("INC-2", "p95 latency  1350ms on Checkout!"))
+    assert fingerprint(_incident("INC-1")) != fingerprint(_incident("INC-1", "error rate spike"))
+
+
+@pytest.mark.asyncio
+async def test_cached_result_is_restamped_for_new_incident():
+    cache = TriageCache()
+    orchestrator = SwarmOrchestrator(cache=cache)
+
+    first = await orchestrator.triage(_incident("INC-1"))
+    second = await orchestrator.triage(_incident("INC-2"))
+
+    assert second.incident_id == "INC-2"
+    assert second.generated_at >= first.generated_at
+    assert second.signals == first.signals
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_and_expired_entries():
+    now = [0.0]
+    cache = TriageCache(max_entries=2, ttl_seconds=10.0, clock=lambda: now[0])
+    orchestrator = SwarmOrchestrator()
+    for symptom in ("latency", "deploy", "breach"):
+        incident = _incident("INC-1", symptom)
+        cache.put(incident, await orchestrator.triage(incident))
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert cache.get(_incident("INC-2", "latency")) is None
+
+    now[0] = 11.0
+    assert cache.get(_incident("INC-3", "breach")) is None
+    assert cache.stats.expirations == 1
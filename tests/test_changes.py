@@ -0,0 +1,98 @@
+import random
+import shutil
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from hiveops.agents import EvidenceSources, MicroAgent
+from hiveops.changes import ChangeEvent, ChangeIndex
+from hiveops.models import AgentDomain, IncidentRequest
+
+BACKEND_DB = Path(__file__).resolve().parent.parent / "backend" / "hiveops.db"
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _event(service, start_minutes, duration_minutes, kind="pipeline", ref="abc"):
+    started = EPOCH + timedelta(minutes=start_minutes)
+    return ChangeEvent(service, kind, ref, started, started + timedelta(minutes=duration_minutes))
+
+
+def test_overlap_queries_match_a_linear_scan():
+    rng = random.Random(3)
+    events = [
+        _event("checkout-api", rng.uniform(0, 100_000), rng.choice([0, 5, 90, 2000]), ref=str(i))
+        for i in range(3000)
+    ]
+    index = ChangeIndex(events[:1000])
+    for event in events[1000:]:
+        index.add(event)
+
+    for _ in range(50):
+        start = EPOCH + timedelta(minutes=rng.uniform(0, 100_000))
+        end = start + timedelta(minutes=rng.uniform(0, 600))
+        expected = {event.ref for event in events if event.started_at <= end and event.ended_at >= start}
+        assert {event.ref for event in index.overlapping("checkout-api", start, end)} == expected
+
+
+def test_dependencies_are_queried_together():
+    index = ChangeIndex([_event("checkout-api", 10, 0, "commit", "a"), _event("payments-api", 15, 30, ref="b")])
+
+    found = index.overlapping(
+        ["checkout-api", "payments-api"], EPOCH + timedelta(minutes=20), EPOCH + timedelta(minutes=40)
+    )
+
+    assert [event.ref for event in found] == ["b"]
+
+
+def test_backend_history_is_loaded_from_sqlite(tmp_path):
+    # A copy, so opening the WAL-mode database never leaves -shm/-wal files in the checkout.
+    index = ChangeIndex.from_database(Path(shutil.copy(BACKEND_DB, tmp_path)))
+    pipeline_at = datetime(2026, 2, 12, 22, 12, 7, tzinfo=timezone.utc)
+
+    found = index.overlapping(
+        "web-platform", pipeline_at + timedelta(seconds=60), pipeline_at + timedelta(minutes=5)
+    )
+
+    assert "web-platform" in index and len(index) >= 72 + 24
+    assert [(event.kind, event.ref[:7]) for event in found] == [("pipeline", "6ea85eb")]
+
+
+def test_empty_messages_and_rows_without_a_project_do_not_break_loading(tmp_path):
+    database = Path(shutil.copy(BACKEND_DB, tmp_path))
+    connection = sqlite3.connect(database)
+    with connection:
+        project_id = connection.execute("SELECT id FROM projects WHERE name = 'web-platform'").fetchone()[0]
+        for owner, sha in ((project_id, "empty-message"), (None, "no-project"), (10_000, "orphan")):
+            connection.execute(
+                "INSERT INTO commits (project_id, sha, message, author_name, author_email, created_at) "
+                "VALUES (?, ?, '', 'dev', 'dev@example.com', '2026-02-12T22:00:00')",
+                (owner, sha),
+            )
+        connection.execute("INSERT INTO pipelines (project_id, created_at) VALUES (NULL, '2026-02-12T22:00:00')")
+    connection.close()
+
+    index = ChangeIndex.from_database(database)
+
+    at = datetime(2026, 2, 12, 22, tzinfo=timezone.utc)
+    commits = [event for event in index.overlapping("web-platform", at, at) if event.kind == "commit"]
+    assert [(event.ref, event.summary) for event in commits] == [("empty-message", "")]
+
+
+@pytest.mark.asyncio
+async def test_deployments_agent_reads_change_windows_before_observed_time():
+    index = ChangeIndex(
+        [_event("checkout-api", 100, 4, ref="rollout-7"), _event("checkout-api", 10, 0, "commit", "old")]
+    )
+    request = IncidentRequest(
+        incident_id="INC-914",
+        service="checkout-api",
+        symptom="error rate increase",
+        observed_at=EPOCH + timedelta(minutes=110),
+    )
+
+    signal = await MicroAgent(AgentDomain.deployments).investigate(request, sources=EvidenceSources(changes=index))
+
+    assert signal.finding == "Recent rollout/change-window overlap with incident start"
+    assert signal.evidence == ["changes:checkout-api@1_changes_within_20m", "changes:pipeline rollout-7"]
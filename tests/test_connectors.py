@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from hiveops.agents import EvidenceSources
+from hiveops.connectors import ConnectorRuntime, PrometheusConnector
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+
+
+@pytest_asyncio.fixture
+async def connectors():
+    runtime = ConnectorRuntime.standin()
+    yield runtime
+    await runtime.aclose()
+
+
+def _signals(result):
+    return {signal.domain: signal for signal in result.signals}
+
+
+@pytest.mark.asyncio
+async def test_agents_gather_evidence_from_standin_backends(connectors):
+    orchestrator = SwarmOrchestrator(sources=EvidenceSources(connectors=connectors))
+    request = IncidentRequest(incident_id="INC-707", service="checkout-api", symptom="error rate increase")
+
+    signals = _signals(await orchestrator.triage(request))
+
+    metrics = signals[AgentDomain.metrics]
+    assert metrics.finding.startswith("P95 latency regression")
+    assert any("= 1.42" in item for item in metrics.evidence)
+    assert "github:hiveops/checkout-api@1_commits_within_20m" in signals[AgentDomain.deployments].evidence
+    assert "restarts=13" in signals[AgentDomain.kubernetes].evidence[0]
+
+
+@pytest.mark.asyncio
+async def test_healthy_service_evidence_lowers_confidence(connectors):
+    orchestrator = SwarmOrchestrator(sources=EvidenceSources(connectors=connectors))
+    request = IncidentRequest(incident_id="INC-708", service="catalog-api", symptom="error rate increase")
+
+    signals = _signals(await orchestrator.triage(request))
+
+    assert signals[AgentDomain.metrics].confidence == 0.62
+    assert signals[AgentDomain.deployments].confidence == 0.5
+    assert signals[AgentDomain.kubernetes].finding.startswith("All 2 pods")
+
+
+@pytest.mark.asyncio
+async def test_bulk_prometheus_queries_share_one_pooled_client():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.params["query"])
+        return httpx.Response(200, json={"status": "success", "data": {"result": []}})
+
+    connector = PrometheusConnector("http://prometheus", transport=httpx.MockTransport(handler))
+    results = await connector.query_many(["up", "rate(x[5m])", "sum(y)"])
+    await connector.aclose()
+
+    assert results == [[], [], []]
+    assert sorted(requests) == ["rate(x[5m])", "sum(y)", "up"]
+
+
+@pytest.mark.asyncio
+async def test_connector_failure_falls_back_to_symptom_analysis():
+    def handler(request):
+        return httpx.Response(503)
+
+    runtime = ConnectorRuntime(
+        prometheus=PrometheusConnector("http://prometheus", transport=httpx.MockTransport(handler))
+    )
+    orchestrator = SwarmOrchestrator(sources=EvidenceSources(connectors=runtime))
+    request = IncidentRequest(incident_id="INC-709", service="checkout-api", symptom="slow checkout")
+
+    metrics = _signals(await orchestrator.triage(request))[AgentDomain.metrics]
+    await runtime.aclose()
+
+    assert metrics.confidence == 0.9
+    assert metrics.evidence[0].startswith("connector-error:prometheus")
+
+
+@pytest.mark.asyncio
+async def test_identical_in_flight_queries_are_coalesced():
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"status": "success", "data": {"result": [{"value": [0, "1"]}]}})
+
+    connector = PrometheusConnector("http://prometheus", transport=httpx.MockTransport(handler))
+    results = await asyncio.gather(*(connector.query("up") for _ in range(50)), connector.query("down"))
+    await connector.aclose()
+
+    assert calls == 2
+    assert connector.stats.coalesced == 49
+    assert all(result == [{"value": [0, "1"]}] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_slow_query_is_hedged_after_observed_p95():
+    delays = iter([0.5, 0.0])
+
+    async def handler(request):
+        await asyncio.sleep(next(delays, 0.0))
+        return httpx.Response(200, json={"status": "success", "data": {"result": []}})
+
+    connector = PrometheusConnector("http://prometheus", transport=httpx.MockTransport(handler), hedge=True)
+    for _ in range(connector.latency.min_samples):
+        connector.latency.record(0.01)
+
+    assert await asyncio.wait_for(connector.query("up"), timeout=0.3) == []
+    await connector.aclose()
+
+    assert (connector.stats.hedged, connector.stats.hedge_wins) == (1, 1)
+    # One sample per query, measured from the primary's start so it is at least the hedge delay.
+    samples = list(connector.latency._samples)
+    assert len(samples) == connector.latency.min_samples + 1 and samples[-1] >= 0.01
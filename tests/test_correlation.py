@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hiveops.correlation import IncidentCorrelator
+from hiveops.models import IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+
+START = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class CountingOrchestrator(SwarmOrchestrator):
+    def __init__(self):
+        super().__init__()
+        self.runs = []
+
+    async def triage(self, incident):
+        self.runs.append(incident.incident_id)
+        return await super().triage(incident)
+
+
+def _incident(incident_id, service, symptom, seconds=0, severity="medium"):
+    return IncidentRequest(
+        incident_id=incident_id,
+        service=service,
+        symptom=symptom,
+        severity=severity,
+        observed_at=START + timedelta(seconds=seconds),
+    )
+
+
+@pytest.mark.asyncio
+async def test_storm_runs_swarm_once_per_cluster_led_by_most_severe_member():
+    orchestrator = CountingOrchestrator()
+    correlator = IncidentCorrelator(orchestrator, window_seconds=60)
+    incidents = [
+        _incident("INC-1", "checkout-api", "5xx error rate after release v42", 0),
+        _incident("INC-2", "checkout-api", "5xx error rate after release v42", 10, severity="critical"),
+        _incident("INC-3", "cart-api", "5xx error rate after release v42", 20),
+        _incident("INC-4", "billing-worker", "disk full on node", 30),
+        _incident("INC-5", "checkout-api", "5xx error rate after release v42", 500),
+    ]
+
+    response = await correlator.triage_batch(incidents)
+
+    assert [cluster.member_incident_ids for cluster in response.clusters] == [
+        ["INC-1", "INC-2", "INC-3"],
+        ["INC-4"],
+        ["INC-5"],
+    ]
+    assert response.clusters[0].leader_incident_id == "INC-2"
+    assert sorted(orchestrator.runs) == ["INC-2", "INC-4", "INC-5"]
+    shared = {result.incident_id: result for result in response.results}
+    assert shared["INC-3"].service == "cart-api"
+    assert shared["INC-3"].cluster_id == shared["INC-1"].cluster_id
+    assert shared["INC-3"].status == shared["INC-2"].status
+
+
+def test_naive_observed_at_is_read_as_utc_alongside_aware_timestamps():
+    correlator = IncidentCorrelator(SwarmOrchestrator(), window_seconds=60)
+    aware = _incident("INC-1", "checkout-api", "5xx error rate after release v42")
+    naive = IncidentRequest(
+        incident_id="INC-2",
+        service="checkout-api",
+        symptom="5xx error rate after release v42",
+        observed_at=(START + timedelta(seconds=10)).replace(tzinfo=None),
+    )
+
+    first = correlator.assign(aware)
+    second = correlator.assign(naive)
+
+    assert second is first
+    assert first.last_seen_at == START + timedelta(seconds=10)
@@ -0,0 +1,55 @@
+import pytest
+
+from hiveops.agents import DEFAULT_SWARM, EvidenceSources, MicroAgent, swarm_for
+from hiveops.executors import AgentExecutor, ExecutionMode
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+
+
+@pytest.fixture
+def executor():
+    executor = AgentExecutor(thread_workers=2, process_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", list(ExecutionMode))
+async def test_agents_produce_identical_signals_in_every_execution_mode(executor, mode):
+    request = IncidentRequest(incident_id="INC-606", service="checkout-api", symptom="latency after deploy")
+    inline = await SwarmOrchestrator().triage(request)
+    agents = tuple(MicroAgent(agent.domain, execution=mode) for agent in DEFAULT_SWARM)
+
+    result = await SwarmOrchestrator(agents=agents, executor=executor).triage(request)
+
+    assert result.signals == inline.signals
+
+
+def test_warm_up_starts_pools_before_first_use(executor):
+    executor.warm_up(ExecutionMode.thread, ExecutionMode.process)
+
+    assert len(executor._threads._threads) == 2
+    assert executor._processes is not None
+    assert len(executor._processes._processes) == 2
+    with pytest.raises(ValueError):
+        executor.warm_up(ExecutionMode.inline)
+
+
+def test_metrics_agent_moves_to_the_thread_pool_only_with_range_data(tmp_path):
+    def metrics_mode(sources):
+        return next(agent.execution for agent in swarm_for(sources) if agent.domain is AgentDomain.metrics)
+
+    assert metrics_mode(EvidenceSources()) is ExecutionMode.inline
+    assert metrics_mode(EvidenceSources(metric_windows=tmp_path)) is ExecutionMode.thread
+    assert [agent.domain for agent in swarm_for(EvidenceSources(app_logs=tmp_path))][-1] is AgentDomain.logs
+
+
+def test_pool_sizes_and_warm_up_come_from_the_environment():
+    executor = AgentExecutor.from_env({"HIVEOPS_THREAD_WORKERS": "3", "HIVEOPS_WARM_UP": "true"})
+    try:
+        assert (executor.thread_workers, len(executor._threads._threads)) == (3, 3)
+        assert executor.process_workers >= 1 and executor._processes is not None
+    finally:
+        executor.shutdown()
+
+    assert AgentExecutor.from_env({})._threads is None
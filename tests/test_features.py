@@ -0,0 +1,58 @@
+import pickle
+import random
+
+import pytest
+
+from hiveops.agents import MicroAgent
+from hiveops.features import KeywordAutomaton, extract_features
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+
+
+def test_automaton_matches_every_overlapping_substring():
+    rng = random.Random(3)
+    for _ in range(200):
+        keywords = {"".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(rng.randint(1, 10))}
+        cues = {f"cue-{keyword}": (keyword,) for keyword in keywords}
+        automaton = KeywordAutomaton(cues)
+        text = "".join(rng.choices("abcd", k=rng.randint(0, 20)))
+
+        assert automaton.scan(text) == {(f"cue-{keyword}", keyword) for keyword in keywords if keyword in text}
+
+
+def test_features_keep_substring_cues_and_survive_pickling():
+    incident = IncidentRequest(
+        incident_id="INC-600", service="checkout-api", symptom="Slowness after Redeploy; WAF blocked 1200 requests"
+    )
+
+    features = extract_features(incident)
+
+    assert features.cues == {"latency", "rollout", "exploit"}
+    assert features.tokens == ("slowness", "after", "redeploy", "waf", "blocked", "#", "requests")
+    assert pickle.loads(pickle.dumps(features)) == features
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_extracts_features_once_and_shares_them(monkeypatch):
+    import hiveops.orchestrator
+
+    calls = []
+    seen = []
+
+    def counting(incident):
+        calls.append(incident.incident_id)
+        return extract_features(incident)
+
+    class RecordingAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            seen.append(context["features"])
+            return await MicroAgent.investigate(self, incident, **context)
+
+    monkeypatch.setattr(hiveops.orchestrator, "extract_features", counting)
+    agents = tuple(RecordingAgent(domain) for domain in (AgentDomain.metrics, AgentDomain.deployments))
+    incident = IncidentRequest(incident_id="INC-601", service="checkout-api", symptom="timeout after deploy")
+
+    result = await SwarmOrchestrator(agents=agents).triage(incident)
+
+    assert calls == ["INC-601"] and len(seen) == 2 and seen[0] is seen[1]
+    assert {signal.confidence for signal in result.signals} == {0.9, 0.86}
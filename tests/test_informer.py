@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from hiveops.agents import EvidenceSources, MicroAgent
+from hiveops.connectors import KubernetesConnector
+from hiveops.informer import KubernetesInformer
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.standins import create_standin_app
+
+
+@pytest_asyncio.fixture
+async def cluster():
+    app = create_standin_app()
+    connector = KubernetesConnector("http://standin", transport=httpx.ASGITransport(app=app))
+    informer = KubernetesInformer(connector, watch_timeout=0.05, retry_seconds=0.01)
+    await informer.start()
+    yield app.state.kubernetes, informer
+    await informer.stop()
+    await connector.aclose()
+
+
+async def _eventually(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_informer_indexes_listed_state_by_service(cluster):
+    _, informer = cluster
+
+    state = informer.service("checkout-api")
+
+    assert (state.pods, state.restarts, state.unhealthy_pods) == (3, 13, 1)
+    assert (state.backoff_events, state.throttling_events, state.active_replicasets) == (9, 3, 2)
+    assert len(informer.pods(service="catalog-api", namespace="shop")) == 2
+    assert informer.pods(label="app=checkout-api") == informer.pods(service="checkout-api")
+
+
+@pytest.mark.asyncio
+async def test_watch_events_keep_service_totals_current(cluster):
+    kubernetes, informer = cluster
+    crashing = kubernetes.objects["pods"][("shop", "checkout-api-7d9f-fghij")]
+
+    kubernetes.delete("pods", "shop", "checkout-api-7d9f-fghij")
+    kubernetes.apply(
+        "pods",
+        {
+            "metadata": {"name": "catalog-api-5c8b-zzzzz", "namespace": "shop", "labels": {"app": "catalog-api"}},
+            "status": {"phase": "Running", "containerStatuses": [{"restartCount": 2}]},
+        },
+    )
+    await _eventually(lambda: informer.service("catalog-api").pods == 3)
+
+    assert informer.service("checkout-api").restarts == 13 - crashing["status"]["containerStatuses"][0]["restartCount"]
+    assert informer.service("checkout-api").unhealthy_pods == 0
+    assert informer.service("catalog-api").restarts == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_resource_version_triggers_relist(cluster):
+    kubernetes, informer = cluster
+    await informer.stop()
+    pod = kubernetes.objects["pods"][("shop", "catalog-api-5c8b-pqrst")]
+    for _ in range(kubernetes.history.maxlen + 1):
+        kubernetes.apply("pods", pod)
+
+    await informer.start()
+    # Every resource watched from the pre-compaction version, so all three relist.
+    await _eventually(lambda: informer.relists == 6)
+
+    assert informer.service("catalog-api").pods == 2
+
+
+@pytest.mark.asyncio
+async def test_kubernetes_agent_answers_from_informer_cache(cluster):
+    _, informer = cluster
+    requests_before = informer.connector.stats.requests
+    request = IncidentRequest(incident_id="INC-913", service="checkout-api", symptom="checkout errors")
+
+    signal = await MicroAgent(AgentDomain.kubernetes).investigate(request, sources=EvidenceSources(informer=informer))
+
+    assert signal.finding == "Pod restart spikes and CPU throttling on serving tier"
+    assert signal.evidence[0].startswith("informer:pods{service=checkout-api} total=3 not_running=1 restarts=13")
+    assert informer.connector.stats.requests - requests_before <= 3
@@ -0,0 +1,105 @@
+import random
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from hiveops.agents import LOGS_AGENT, EvidenceSources
+from hiveops.logmining import TemplateMiner, pipeline_job_lines
+from hiveops.models import IncidentRequest
+
+BACKEND_DB = Path(__file__).resolve().parent.parent / "backend" / "hiveops.db"
+START = datetime(2026, 3, 1, 10, tzinfo=timezone.utc)
+
+
+def _log(minutes: int, message: str) -> str:
+    return f"{(START + timedelta(minutes=minutes)).isoformat().replace('+00:00', 'Z')} INFO {message}\n"
+
+
+def _checkout_log() -> list[str]:
+    rng = random.Random(3)
+    lines = []
+    for minute in range(60):
+        for _ in range(5):
+            lines.append(_log(minute, f"GET /api/cart/{rng.randint(1, 9999)} 200 in {rng.randint(5, 90)}ms"))
+        lines.append(_log(minute, f"cache hit ratio {rng.random():.2f} for shard {rng.randint(1, 8)}"))
+        if minute >= 45:
+            lines.extend(
+                _log(minute, f"payment gateway timeout after {rng.randint(3, 9)}s order={rng.randint(1, 10**6)}")
+                for _ in range(2)
+            )
+            lines.extend(_log(minute, f"GET /api/cart/{rng.randint(1, 9999)} 200 in 12ms") for _ in range(15))
+    return lines
+
+
+def test_variable_fields_collapse_into_one_template():
+    miner = TemplateMiner()
+
+    for line in _checkout_log():
+        miner.add(line)
+
+    templates = dict(miner.templates())
+    assert len(templates) == 3
+    assert any(template.startswith("<*> INFO payment gateway timeout after <*>") for template in templates)
+
+
+def test_new_and_spiking_templates_in_the_incident_window():
+    report = TemplateMiner().mine(_checkout_log(), START + timedelta(minutes=40), START + timedelta(minutes=59))
+
+    assert report.window_lines < report.lines
+    assert [(stat.window_count, stat.baseline_count, stat.is_error) for stat in report.novel] == [(30, 0, True)]
+    assert "GET /api/cart/<*>" in report.spiking[0].template
+    assert all("cache hit ratio" not in stat.template for stat in report.spiking)
+
+
+def test_cluster_budget_bounds_memory_on_unbounded_shapes():
+    rng = random.Random(9)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=6)) for _ in range(2000)]
+    miner = TemplateMiner(max_clusters=50)
+
+    for _ in range(5000):
+        miner.add(" ".join(rng.choices(words, k=rng.randint(3, 8))))
+
+    assert len(miner) == 50
+    assert miner.evicted > 0
+    assert sum(len(leaf) for leaf in _leaves(miner._root)) == 50
+
+
+def _leaves(node):
+    for key, child in node.items():
+        if key == "":
+            yield child
+        else:
+            yield from _leaves(child)
+
+
+def test_pipeline_job_logs_share_the_engine(tmp_path):
+    miner = TemplateMiner()
+    # Read from a copy; readers of the WAL-mode original would leave -shm/-wal files in backend/.
+    database = Path(shutil.copy(BACKEND_DB, tmp_path))
+
+    for line in pipeline_job_lines(database):
+        miner.add(line)
+
+    templates = dict(miner.templates())
+    assert templates["Job succeeded"] >= 80
+    assert len(templates) < sum(templates.values()) / 3
+
+
+@pytest.mark.asyncio
+async def test_logs_agent_reports_new_error_templates(tmp_path):
+    (tmp_path / "checkout-api").mkdir()
+    (tmp_path / "checkout-api" / "app.log").write_text("".join(_checkout_log()))
+    request = IncidentRequest(
+        incident_id="INC-917",
+        service="checkout-api",
+        symptom="checkout errors",
+        observed_at=START + timedelta(minutes=59),
+    )
+
+    signal = await LOGS_AGENT.investigate(request, sources=EvidenceSources(app_logs=tmp_path))
+
+    assert signal.finding.startswith("New or spiking error log pattern for checkout-api: <*> INFO payment gateway")
+    assert signal.confidence == 0.87
+    assert signal.evidence[1].startswith("logs:new count=30 baseline=0")
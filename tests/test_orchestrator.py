@@ -1,7 +1,20 @@
+import asyncio
+
 import pytest
 
-from hiveops.models import IncidentRequest
-from hiveops.orchestrator import SwarmOrchestrator
+from hiveops.agents import DEFAULT_SWARM, MicroAgent
+from hiveops.models import AgentDomain, IncidentRequest, Severity, Signal
+from hiveops.orchestrator import QuorumPolicy, SwarmOrchestrator, TriageDeadline
+
+
+class HungAgent(MicroAgent):
+    async def investigate(self, incident, **context):
+        await asyncio.sleep(60)
+
+
+class BrokenAgent(MicroAgent):
+    async def investigate(self, incident, **context):
+        raise RuntimeError("backend returned garbage")
 
 
 @pytest.mark.asyncio
@@ -40,3 +53,224 @@ async def test_security_pattern_requires_human_escalation_for_critical_incident(
 
     assert result.status == "needs_human"
     assert "incident commander" in result.suggested_action.lower() or "waf" in result.suggested_action.lower()
+
+
+@pytest.mark.asyncio
+async def test_triage_stream_emits_signals_before_final_result():
+    orchestrator = SwarmOrchestrator()
+    request = IncidentRequest(
+        incident_id="INC-202",
+        service="checkout-api",
+        symptom="latency spike after deploy",
+        severity="high",
+        environment="prod",
+    )
+
+    events = [event async for event in orchestrator.triage_stream(request)]
+
+    assert {event.signal.domain for event in events if event.event == "signal"} == {agent.domain for agent in DEFAULT_SWARM}
+    assert events[0].event == "signal"
+    assert events[-2].event == "provisional"
+    assert events[-2].pending == []
+    assert events[-1].event == "result"
+    assert events[-1].result == (await orchestrator.triage(request)).model_copy(
+        update={"generated_at": events[-1].result.generated_at}
+    )
+
+
+@pytest.mark.asyncio
+async def test_hung_agent_is_cancelled_and_partial_signals_are_synthesized():
+    agents = DEFAULT_SWARM[:4] + (HungAgent(AgentDomain.security),)
+    orchestrator = SwarmOrchestrator(
+        agents=agents,
+        deadlines={Severity.critical: TriageDeadline(total_seconds=0.2, agent_seconds=0.05)},
+    )
+    request = IncidentRequest(
+        incident_id="INC-303",
+        service="checkout-api",
+        symptom="latency spike",
+        severity="critical",
+        environment="prod",
+    )
+
+    result = await asyncio.wait_for(orchestrator.triage(request), timeout=1)
+
+    assert len(result.signals) == 4
+    assert result.timed_out_domains == [AgentDomain.security]
+    assert any("security" in item for item in result.audit_recommendations)
+
+
+@pytest.mark.asyncio
+async def test_an_agent_that_raises_is_recorded_without_losing_the_other_signals():
+    agents = tuple(
+        BrokenAgent(agent.domain) if agent.domain == AgentDomain.kubernetes else agent for agent in DEFAULT_SWARM
+    )
+    orchestrator = SwarmOrchestrator(agents=agents)
+    request = IncidentRequest(incident_id="INC-304", service="checkout-api", symptom="latency spike", severity="high")
+
+    result = await orchestrator.triage(request)
+
+    assert len(result.signals) == 4
+    assert result.failed_domains == [AgentDomain.kubernetes]
+    assert result.timed_out_domains == []
+    assert any("kubernetes" in item for item in result.audit_recommendations)
+
+
+@pytest.mark.asyncio
+async def test_triage_many_caps_incidents_in_flight():
+    in_flight = 0
+    peak = 0
+
+    class CountingAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await MicroAgent.investigate(self, incident, **context)
+
+    async def incidents():
+        for index in range(12):
+            yield IncidentRequest(incident_id=f"INC-{index:03d}", service="checkout-api", symptom="slow")
+
+    orchestrator = SwarmOrchestrator(agents=(CountingAgent(AgentDomain.metrics),))
+    results = [result async for result in orchestrator.triage_many(incidents(), concurrency=3)]
+
+    assert len(results) == 12
+    assert peak == 3
+
+
+class DelayedAgent(MicroAgent):
+    async def investigate(self, incident, **context):
+        await asyncio.sleep({AgentDomain.metrics: 0, AgentDomain.deployments: 0.01}.get(self.domain, 5))
+        return await MicroAgent.investigate(self, incident, **context)
+
+
+@pytest.mark.asyncio
+async def test_quorum_cancels_stragglers_once_verdict_cannot_change():
+    agents = (
+        DelayedAgent(AgentDomain.metrics),
+        DelayedAgent(AgentDomain.deployments),
+        DelayedAgent(AgentDomain.kubernetes),
+        DelayedAgent(AgentDomain.cost),
+    )
+    orchestrator = SwarmOrchestrator(agents=agents, quorum=QuorumPolicy())
+    request = IncidentRequest(
+        incident_id="INC-404",
+        service="checkout-api",
+        symptom="slow responses after deploy",
+        severity="high",
+    )
+
+    result = await asyncio.wait_for(orchestrator.triage(request), timeout=1)
+    full = await SwarmOrchestrator(agents=tuple(MicroAgent(agent.domain) for agent in agents)).triage(request)
+
+    assert [signal.domain for signal in result.signals] == [AgentDomain.metrics, AgentDomain.deployments]
+    assert result.skipped_domains == [AgentDomain.kubernetes, AgentDomain.cost]
+    assert (result.status, result.hypothesis) == (full.status, full.hypothesis)
+
+
+@pytest.mark.asyncio
+async def test_default_quorum_cuts_a_low_severity_straggler_whose_floor_keeps_the_verdict():
+    class ConfidentAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            if self.domain is AgentDomain.kubernetes:
+                await asyncio.sleep(5)
+            return Signal(
+                domain=self.domain,
+                finding=f"{self.domain.value} finding",
+                confidence=0.8 if self.domain is AgentDomain.security else 0.9,
+                evidence=[f"{self.domain.value}:evidence"],
+            )
+
+    domains = (
+        AgentDomain.metrics,
+        AgentDomain.deployments,
+        AgentDomain.security,
+        AgentDomain.traces,
+        AgentDomain.kubernetes,
+    )
+    orchestrator = SwarmOrchestrator(agents=tuple(ConfidentAgent(domain) for domain in domains), quorum=QuorumPolicy())
+    request = IncidentRequest(
+        incident_id="INC-407", service="checkout-api", symptom="slow responses after deploy", severity="low"
+    )
+
+    result = await asyncio.wait_for(orchestrator.triage(request), timeout=1)
+
+    # Even at its 0.5 floor kubernetes keeps the average at the 0.8 needed to resolve.
+    assert result.skipped_domains == [AgentDomain.kubernetes]
+    assert (result.status, result.hypothesis) == ("resolved", "traces finding")
+
+
+@pytest.mark.asyncio
+async def test_quorum_waits_when_stragglers_could_move_the_average_across_a_threshold():
+    class StragglingAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            await asyncio.sleep(0.05 if self.domain is AgentDomain.cost else 0)
+            return await MicroAgent.investigate(self, incident, **context)
+
+    domains = (AgentDomain.metrics, AgentDomain.deployments, AgentDomain.cost)
+    agents = tuple(StragglingAgent(domain) for domain in domains)
+    orchestrator = SwarmOrchestrator(agents=agents, quorum=QuorumPolicy())
+    request = IncidentRequest(
+        incident_id="INC-406", service="checkout-api", symptom="slow responses after deploy", severity="low"
+    )
+
+    result = await orchestrator.triage(request)
+    full = await SwarmOrchestrator(agents=tuple(MicroAgent(agent.domain) for agent in agents)).triage(request)
+
+    assert result.skipped_domains == [] and len(result.signals) == 3
+    assert result.status == full.status
+
+
+@pytest.mark.asyncio
+async def test_quorum_waits_for_domains_that_could_override_the_verdict():
+    agents = (
+        DelayedAgent(AgentDomain.metrics),
+        DelayedAgent(AgentDomain.deployments),
+        DelayedAgent(AgentDomain.security),
+    )
+    orchestrator = SwarmOrchestrator(
+        agents=agents,
+        quorum=QuorumPolicy(),
+        deadlines={Severity.low: TriageDeadline(total_seconds=0.2, agent_seconds=0.2)},
+    )
+    request = IncidentRequest(
+        incident_id="INC-405",
+        service="checkout-api",
+        symptom="slow responses after deploy",
+        severity="low",
+    )
+
+    result = await orchestrator.triage(request)
+
+    assert result.skipped_domains == []
+    assert result.timed_out_domains == [AgentDomain.security]
+
+
+@pytest.mark.asyncio
+async def test_insufficient_audit_reinvestigates_only_weak_domains_with_wider_windows():
+    windows = []
+
+    class RecordingAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            windows.append((self.domain, context['window_minutes']))
+            return await MicroAgent.investigate(self, incident, **context)
+
+    orchestrator = SwarmOrchestrator(
+        agents=(RecordingAgent(AgentDomain.metrics), RecordingAgent(AgentDomain.cost))
+    )
+    request = IncidentRequest(incident_id="INC-505", service="checkout-api", symptom="slow", severity="high")
+
+    result = await orchestrator.triage(request)
+
+    # Without sources the 40m pass gathers nothing new, so the loop stops before max_iterations.
+    assert windows == [
+        (AgentDomain.metrics, 20),
+        (AgentDomain.cost, 20),
+        (AgentDomain.cost, 40),
+    ]
+    assert result.audit_iterations == 2
+    cost = next(signal for signal in result.signals if signal.domain == AgentDomain.cost)
+    assert cost.evidence == ["billing:hourly_spend_within_expected_band"]
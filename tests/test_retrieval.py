@@ -0,0 +1,94 @@
+import random
+import time
+
+import pytest
+
+from hiveops.models import IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+from hiveops.retrieval import HistoryDocument, IncidentHistory
+
+WORDS = (
+    "latency spike timeout error 5xx oom killed pod restart crashloop disk full connection refused tls "
+    "handshake dns resolution queue backlog consumer lag cpu throttling memory leak deploy rollback "
+    "certificate expired rate limit exceeded cache miss storm replica deadlock"
+).split()
+
+
+def _documents(count, seed=4):
+    rng = random.Random(seed)
+    for index in range(count):
+        service = f"svc-{rng.randint(0, 99)}"
+        symptom = " ".join(rng.sample(WORDS, 5)) + f" on {service} p95 {rng.randint(100, 3000)}ms"
+        yield HistoryDocument(
+            ref=f"INC-{index}", text=symptom, service=service, title=symptom, action="rollback", status="mitigated"
+        )
+
+
+def test_near_duplicates_and_runbooks_rank_first():
+    history = IncidentHistory()
+    history.extend(_documents(2000))
+    history.add(
+        HistoryDocument(
+            ref="RB-7",
+            kind="runbook",
+            title="TLS certificate expired on ingress",
+            text="TLS certificate expired on ingress: handshake failures, renew via cert-manager",
+            action="Renew the certificate with cert-manager and reload ingress",
+        )
+    )
+    history.add(
+        HistoryDocument(
+            ref="INC-X",
+            title="checkout-api connection pool exhausted p95 1400ms",
+            text="checkout-api connection pool exhausted p95 1400ms",
+            service="checkout-api",
+            action="Raise pool size and recycle pods",
+            status="resolved",
+        )
+    )
+
+    duplicate = history.similar("Checkout-API connection pool exhausted, p95 2100ms", service="checkout-api")
+    runbook = history.similar("handshake failing: certificate expired", k=1)
+
+    assert duplicate[0].ref == "INC-X" and duplicate[0].similarity > 0.9
+    assert duplicate[0].suggested_action == "Raise pool size and recycle pods"
+    assert runbook[0].ref == "RB-7" and runbook[0].kind == "runbook"
+
+
+def test_index_persists_and_replaces_known_refs(tmp_path):
+    path = tmp_path / "history.db"
+    history = IncidentHistory(path)
+    history.extend(_documents(50))
+    history.add(HistoryDocument(ref="INC-3", title="disk full on svc-1", text="disk full", action="expand pvc"))
+    history.close()
+
+    reopened = IncidentHistory(path)
+
+    assert len(reopened) == 50
+    match = reopened.similar("disk full on svc-1", k=1)[0]
+    assert (match.ref, match.suggested_action) == ("INC-3", "expand pvc")
+
+
+def test_lookups_stay_in_low_milliseconds():
+    history = IncidentHistory()
+    history.extend(_documents(5000))
+    queries = [document.title for document in _documents(100, seed=9)]
+
+    started = time.perf_counter()
+    for query in queries:
+        history.similar(query)
+    assert (time.perf_counter() - started) / len(queries) < 0.02
+
+
+@pytest.mark.asyncio
+async def test_triage_attaches_similar_past_incidents():
+    orchestrator = SwarmOrchestrator(history=IncidentHistory())
+    first = IncidentRequest(incident_id="INC-920", service="checkout-api", symptom="latency spike after deploy")
+    second = first.model_copy(update={"incident_id": "INC-921", "symptom": "Latency spike after deploy (p95 2s)"})
+
+    earlier = await orchestrator.triage(first)
+    later = await orchestrator.triage(second)
+
+    assert earlier.similar_incidents == []
+    assert later.similar_incidents[0].ref == "INC-920"
+    assert later.similar_incidents[0].suggested_action == earlier.suggested_action
@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+
+from hiveops.agents import MicroAgent
+from hiveops.models import AgentDomain, IncidentRequest, Severity
+from hiveops.orchestrator import SwarmOrchestrator
+from hiveops.scheduler import SchedulerSaturated, TriageScheduler
+
+AGENT_SECONDS = 0.05
+
+
+class SlowAgent(MicroAgent):
+    async def investigate(self, incident, **context):
+        await asyncio.sleep(AGENT_SECONDS)
+        return await MicroAgent.investigate(self, incident, **context)
+
+
+def _incident(number, severity):
+    return IncidentRequest(incident_id=f"INC-{number}", service="checkout-api", symptom="slow", severity=severity)
+
+
+def _scheduler(**options):
+    return TriageScheduler(SwarmOrchestrator(agents=(SlowAgent(AgentDomain.metrics),)), **options)
+
+
+@pytest.mark.asyncio
+async def test_critical_preempts_running_low_work_which_is_requeued():
+    scheduler = _scheduler(concurrency=1)
+    finished = []
+
+    async def submit(incident):
+        await scheduler.triage(incident)
+        finished.append(incident.incident_id)
+
+    lows = [asyncio.create_task(submit(_incident(number, Severity.low))) for number in range(3)]
+    await asyncio.sleep(AGENT_SECONDS / 5)
+    await submit(_incident(99, Severity.critical))
+    await asyncio.gather(*lows)
+
+    assert finished == ["INC-99", "INC-0", "INC-1", "INC-2"]
+    status = scheduler.status()
+    assert status.preempted == 1 and status.completed == 4 and status.running == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_the_newest_lower_severity_incident():
+    scheduler = _scheduler(concurrency=1, max_queued=2, preempt=False)
+    running = asyncio.create_task(scheduler.triage(_incident(0, Severity.low)))
+    await asyncio.sleep(0)
+    queued = [asyncio.create_task(scheduler.triage(_incident(number, Severity.low))) for number in (1, 2)]
+    await asyncio.sleep(0)
+
+    high = asyncio.create_task(scheduler.triage(_incident(3, Severity.high)))
+    await asyncio.sleep(0)
+    with pytest.raises(SchedulerSaturated):
+        await scheduler.triage(_incident(4, Severity.low))
+    status = scheduler.status()
+
+    assert status.queued[Severity.high] == 1 and status.queued[Severity.low] == 1
+    assert status.shed[Severity.low] == 2
+    with pytest.raises(SchedulerSaturated):
+        await queued[1]
+    assert (await high).incident_id == "INC-3"
+    await asyncio.gather(running, queued[0])
+
+
+@pytest.mark.asyncio
+async def test_critical_latency_stays_flat_under_a_low_severity_flood():
+    scheduler = _scheduler(concurrency=4)
+    flood = [asyncio.create_task(scheduler.triage(_incident(number, Severity.low))) for number in range(200)]
+    await asyncio.sleep(AGENT_SECONDS / 2)
+
+    started = time.perf_counter()
+    await scheduler.triage(_incident(999, Severity.critical))
+    latency = time.perf_counter() - started
+
+    assert latency < 3 * AGENT_SECONDS
+    assert scheduler.status().queued[Severity.low] > 150
+    for task in flood:
+        task.cancel()
+    await asyncio.gather(*flood, return_exceptions=True)
+    assert scheduler.status().queued[Severity.low] == 0
+
+
+@pytest.mark.asyncio
+async def test_batches_run_through_the_scheduler_budget():
+    in_flight = peak = 0
+
+    class CountingAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            return await MicroAgent.investigate(self, incident, **context)
+
+    scheduler = TriageScheduler(SwarmOrchestrator(agents=(CountingAgent(AgentDomain.metrics),)), concurrency=2)
+
+    async def incidents():
+        for number in range(20):
+            yield _incident(number, Severity.low)
+
+    batch = scheduler.orchestrator.triage_many(incidents(), concurrency=16, triage=scheduler.triage)
+    results = [result async for result in batch]
+
+    assert len(results) == 20 and peak == 2
+    assert scheduler.status().completed == 20
+
+
+@pytest.mark.asyncio
+async def test_reservations_hold_a_slot_and_are_not_preempted():
+    scheduler = _scheduler(concurrency=1)
+    release = await scheduler.reserve(_incident(0, Severity.low))
+    assert scheduler.status().running == 1
+
+    critical = asyncio.create_task(scheduler.triage(_incident(1, Severity.critical)))
+    await asyncio.sleep(AGENT_SECONDS)
+    assert not critical.done() and scheduler.status().queued[Severity.critical] == 1
+
+    release()
+    release()
+    assert (await critical).incident_id == "INC-1"
+    assert scheduler.status().preempted == 0 and scheduler.status().completed == 2
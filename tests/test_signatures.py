@@ -0,0 +1,91 @@
+import gzip
+import io
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from hiveops.agents import EvidenceSources, MicroAgent
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.signatures import Signature, SignatureScanner, iter_chunks, read_chunks
+
+SECURITY = Path(__file__).resolve().parent.parent / "hiveops" / "fixtures" / "security"
+
+
+def test_scanner_agrees_with_naive_substring_search():
+    lines = [
+        b'{"uri": "/api/items?id=1 UNION Select pw"}',
+        b'{"uri": "/healthz", "ua": "Mozilla"}',
+        b'{"uri": "/x?q=<SCRIPT>alert(1)</script>", "ua": "nikto"}',
+        b'{"uri": "/files/..%2F..%2Fetc/passwd"}',
+    ] * 50
+    scanner = SignatureScanner()
+
+    report = scanner.scan(iter_chunks(io.BytesIO(b"\n".join(lines)), chunk_bytes=97))
+
+    expected = {}
+    for line in lines:
+        for signature in scanner.signatures:
+            if any(literal.encode() in line.lower() for literal in signature.literals):
+                expected[signature.name] = expected.get(signature.name, 0) + 1
+    assert report.counts == expected
+    assert report.counts["path-traversal"] == 50
+
+
+def test_hits_outside_the_window_are_not_counted():
+    log = (
+        b'{"time": "2026-03-01T09:00:00Z", "output": "A shell was spawned in a container"}\n'
+        b'{"time": "2026-03-01T10:10:00Z", "output": "A shell was spawned in a container"}\n'
+        b'{"timestamp": 1772359800000, "uri": "/?q=${jndi:ldap://x}"}\n'
+    )
+    start = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+    report = SignatureScanner().scan([log], start=start, end=datetime(2026, 3, 1, 11, tzinfo=timezone.utc))
+
+    assert report.counts == {"shell-in-container": 1, "log4shell": 1}
+    assert report.sources == {"runtime": 1, "waf": 1}
+
+
+def test_gzip_logs_stream_and_short_literals_are_rejected(tmp_path):
+    path = tmp_path / "waf.log.gz"
+    with gzip.open(path, "wb") as stream:
+        stream.write(b"GET /?cmd=;cat /etc/shadow\n" * 1000)
+
+    report = SignatureScanner().scan(read_chunks([path], chunk_bytes=4096))
+
+    assert report.counts == {"command-injection": 1000}
+    with pytest.raises(ValueError):
+        SignatureScanner([Signature("short", "waf", ("../",))])
+
+
+def test_scanner_sustains_high_throughput_on_clean_traffic():
+    line = b'{"timestamp":1772359800000,"action":"ALLOW","uri":"/api/cart?item=42","ua":"Mozilla/5.0 (X11)"}\n'
+    chunk = line * (4 * 1024 * 1024 // len(line))
+    scanner = SignatureScanner()
+
+    started = time.perf_counter()
+    report = scanner.scan([chunk] * 8)
+    elapsed = time.perf_counter() - started
+
+    assert report.total == 0
+    assert report.bytes_scanned / elapsed > 50e6
+
+
+@pytest.mark.asyncio
+async def test_security_agent_reports_signatures_in_incident_window():
+    request = IncidentRequest(
+        incident_id="INC-916",
+        service="checkout-api",
+        symptom="checkout errors",
+        observed_at=datetime(2026, 3, 1, 10, 55, tzinfo=timezone.utc),
+    )
+
+    signal = await MicroAgent(AgentDomain.security).investigate(
+        request, sources=EvidenceSources(security_logs=SECURITY)
+    )
+
+    assert signal.finding == "Runtime rule violations alongside suspicious request signatures"
+    assert signal.confidence == 0.93
+    assert signal.evidence[0].startswith("signatures:2_files")
+    assert signal.evidence[1].startswith("signature:scanner hits=15")
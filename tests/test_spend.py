@@ -0,0 +1,114 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from hiveops.agents import EvidenceSources, MicroAgent
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.spend import QuantileSketch, SpendMonitor
+
+HOUR = 3600
+NOW = datetime(2026, 3, 1, 10, 30, tzinfo=timezone.utc)
+
+
+def _history(monitor, services, skus, hours=72, seed=7):
+    rng = random.Random(seed)
+    first = int(NOW.timestamp()) // HOUR - hours
+    for hour in range(first, first + hours + 1):
+        for service in services:
+            for sku in range(skus):
+                # Two billing lines per hour, summed into one hourly total.
+                for _ in range(2):
+                    monitor.observe(service, f"sku-{sku}", hour * HOUR + rng.randint(0, HOUR - 1), rng.uniform(4, 6))
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy_and_merge_exactly():
+    rng = np.random.default_rng(3)
+    values = rng.lognormal(3, 1.2, 20_000)
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for index, value in enumerate(values.tolist()):
+        whole.add(value)
+        (left if index % 2 else right).add(value)
+
+    left.merge(right)
+
+    for q in (0.5, 0.9, 0.99):
+        assert abs(whole.quantile(q) - np.quantile(values, q)) <= 0.011 * np.quantile(values, q)
+    assert left.bins == whole.bins and left.count == whole.count
+
+
+def test_merging_a_later_open_hour_closes_ours_like_a_later_record_would():
+    serial = SpendMonitor()
+    serial.observe("checkout-api", "sku-1", 0.0, 5.0)
+    serial.observe("checkout-api", "sku-1", 3 * HOUR, 7.0)
+    expected = serial.keys["checkout-api"]["sku-1"]
+
+    for first, second in ((0.0, 3 * HOUR), (3 * HOUR, 0.0)):
+        ours, theirs = SpendMonitor(), SpendMonitor()
+        ours.observe("checkout-api", "sku-1", first, 5.0 if first == 0.0 else 7.0)
+        theirs.observe("checkout-api", "sku-1", second, 5.0 if second == 0.0 else 7.0)
+
+        ours.merge(theirs)
+
+        state = ours.keys["checkout-api"]["sku-1"]
+        assert (state.hour, state.pending, state.hours) == (expected.hour, expected.pending, expected.hours)
+        assert state.mean == pytest.approx(expected.mean)
+
+
+def test_only_the_spiking_sku_is_flagged_among_thousands():
+    monitor = SpendMonitor()
+    _history(monitor, ["checkout-api", "catalog-api"], skus=1000)
+
+    monitor.observe("checkout-api", "sku-42", NOW.timestamp(), 60.0)
+    spikes = monitor.spikes(["checkout-api", "catalog-api"], at=NOW)
+
+    assert len(monitor) == 2000
+    assert [(spike.service, spike.sku) for spike in spikes] == [("checkout-api", "sku-42")]
+    assert spikes[0].ratio > 5
+    assert max(len(state.sketch.bins) for skus in monitor.keys.values() for state in skus.values()) < 64
+
+
+def test_a_wider_lookback_still_finds_a_spike_in_an_earlier_hour():
+    monitor = SpendMonitor()
+    _history(monitor, ["checkout-api"], skus=4)
+    monitor.observe("checkout-api", "sku-1", NOW.timestamp(), 60.0)
+
+    later = NOW + timedelta(hours=2)
+
+    assert monitor.spikes(["checkout-api"], at=later) == []
+    assert [spike.sku for spike in monitor.spikes(["checkout-api"], at=later, lookback_hours=2)] == ["sku-1"]
+
+
+def test_serialized_monitors_from_sharded_workers_merge():
+    workers = [SpendMonitor(), SpendMonitor()]
+    _history(workers[0], ["checkout-api"], skus=4)
+    _history(workers[1], ["catalog-api"], skus=4)
+
+    merged = SpendMonitor.from_dict(json.loads(json.dumps(workers[0].to_dict())))
+    merged.merge(SpendMonitor.from_dict(json.loads(json.dumps(workers[1].to_dict()))))
+
+    assert len(merged) == 8
+    state = merged.keys["catalog-api"]["sku-3"]
+    original = workers[1].keys["catalog-api"]["sku-3"]
+    assert state.sketch.quantile(0.5) == original.sketch.quantile(0.5)
+    assert (state.mean, state.hours) == (original.mean, original.hours)
+
+
+@pytest.mark.asyncio
+async def test_cost_agent_flags_spikes_in_root_cause_neighbours():
+    monitor = SpendMonitor()
+    _history(monitor, ["checkout-api", "payments-api"], skus=20)
+    monitor.observe("payments-api", "sku-7", NOW.timestamp(), 45.0)
+    request = IncidentRequest(incident_id="INC-919", service="checkout-api", symptom="slow", observed_at=NOW)
+    agent = MicroAgent(AgentDomain.cost)
+
+    quiet = await agent.investigate(request, sources=EvidenceSources(spend=monitor))
+    widened = await agent.investigate(request, sources=EvidenceSources(spend=monitor), related=("payments-api",))
+
+    assert quiet.finding == "No spend anomaly across 20 tracked SKUs in the incident blast radius"
+    assert widened.finding.startswith("Spend spike on payments-api sku-7: ")
+    assert widened.finding.endswith("x its EWMA baseline")
+    assert widened.confidence == 0.7
+    assert widened.evidence[1].startswith("spend:payments-api:sku-7 hour=2026-03-01T10Z")
@@ -0,0 +1,171 @@
+import json
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from hiveops.agents import EvidenceSources, MicroAgent
+from hiveops.connectors import ConnectorRuntime
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.store import EvidenceStore, Resolution
+
+
+def _minutes(count, end):
+    return end - 60 * np.arange(count)[::-1]
+
+
+def test_samples_roll_up_into_every_resolution(tmp_path):
+    store = EvidenceStore(tmp_path)
+    timestamps = 7200 * 100 + 60 * np.arange(120)
+    key = store.append("latency", {"service": "checkout-api"}, timestamps, np.arange(120, dtype=float))
+
+    _, per_minute = store.read(key, timestamps[0], timestamps[-1] + 60)
+    _, per_five = store.read(key, timestamps[0], timestamps[-1] + 60, "5m")
+    _, hourly = store.read(key, timestamps[0], timestamps[-1] + 60, "1h")
+
+    assert len(per_minute) == 120 and per_minute[7] == 7.0
+    assert per_five[:2].tolist() == [2.0, 7.0]
+    assert hourly.tolist() == [29.5, 89.5]
+
+
+def test_reads_are_views_and_retention_recycles_slots(tmp_path):
+    store = EvidenceStore(tmp_path, resolutions=(Resolution("1m", 60, 600),))
+    key = store.append("latency", {"service": "a"}, 60 * np.arange(5), np.ones(5))
+    _, values = store.read(key, 0, 300)
+    assert isinstance(values, np.memmap)
+
+    store.append("latency", {"service": "a"}, 60 * np.arange(20, 22), np.full(2, 3.0))
+    timestamps, values = store.read(key, 0, 22 * 60)
+
+    assert timestamps[0] == 12 * 60
+    assert np.isnan(values[:-2]).all() and values[-2:].tolist() == [3.0, 3.0]
+
+
+def test_store_reopens_from_disk(tmp_path):
+    store = EvidenceStore(tmp_path)
+    key = store.append("errors", {"service": "a", "instance": "x"}, [600.0, 630.0], [0.1, 0.3])
+    store.flush()
+
+    reopened = EvidenceStore(tmp_path)
+
+    assert reopened.find("errors", service="a") == [(key, {"service": "a", "instance": "x"})]
+    assert reopened.read(key, 600, 660)[1].tolist() == pytest.approx([0.2])
+
+
+def _seed_latency(store, service, end):
+    timestamps = _minutes(40, end)
+    for instance, shifted in (("a", True), ("b", True), ("c", False)):
+        values = 0.2 + 0.005 * np.random.default_rng(len(instance)).standard_normal(40)
+        if shifted:
+            values[-8:] += 1.0
+        store.append("latency", {"service": service, "instance": instance}, timestamps, values)
+
+
+@pytest.mark.asyncio
+async def test_metrics_agent_reads_stored_windows_instead_of_querying(tmp_path):
+    store = EvidenceStore(tmp_path)
+    end = time.time() // 60 * 60
+    _seed_latency(store, "checkout-api", end)
+    connectors = ConnectorRuntime.standin()
+    agent = MicroAgent(AgentDomain.metrics)
+    request = IncidentRequest(incident_id="INC-901", service="checkout-api", symptom="checkout errors")
+
+    try:
+        signal = await agent.investigate(request, sources=EvidenceSources(connectors=connectors, store=store))
+    finally:
+        await connectors.aclose()
+
+    assert connectors.prometheus.stats.requests == 2
+    assert any(reference.startswith("store:1m[20m] latency series=3") for reference in signal.evidence)
+    assert signal.finding.startswith("P95 latency regression detected for checkout-api")
+
+
+@pytest.mark.asyncio
+async def test_metrics_agent_reads_the_window_before_a_backdated_incident(tmp_path):
+    store = EvidenceStore(tmp_path)
+    observed = time.time() // 60 * 60 - 6 * 3600
+    _seed_latency(store, "checkout-api", observed)
+    request = IncidentRequest(
+        incident_id="INC-903",
+        service="checkout-api",
+        symptom="checkout errors",
+        observed_at=datetime.fromtimestamp(observed, tz=timezone.utc),
+    )
+
+    signal = await MicroAgent(AgentDomain.metrics).investigate(request, sources=EvidenceSources(store=store))
+
+    assert any(reference.startswith("store:1m[20m] latency series=3") for reference in signal.evidence)
+    assert signal.finding.startswith("P95 latency regression detected for checkout-api")
+
+
+@pytest.mark.asyncio
+async def test_cost_agent_flags_spend_above_weekly_median(tmp_path):
+    store = EvidenceStore(tmp_path)
+    end = time.time() // 3600 * 3600
+    hourly = np.full(48, 12.0)
+    hourly[-1] = 40.0
+    store.append("spend", {"service": "checkout-api"}, end - 3600 * np.arange(48)[::-1], hourly)
+    request = IncidentRequest(incident_id="INC-902", service="checkout-api", symptom="checkout errors")
+
+    signal = await MicroAgent(AgentDomain.cost).investigate(request, sources=EvidenceSources(store=store))
+
+    assert signal.finding == "Hourly spend for checkout-api running at 3.3x its weekly median"
+    assert signal.evidence[0].startswith("store:spend{service=checkout-api} 1h latest=40.00")
+
+
+def test_window_aligns_series_on_absolute_buckets(tmp_path):
+    store = EvidenceStore(tmp_path)
+    store.append("latency", {"service": "a", "instance": "x"}, 60 * np.arange(100, 110), np.arange(10.0))
+    store.append("latency", {"service": "a", "instance": "y"}, 60 * np.arange(100, 105), np.full(5, 7.0))
+    store.append("latency", {"service": "a", "instance": "z"}, 60 * np.arange(10, 12), np.ones(2))
+
+    window = store.window("latency", 60 * 100, 60 * 110, service="a")
+
+    assert window.timestamps.tolist() == (60 * np.arange(100, 110)).tolist()
+    rows = {labels["instance"]: values for labels, values in zip(window.labels, window.values)}
+    assert rows["x"].tolist() == list(range(10))
+    assert rows["y"][:5].tolist() == [7.0] * 5 and np.isnan(rows["y"][5:]).all()
+    assert np.isnan(rows["z"]).all()
+
+
+def test_window_keeps_data_when_the_first_series_lags(tmp_path):
+    store = EvidenceStore(tmp_path)
+    store.append("errors", {"service": "a", "instance": "stopped"}, 60 * np.arange(100, 103), np.ones(3))
+    store.append("errors", {"service": "a", "instance": "live"}, 60 * np.arange(105, 110), np.full(5, 2.0))
+
+    window = store.window("errors", 60 * 104, 60 * 110, service="a")
+
+    assert window.timestamps.tolist() == (60 * np.arange(104, 110)).tolist()
+    rows = {labels["instance"]: values for labels, values in zip(window.labels, window.values)}
+    assert np.isnan(rows["stopped"]).all()
+    assert np.isnan(rows["live"][0]) and rows["live"][1:].tolist() == [2.0] * 5
+
+
+def test_single_series_window_is_a_read_only_view(tmp_path):
+    store = EvidenceStore(tmp_path)
+    key = store.append("spend", {"service": "a"}, 3600 * np.arange(10, 20), np.arange(10.0))
+
+    window = store.window("spend", 3600 * 10, 3600 * 20, "1h", service="a")
+
+    assert np.shares_memory(window.values, store.read(key, 3600 * 10, 3600 * 20, "1h")[1])
+    assert window.values.shape == (1, 10) and not window.values.flags.writeable
+
+
+def test_index_is_appended_per_new_series_and_reads_the_legacy_file(tmp_path):
+    legacy = EvidenceStore(tmp_path / "legacy")
+    key = legacy.append("latency", {"service": "a"}, [600.0], [0.2])
+    (tmp_path / "legacy" / "index.jsonl").unlink()
+    (tmp_path / "legacy" / "index.json").write_text(
+        json.dumps({key: {"metric": "latency", "labels": {"service": "a"}}})
+    )
+    store = EvidenceStore(tmp_path / "legacy")
+
+    for instance in ("x", "y", "x"):
+        store.append("latency", {"service": "b", "instance": instance}, [600.0], [0.1])
+
+    lines = (tmp_path / "legacy" / "index.jsonl").read_text().splitlines()
+    assert [json.loads(line)["labels"].get("instance") for line in lines] == ["x", "y"]
+    reopened = EvidenceStore(tmp_path / "legacy")
+    assert [labels for _, labels in reopened.find("latency", service="a")] == [{"service": "a"}]
+    assert len(reopened.find("latency", service="b")) == 2 and reopened.find("errors") == []
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from hiveops.agents import MicroAgent
+from hiveops.models import AgentDomain, IncidentRequest, Severity
+from hiveops.orchestrator import SwarmOrchestrator, TriageDeadline
+from hiveops.telemetry import MetricsRegistry
+
+
+def test_histograms_render_cumulative_prometheus_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("op_seconds", "Operation time.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'say "hi"')
+    registry.gauge("depth", "Queue depth.", (), lambda: [((), 7)])
+
+    assert registry.render().splitlines() == [
+        "# HELP op_seconds Operation time.",
+        "# TYPE op_seconds histogram",
+        'op_seconds_bucket{op="say \\"hi\\"",le="0.1"} 2',
+        'op_seconds_bucket{op="say \\"hi\\"",le="1"} 3',
+        'op_seconds_bucket{op="say \\"hi\\"",le="+Inf"} 4',
+        'op_seconds_sum{op="say \\"hi\\""} 3.65',
+        'op_seconds_count{op="say \\"hi\\""} 4',
+        "# HELP depth Queue depth.",
+        "# TYPE depth gauge",
+        "depth 7",
+    ]
+    with pytest.raises(ValueError):
+        registry.counter("depth", "Duplicate.")
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_times_each_agent_and_the_whole_triage():
+    class StuckAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            await asyncio.sleep(1)
+
+    deadlines = {Severity.low: TriageDeadline(total_seconds=1.0, agent_seconds=0.02)}
+    orchestrator = SwarmOrchestrator(
+        agents=(MicroAgent(AgentDomain.metrics), StuckAgent(AgentDomain.cost)), deadlines=deadlines
+    )
+    incident = IncidentRequest(incident_id="INC-700", service="checkout-api", symptom="slow", severity=Severity.low)
+
+    result = await orchestrator.triage(incident)
+
+    metrics = orchestrator.metrics
+    assert metrics.agent_seconds.count("metrics", "ok") >= 1
+    assert metrics.agent_seconds.count("cost", "timeout") == 1
+    assert metrics.triage_seconds.count("low", result.status) == 1
+    assert metrics.synthesize_seconds.count() >= 1
+    assert "# TYPE hiveops_audit_decisions_total counter" in metrics.registry.render()
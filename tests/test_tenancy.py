@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from hiveops.agents import MicroAgent
+from hiveops.models import AgentDomain, IncidentRequest, Severity, TenantOperation, TenantQuota, TenantQuotaConfig
+from hiveops.orchestrator import SwarmOrchestrator
+from hiveops.scheduler import TriageScheduler
+from hiveops.tenancy import QuotaExceeded, TenantGovernor
+
+AGENT_SECONDS = 0.02
+
+
+class SlowAgent(MicroAgent):
+    async def investigate(self, incident, **context):
+        await asyncio.sleep(AGENT_SECONDS)
+        return await MicroAgent.investigate(self, incident, **context)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _incident(tenant, number):
+    return IncidentRequest(incident_id=f"INC-{tenant}-{number}", service="checkout-api", symptom="slow")
+
+
+def _scheduler(concurrency, quotas):
+    orchestrator = SwarmOrchestrator(agents=(SlowAgent(AgentDomain.metrics),))
+    return TriageScheduler(orchestrator, concurrency=concurrency, tenants=TenantGovernor(quotas))
+
+
+def test_rate_and_concurrency_quotas_are_enforced_per_tenant():
+    clock = Clock()
+    quota = TenantQuota(rate_per_minute={TenantOperation.iac: 6.0}, concurrency={TenantOperation.iac: 1})
+    governor = TenantGovernor(TenantQuotaConfig(tenants={"team-a": quota}), clock=clock)
+
+    with governor.track("team-a", TenantOperation.iac):
+        with pytest.raises(QuotaExceeded) as throttled:
+            with governor.track("team-a", TenantOperation.iac):
+                pass
+        with governor.track("team-b", TenantOperation.iac), governor.track("team-b", TenantOperation.iac):
+            pass
+    clock.now += throttled.value.retry_after
+    with governor.track("team-a", TenantOperation.iac):
+        pass
+
+    usage = {entry.tenant: entry.operations[TenantOperation.iac] for entry in governor.usage()}
+    assert (usage["team-a"].requests, usage["team-a"].throttled, usage["team-a"].completed) == (3, 1, 2)
+    assert throttled.value.retry_after == pytest.approx(10.0)
+    assert usage["team-b"].completed == 2 and usage["team-b"].running == 0
+
+
+@pytest.mark.asyncio
+async def test_contended_slots_are_shared_by_weight():
+    scheduler = _scheduler(1, TenantQuotaConfig(tenants={"payments": TenantQuota(weight=2.0)}))
+    order = []
+
+    async def submit(tenant, number):
+        await scheduler.triage(_incident(tenant, number), tenant)
+        order.append(tenant)
+
+    storm = [asyncio.create_task(submit("search", number)) for number in range(12)]
+    await asyncio.sleep(0)
+    quiet = [asyncio.create_task(submit("payments", number)) for number in range(4)]
+    await asyncio.gather(*storm, *quiet)
+
+    # Twice the weight: the quiet tenant's four incidents finish within the first seven, not nine.
+    assert order[0] == "search" and order[:7].count("payments") == 4
+
+
+@pytest.mark.asyncio
+async def test_an_alert_storm_is_held_to_its_concurrency_quota():
+    scheduler = _scheduler(3, TenantQuotaConfig(default=TenantQuota(concurrency={TenantOperation.triage: 2})))
+    finished = []
+
+    async def submit(tenant, number):
+        await scheduler.triage(_incident(tenant, number), tenant)
+        finished.append(tenant)
+
+    storm = [asyncio.create_task(submit("search", number)) for number in range(30)]
+    await asyncio.sleep(AGENT_SECONDS / 5)
+    status = scheduler.status()
+    assert status.running_by_tenant == {"search": 2} and status.queued_by_tenant == {"search": 28}
+
+    await submit("payments", 0)
+
+    assert finished.count("search") <= 2
+    await asyncio.gather(*storm)
+    assert scheduler.status().running_by_tenant == {}
@@ -0,0 +1,87 @@
+import random
+import time
+
+import pytest
+
+from hiveops.agents import MicroAgent
+from hiveops.models import AgentDomain, IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+from hiveops.topology import ServiceGraph
+
+SHOP = {
+    "web-frontend": ["checkout-api", "catalog-api"],
+    "checkout-api": ["payments-api", "catalog-api"],
+    "payments-api": ["ledger-db"],
+    "catalog-api": ["catalog-db"],
+}
+
+
+def _reachable(edges, start):
+    seen, frontier = set(), [start]
+    while frontier:
+        for target in edges.get(frontier.pop(), []):
+            if target not in seen:
+                seen.add(target)
+                frontier.append(target)
+    return seen - {start}
+
+
+def test_closure_matches_graph_search_with_cycles():
+    rng = random.Random(11)
+    names = [f"svc-{i}" for i in range(300)]
+    edges = {name: rng.sample(names, rng.randint(0, 3)) for name in names}
+
+    graph = ServiceGraph(edges)
+
+    for name in rng.sample(names, 40):
+        assert set(graph.dependencies(name)) == _reachable(edges, name)
+        callers = {other for other in names if name in _reachable(edges, other) and other != name}
+        assert set(graph.blast_radius(name)) == callers
+
+
+def test_blast_radius_and_root_cause_candidates():
+    graph = ServiceGraph(SHOP)
+
+    assert graph.blast_radius("catalog-db") == ["catalog-api", "checkout-api", "web-frontend"]
+    assert graph.root_cause_candidates("checkout-api") == [
+        "catalog-api",
+        "payments-api",
+        "catalog-db",
+        "ledger-db",
+    ]
+    assert graph.depends_on("web-frontend", "ledger-db") and not graph.depends_on("ledger-db", "web-frontend")
+
+
+def test_blast_radius_lookups_stay_sub_millisecond_on_thousands_of_services():
+    rng = random.Random(5)
+    names = [f"svc-{i}" for i in range(5000)]
+    # Layered so calls flow downward, as in a real service mesh.
+    graph = ServiceGraph({name: rng.sample(names[i + 1 : i + 200], 3) for i, name in enumerate(names[:-200])})
+
+    started = time.perf_counter()
+    for name in names[::50]:
+        graph.blast_radius_size(name)
+        graph.depends_on(name, names[-1])
+    assert (time.perf_counter() - started) / 100 < 1e-3
+
+
+@pytest.mark.asyncio
+async def test_reinvestigation_widens_to_root_cause_neighbours():
+    calls = []
+
+    class RecordingAgent(MicroAgent):
+        async def investigate(self, incident, **context):
+            calls.append((self.domain, context["related"]))
+            return await MicroAgent.investigate(self, incident, **context)
+
+    orchestrator = SwarmOrchestrator(
+        agents=(RecordingAgent(AgentDomain.metrics), RecordingAgent(AgentDomain.cost)),
+        topology=ServiceGraph(SHOP),
+    )
+    request = IncidentRequest(incident_id="INC-915", service="payments-api", symptom="slow", severity="high")
+
+    result = await orchestrator.triage(request)
+
+    assert calls[0][1] == () and calls[-1] == (AgentDomain.cost, ("ledger-db",))
+    assert result.related_services == ["ledger-db"]
+    assert result.blast_radius == ["checkout-api", "web-frontend"]
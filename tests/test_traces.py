@@ -0,0 +1,108 @@
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from hiveops.agents import DEFAULT_SWARM, TRACES_AGENT, EvidenceSources
+from hiveops.models import IncidentRequest
+from hiveops.orchestrator import SwarmOrchestrator
+from hiveops.traces import SpanTable
+
+START = datetime(2026, 3, 1, 10, tzinfo=timezone.utc)
+MS = 1_000_000
+
+
+def _export(traces: int, slow_from: int | None = None, fanout: int = 4, seed: int = 1) -> dict:
+    """web -> checkout-api -> (payments-api, catalog-db, fanout cache reads); the db slows down from ``slow_from``."""
+    rng = random.Random(seed)
+    spans: dict[str, list[dict]] = {}
+
+    def span(service, name, trace_id, span_id, parent, start, end):
+        spans.setdefault(service, []).append(
+            {
+                "traceId": trace_id,
+                "spanId": span_id,
+                "parentSpanId": parent,
+                "name": name,
+                "startTimeUnixNano": str(start),
+                "endTimeUnixNano": str(end),
+            }
+        )
+
+    base = int(START.timestamp()) * 10**9
+    for index in range(traces):
+        trace_id, begin = f"{index:032x}", base + index * 6000 * MS
+        db = rng.randint(5, 10) * MS * (6 if slow_from is not None and index >= slow_from else 1)
+        root, order = f"{index:08x}00", f"{index:08x}01"
+        span("web", "GET /checkout", trace_id, root, "", begin, begin + 50 * MS + db)
+        span("checkout-api", "POST /order", trace_id, order, root, begin + MS, begin + 45 * MS + db)
+        span("payments-api", "charge", trace_id, f"{index:08x}02", order, begin + 2 * MS, begin + 20 * MS)
+        span("catalog-db", "SELECT", trace_id, f"{index:08x}03", order, begin + 21 * MS, begin + 21 * MS + db)
+        for read in range(fanout):
+            span("cache", "GET", trace_id, f"{index:08x}1{read:x}", order, begin + 3 * MS, begin + 4 * MS)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+                "scopeSpans": [{"spans": batch}],
+            }
+            for service, batch in spans.items()
+        ]
+    }
+
+
+def test_critical_path_partitions_each_trace_duration():
+    table = SpanTable.from_otlp([_export(200)])
+
+    critical = table.critical_time()
+
+    roots = table.parent < 0
+    per_trace = np.bincount(table.trace, weights=critical)
+    assert np.array_equal(per_trace, (table.end - table.start)[roots])
+    cache = [code for code, hop in enumerate(table.hops) if hop == ("cache", "GET")][0]
+    assert critical[table.hop == cache].sum() == 0
+
+
+def test_slow_hop_is_the_one_that_regressed_against_baseline():
+    table = SpanTable.from_otlp([_export(400, slow_from=200)])
+
+    report = table.analyze(START + timedelta(minutes=20), START + timedelta(minutes=40))
+
+    assert (report.window_traces, report.baseline_traces) == (200, 200)
+    hop = report.slow_hop
+    assert (hop.service, hop.operation) == ("catalog-db", "SELECT")
+    assert hop.regression > 5
+    assert report.hops[0].service == "catalog-db"
+
+
+def test_ten_minute_sample_aggregates_in_seconds():
+    table_started = time.perf_counter()
+    table = SpanTable.from_otlp([_export(5000, fanout=16)])
+    report = table.analyze()
+    elapsed = time.perf_counter() - table_started
+
+    assert report.spans == 100_000
+    assert report.hops[0].calls == 5000
+    assert elapsed < 5
+
+
+@pytest.mark.asyncio
+async def test_traces_agent_names_the_slow_hop_in_the_hypothesis(tmp_path):
+    (tmp_path / "trace-export.jsonl").write_text(json.dumps(_export(600, slow_from=400)) + "\n")
+    request = IncidentRequest(
+        incident_id="INC-918",
+        service="checkout-api",
+        symptom="checkout latency",
+        severity="high",
+        observed_at=START + timedelta(minutes=60),
+    )
+    orchestrator = SwarmOrchestrator(agents=DEFAULT_SWARM + (TRACES_AGENT,), sources=EvidenceSources(traces=tmp_path))
+
+    result = await orchestrator.triage(request)
+
+    signal = next(signal for signal in result.signals if signal.domain == "traces")
+    assert signal.confidence == 0.9
+    assert result.hypothesis.startswith("Slow hop catalog-db SELECT on the critical path")